@@ -0,0 +1,284 @@
+"""
+Measures what logging costs: building logs, serializing them, formatting console lines and
+emitting through LumberjackHandler against a local stub ingest server.
+
+Every scenario reports records per second, the caller-side p50 and p99 latency of one call,
+the bytes per record (serialized or received by the server), and the memory allocated per record.
+Results can be saved as JSON and compared with a previous run.
+
+Usage:
+    python -m benchmarks.benchmark_suite [--records N] [--latency SECONDS] [--error-rate FRACTION]
+                                            [--only NAME ...] [--output results.json] [--baseline previous.json]
+
+Run it from the repository root, so that the lumberjack package of the checkout is imported.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from lumberjack.handler_options import BatchingOptions, DeliveryOptions
+from lumberjack.lumberjack_handler import LumberjackHandler
+from lumberjack.testing import StubServer
+from lumberjack.transport import HttpTransport
+from lumberjack.utils import (CodeCapture, LogThrottle, RecordBuffer, buildLog,
+                              getEncoder)
+from lumberjack.utils.console_formatter import ConsoleFormatter
+from lumberjack.utils.encoders import orjson
+
+RECORD = logging.LogRecord(
+    name="benchmark",
+    level=logging.INFO,
+    pathname=__file__,
+    lineno=1,
+    msg="benchmark message %s",
+    args=("argument",),
+    exc_info=None,
+)
+
+DEBUG_RECORD = logging.makeLogRecord(
+    {**RECORD.__dict__, "levelno": logging.DEBUG, "levelname": "DEBUG"})
+
+
+class Scenario(NamedTuple):
+    """
+    One benchmarked operation.
+    """
+
+    name: str
+    setup: Callable[[argparse.Namespace], "Run"]
+
+
+class Run(NamedTuple):
+    """
+    A prepared scenario: the call to measure, and what to do once the measurement is over.
+    """
+
+    call: Callable[[], object]
+    finish: Callable[[], Dict[str, float]]
+
+
+def _noExtra() -> Dict[str, float]:
+    return {}
+
+
+def buildLogScenario(code_capture: CodeCapture) -> Callable[[argparse.Namespace], Run]:
+    def setup(options: argparse.Namespace) -> Run:
+        return Run(lambda: buildLog(RECORD, code_capture=code_capture), _noExtra)
+    return setup
+
+
+def serializeScenario(encoder: str) -> Callable[[argparse.Namespace], Run]:
+    def setup(options: argparse.Namespace) -> Run:
+        log = buildLog(RECORD, code_capture=CodeCapture.WINDOW)
+        encode = getEncoder(encoder)
+        size = len(encode(log))
+        return Run(lambda: encode(log), lambda: {"bytes_per_record": size})
+    return setup
+
+
+def consoleScenario(options: argparse.Namespace) -> Run:
+    formatter = ConsoleFormatter()
+    return Run(lambda: formatter.format(RECORD), _noExtra)
+
+
+def emitScenario(
+    compression: Optional[str] = None,
+    throttled: bool = False,
+    buffered: bool = False,
+    **handler_options: Any,
+) -> Callable[[argparse.Namespace], Run]:
+    def setup(options: argparse.Namespace) -> Run:
+        server = StubServer(latency=options.latency,
+                            error_rate=options.error_rate, seed=0).start()
+        handler = LumberjackHandler(
+            server.url,
+            delivery=DeliveryOptions(transport=HttpTransport(compression=compression)),
+            throttle=LogThrottle(rate_limit=1, burst=1) if throttled else None,
+            record_buffer=RecordBuffer() if buffered else None,
+            **handler_options,
+        )
+        record = DEBUG_RECORD if buffered else RECORD
+        emitted = [0]
+
+        def call() -> None:
+            handler.emit(record)
+            emitted[0] += 1
+
+        def finish() -> Dict[str, float]:
+            handler.close()
+            server.stop()
+            return {
+                "bytes_per_record": server.bytes_received / max(1, emitted[0]),
+                "requests": len(server.requests),
+            }
+
+        return Run(call, finish)
+    return setup
+
+
+SCENARIOS = [
+    Scenario("buildLog.none", buildLogScenario(CodeCapture.NONE)),
+    Scenario("buildLog.window", buildLogScenario(CodeCapture.WINDOW)),
+    Scenario("buildLog.full", buildLogScenario(CodeCapture.FULL)),
+    Scenario("serialize.pydantic", serializeScenario("pydantic")),
+    Scenario("serialize.json", serializeScenario("json")),
+    *([Scenario("serialize.orjson", serializeScenario("orjson"))] if orjson is not None else []),
+    Scenario("console.format", consoleScenario),
+    Scenario("emit.sync", emitScenario(code_capture="window")),
+    Scenario("emit.async", emitScenario(asynchronous=True, code_capture="window")),
+    Scenario("emit.async.gzip", emitScenario(compression="gzip", asynchronous=True, code_capture="window")),
+    Scenario("emit.async.columnar", emitScenario(asynchronous=True, code_capture="window",
+                                                  batching=BatchingOptions(batch_format="columnar"))),
+    Scenario("emit.async.hash", emitScenario(asynchronous=True, code_capture="hash")),
+    Scenario("emit.throttled", emitScenario(throttled=True, code_capture="window")),
+    Scenario("emit.buffered", emitScenario(buffered=True, code_capture="window")),
+]
+
+
+def percentile(samples: List[int], fraction: float) -> float:
+    """
+    Returns a percentile of sorted samples, by nearest rank.
+    """
+
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return float(samples[index])
+
+
+def measure(scenario: Scenario, options: argparse.Namespace) -> Dict[str, float]:
+    """
+    Runs a scenario: a timed pass for throughput and latency, then a traced pass for memory.
+
+    Delivery errors printed by the handler are captured and counted instead of flooding the report.
+    """
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = _measure(scenario, options)
+    result["errors"] = len(output.getvalue().splitlines())
+    return result
+
+
+def _measure(scenario: Scenario, options: argparse.Namespace) -> Dict[str, float]:
+    run = scenario.setup(options)
+    call = run.call
+    for _ in range(min(100, options.records)):
+        call()
+
+    latencies: List[int] = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for _ in range(options.records):
+        before = clock()
+        call()
+        latencies.append(clock() - before)
+    elapsed = (clock() - started) / 1e9
+    result = run.finish()
+
+    latencies.sort()
+    result.update({
+        "records_per_second": options.records / elapsed,
+        "p50_us": percentile(latencies, 0.50) / 1000,
+        "p99_us": percentile(latencies, 0.99) / 1000,
+    })
+
+    traced = scenario.setup(options)
+    count = max(1, options.records // 10)
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(count):
+            traced.call()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        traced.finish()
+    result["allocated_bytes_per_record"] = (peak - baseline) / count
+    result["retained_bytes_per_record"] = max(0, current - baseline) / count
+
+    return result
+
+
+def version() -> Optional[str]:
+    try:
+        return metadata.version("lumberjack")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str) -> None:
+    """
+    Prints the change of every metric against a previous run.
+    """
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+
+    print(f"\nChange against {baseline_path}:")
+    for name, metrics in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        changes = []
+        for metric in ("records_per_second", "p50_us", "p99_us", "bytes_per_record", "allocated_bytes_per_record"):
+            if metric in metrics and previous.get(metric):
+                changes.append(
+                    f"{metric} {100 * (metrics[metric] / previous[metric] - 1):+.1f}%")
+        print(f"  {name:<20} " + ", ".join(changes))
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=5000,
+                        help="records per scenario")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds the stub server waits before answering")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests the stub server fails")
+    parser.add_argument("--only", nargs="*",
+                        help="run only scenarios whose name starts with one of these prefixes")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results of a previous run")
+    options = parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'scenario':<20} {'records/s':>12} {'p50 us':>9} {'p99 us':>9} {'bytes/rec':>10} {'alloc/rec':>10} "
+          f"{'errors':>7}")
+    for scenario in SCENARIOS:
+        if options.only and not any(scenario.name.startswith(prefix) for prefix in options.only):
+            continue
+        metrics = results[scenario.name] = measure(scenario, options)
+        print(f"{scenario.name:<20} {metrics['records_per_second']:12,.0f} {metrics['p50_us']:9.1f} "
+              f"{metrics['p99_us']:9.1f} {metrics.get('bytes_per_record', 0):10,.0f} "
+              f"{metrics['allocated_bytes_per_record']:10,.0f} {metrics['errors']:7,.0f}")
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump({
+                "version": version(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "date": datetime.now(timezone.utc).isoformat(),
+                "options": {"records": options.records, "latency": options.latency,
+                            "error_rate": options.error_rate},
+                "results": results,
+            }, f, indent=2)
+
+    if options.baseline:
+        compare(results, options.baseline)
+
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,71 @@
+"""
+Compares lines per second of ConsoleFormatter with the previous implementation, which rebuilt
+and swapped the shared format string on every record.
+
+Usage:
+    python -m benchmarks.console_formatter_benchmark [iterations]
+
+Run it from the repository root, so that the lumberjack package of the checkout is imported.
+"""
+
+import logging
+import sys
+import timeit
+
+from colorama import Fore, Style
+
+from lumberjack.utils.console_formatter import ConsoleFormatter
+
+
+class LegacyConsoleFormatter(logging.Formatter):
+    """
+    The previous ConsoleFormatter, kept for comparison.
+    """
+
+    MAX_LEVEL_LENGTH = ConsoleFormatter.MAX_LEVEL_LENGTH
+
+    def __init__(self) -> None:
+        super().__init__(fmt=ConsoleFormatter.BASE_FORMAT, datefmt="%H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        padding = self.MAX_LEVEL_LENGTH - len(record.levelname)
+        levelname_format = f"[%(levelname)s]{' ' * padding}"
+
+        match record.levelno:
+            case logging.DEBUG:
+                colored_levelname = Fore.CYAN + levelname_format + Style.RESET_ALL
+            case logging.INFO:
+                colored_levelname = Fore.GREEN + levelname_format + Style.RESET_ALL
+            case logging.WARNING:
+                colored_levelname = Fore.YELLOW + levelname_format + Style.RESET_ALL
+            case logging.ERROR:
+                colored_levelname = Fore.RED + levelname_format + Style.RESET_ALL
+            case logging.CRITICAL:
+                colored_levelname = Fore.RED + Style.BRIGHT + levelname_format + Style.RESET_ALL
+            case _:
+                colored_levelname = levelname_format
+
+        self._style._fmt = f"%(asctime)s {colored_levelname}: %(message)s"
+        return super().format(record)
+
+
+RECORDS = [
+    logging.LogRecord("benchmark", level, __file__, 1, "benchmark message %s", ("argument",), None)
+    for level in (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+]
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    for label, formatter in (("legacy", LegacyConsoleFormatter()), ("compiled", ConsoleFormatter())):
+        def formatAll() -> None:
+            for record in RECORDS:
+                formatter.format(record)
+
+        seconds = min(timeit.repeat(formatAll, number=iterations // len(RECORDS), repeat=5))
+        print(f"{label:>8}: {iterations / seconds:12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
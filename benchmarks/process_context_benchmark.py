@@ -0,0 +1,50 @@
+"""
+Compares looking up host metadata for every record with reading the process context snapshot.
+
+Usage:
+    python -m benchmarks.process_context_benchmark [iterations]
+
+Run it from the repository root, so that the lumberjack package of the checkout is imported.
+"""
+
+import getpass
+import os
+import platform
+import socket
+import sys
+import timeit
+
+from lumberjack.models import getProcessContext
+
+
+def perRecordLookups() -> None:
+    platform.python_implementation()
+    platform.python_version()
+    getpass.getuser()
+    socket.gethostname()
+    os.environ.get("ENV")
+
+
+def snapshotLookups() -> None:
+    context = getProcessContext()
+    context.language
+    context.languageVersion
+    context.username
+    context.machineName
+    context.environment
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    per_record = timeit.timeit(perRecordLookups, number=iterations)
+    snapshot = timeit.timeit(snapshotLookups, number=iterations)
+
+    print(f"per-record lookups: {per_record / iterations * 1e6:8.3f} us/record")
+    print(f"process snapshot:   {snapshot / iterations * 1e6:8.3f} us/record")
+    print(f"saving:             {(per_record - snapshot) / iterations * 1e6:8.3f} us/record "
+          f"({per_record / snapshot:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
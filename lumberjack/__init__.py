@@ -1,4 +1,21 @@
-from lumberjack.lumberjack_factory import LumberjackFactory
-from lumberjack.lumberjack_handler import LumberjackHandler
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.async_lumberjack_handler import AsyncLumberjackHandler
+    from lumberjack.handler_options import BatchingOptions, DeliveryOptions
+    from lumberjack.lumberjack_factory import LumberjackFactory
+    from lumberjack.lumberjack_handler import LumberjackHandler
+
+_EXPORTS = {
+    "AsyncLumberjackHandler": "lumberjack.async_lumberjack_handler",
+    "BatchingOptions": "lumberjack.handler_options",
+    "DeliveryOptions": "lumberjack.handler_options",
+    "LumberjackFactory": "lumberjack.lumberjack_factory",
+    "LumberjackHandler": "lumberjack.lumberjack_handler",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
 
 __all__ = ['LumberjackFactory']
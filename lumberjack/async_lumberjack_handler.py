@@ -0,0 +1,305 @@
+import asyncio
+import time
+from collections import deque
+from logging import Handler, LogRecord
+from typing import Any, Deque, List, Optional
+
+from requests import RequestException
+
+from lumberjack.models import Log
+from lumberjack.transport import AsyncHttpTransport
+from lumberjack.utils import (BatchFormat, CodeCapture, Encoder,
+                              SourceRegistry, buildLog, encodeBatch,
+                              encodeColumnar, getEncoder, missingSources,
+                              sourcesUrl)
+
+_STOP = object()
+"""
+A marker placed on the queue to stop the sender task once everything before it has been shipped.
+"""
+
+
+class AsyncLumberjackHandler(Handler):
+    """
+    A log handler for asyncio applications that ships logs from a task owned by the event loop.
+
+    `emit` never waits on the network: it builds the log and enqueues it. A sender task started on the running
+    loop drains the queue and posts batches over a non-blocking HTTP connection. Await `aclose()` before
+    the loop stops to ship the pending logs.
+
+    Building the log still runs on the thread calling `emit`, usually the loop's: it formats the traceback of a
+    logged exception and captures the calling source file, which is read from disk the first time and checked
+    for changes afterwards. Use `code_capture="none"` to keep file access off the loop entirely.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        application_name: Optional[str] = None,
+        max_queue_size: int = 10000,
+        max_batch_records: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+        max_linger: float = 1.0,
+        transport: Optional[AsyncHttpTransport] = None,
+        code_capture: CodeCapture | str = CodeCapture.FULL,
+        code_context_lines: int = 10,
+        stack_frames: bool = False,
+        encoder: Optional[str | Encoder] = None,
+        batch_format: BatchFormat | str = BatchFormat.JSON,
+        sources_url: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes the asyncio Lumberjack log handler.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            application_name (str, optional): The name of the application. Defaults to None.
+            max_queue_size (int): Maximum number of logs waiting to be shipped. Defaults to 10000.
+            max_batch_records (int): Maximum number of logs per batch. Defaults to 500.
+            max_batch_bytes (int): Maximum serialized size of a batch. Defaults to 1 MiB.
+            max_linger (float): Maximum seconds a log waits for its batch to fill. Defaults to 1.0.
+            transport (Optional[AsyncHttpTransport]): The transport used to deliver logs. Defaults to a new AsyncHttpTransport.
+            code_capture (CodeCapture | str): How much of the calling source file to capture: "full", "window",
+                "hash" or "none". Defaults to "full".
+            code_context_lines (int): Number of lines kept on each side of the logging call in "window" mode.
+                Defaults to 10.
+            stack_frames (bool): Whether logs of exceptions also carry the frames of the exception as a compact
+                structured list, next to the rendered traceback. Defaults to False.
+            encoder (Optional[str | Encoder]): Serializes each log straight into request body bytes: an encoder,
+                or "orjson", "pydantic" or "json". Defaults to orjson if installed, pydantic's serializer otherwise.
+            batch_format (BatchFormat | str): How batches are combined: "json" for a JSON array, "ndjson"
+                for newline-delimited JSON, or "columnar" for one array per field with the strings the logs share
+                sent once per batch. Columnar batches are bounded by `max_batch_records` and `max_linger` only.
+                Defaults to "json".
+            sources_url (Optional[str]): The URL source file bodies are uploaded to in "hash" mode.
+                Defaults to the "sources" resource below `url`.
+        """
+
+        super().__init__()
+        self.__url = url
+        self.__application_name = application_name
+        self.__max_queue_size = max_queue_size
+        self.__max_batch_records = max(1, max_batch_records)
+        self.__max_batch_bytes = max(1, max_batch_bytes)
+        self.__max_linger = max(0.0, max_linger)
+        self.__transport = transport or AsyncHttpTransport()
+        self.__code_capture = CodeCapture(code_capture)
+        self.__code_context_lines = code_context_lines
+        self.__stack_frames = stack_frames
+        self.__encode = getEncoder(encoder)
+        self.__batch_format = BatchFormat(batch_format)
+        self.__sources = SourceRegistry()
+        self.__sources_url = sources_url or sourcesUrl(url)
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__queue: Optional["asyncio.Queue[object]"] = None
+        self.__task: Optional["asyncio.Task[None]"] = None
+        self.__pending: Deque[Log] = deque(maxlen=max_queue_size)
+        self.__dropped = 0
+        self.__closed = False
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of logs dropped because the queue was full or the handler was closed.
+        """
+        return self.__dropped
+
+    def emit(self, record: LogRecord) -> None:
+        """
+        Builds the log of the record on the calling thread and enqueues it for the sender task.
+
+        Logs emitted before any event loop is running are kept and shipped once the sender task starts.
+        Logs emitted from other threads are handed over to the loop thread-safely.
+
+        Args:
+            record (LogRecord): The log record to be emitted.
+        """
+
+        if not self.__url:
+            return
+        if self.__closed:
+            self.__dropped += 1
+            return
+
+        log = buildLog(
+            record,
+            self.__application_name,
+            self.__code_capture,
+            self.__code_context_lines,
+            self.__stack_frames,
+        )
+        if not log:
+            return
+        if log.codeHash and log.filepath:
+            self.__sources.register(log.codeHash, log.filepath)
+
+        running: Optional[asyncio.AbstractEventLoop]
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if self.__loop is None or self.__loop.is_closed():
+            if running is None:
+                if len(self.__pending) == self.__pending.maxlen:
+                    self.__dropped += 1
+                self.__pending.append(log)
+                return
+            self._start(running)
+
+        if running is self.__loop:
+            self._enqueue(log)
+        else:
+            assert self.__loop is not None
+            self.__loop.call_soon_threadsafe(self._enqueue, log)
+
+    async def aflush(self) -> None:
+        """
+        Waits until every log enqueued so far has been shipped.
+        """
+
+        if self.__queue is None or self.__task is None or self.__task.done():
+            return
+
+        flushed = asyncio.Event()
+        await self.__queue.put(flushed)
+        await flushed.wait()
+
+    async def aclose(self, timeout: Optional[float] = None) -> None:
+        """
+        Ships the pending logs, stops the sender task and closes the transport.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait for the pending logs. Defaults to None (wait forever).
+        """
+
+        if self.__closed:
+            return
+        self.__closed = True
+
+        if self.__pending:
+            self._start(asyncio.get_running_loop())
+
+        if self.__queue is not None and self.__task is not None and not self.__task.done():
+            await self.__queue.put(_STOP)
+            try:
+                await asyncio.wait_for(asyncio.shield(self.__task), timeout)
+            except asyncio.TimeoutError:
+                self.__task.cancel()
+
+        await self.__transport.close()
+        self.close()
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Binds the handler to an event loop and starts the sender task, shipping logs emitted before it started.
+        """
+
+        self.__loop = loop
+        self.__queue = asyncio.Queue(self.__max_queue_size)
+        self.__task = loop.create_task(self._run())
+        while self.__pending:
+            self._enqueue(self.__pending.popleft())
+
+    def _enqueue(self, log: Log) -> None:
+        """
+        Puts a log on the queue without waiting. Must run on the loop.
+        """
+
+        assert self.__queue is not None
+        try:
+            self.__queue.put_nowait(log)
+        except asyncio.QueueFull:
+            self.__dropped += 1
+
+    async def _run(self) -> None:
+        """
+        The sender task collecting logs into batches and shipping them.
+        """
+
+        assert self.__queue is not None
+        queue = self.__queue
+        batch: List[Any] = []
+        size = 0
+        deadline = 0.0
+        columnar = self.__batch_format == BatchFormat.COLUMNAR
+
+        while True:
+            try:
+                if batch:
+                    item = await asyncio.wait_for(queue.get(), max(0.0, deadline - time.monotonic()))
+                else:
+                    item = await queue.get()
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, asyncio.Event):
+                await self._ship(batch)
+                batch, size = [], 0
+                if isinstance(item, asyncio.Event):
+                    item.set()
+                if item is _STOP:
+                    return
+                continue
+
+            assert isinstance(item, Log)
+            if columnar:
+                payload: Log | bytes = item
+            else:
+                payload = self.__encode(item)
+                # Counts the separator of each log and the brackets of a JSON array, so the body fits exactly.
+                if batch and size + len(payload) + 2 > self.__max_batch_bytes:
+                    await self._ship(batch)
+                    batch, size = [], 0
+                size += len(payload) + 1
+
+            if not batch:
+                deadline = time.monotonic() + self.__max_linger
+            batch.append(payload)
+
+            if len(batch) >= self.__max_batch_records or size + 1 >= self.__max_batch_bytes:
+                await self._ship(batch)
+                batch, size = [], 0
+
+    async def _ship(self, batch: List[Any]) -> None:
+        """
+        Posts a batch of logs to the Lumberjack logging endpoint.
+
+        Args:
+            batch (List[Any]): The serialized logs, or the logs themselves in columnar format.
+        """
+
+        if not batch or not self.__url:
+            return
+
+        try:
+            if self.__batch_format == BatchFormat.COLUMNAR:
+                body = encodeColumnar(batch)
+            else:
+                body = encodeBatch(batch, self.__batch_format)
+            await self._uploadSources()
+            try:
+                await self.__transport.post(self.__url, body, self.__batch_format.content_type)
+            except RequestException as e:
+                if not self.__sources_url or not self.__sources.markMissing(self.__sources_url, missingSources(e)):
+                    raise
+                await self._uploadSources()
+                await self.__transport.post(self.__url, body, self.__batch_format.content_type)
+        except RequestException as e:
+            print(e)
+        except Exception as e:
+            print(f"Failed to ship batch: {e}")
+
+    async def _uploadSources(self) -> None:
+        """
+        Posts the source file bodies waiting to be uploaded in "hash" mode.
+        """
+
+        sources_url = self.__sources_url
+        if not sources_url or not self.__sources.pending(sources_url):
+            return
+
+        digests, body = self.__sources.encodePending(sources_url)
+        if digests:
+            await self.__transport.post(sources_url, body)
+        self.__sources.markUploaded(sources_url, digests)
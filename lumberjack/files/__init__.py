@@ -0,0 +1,21 @@
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.files.bulk_shipper import (BulkShipper, ShipResult,
+                                               listFiles)
+    from lumberjack.files.checkpoint import Checkpoint
+    from lumberjack.files.ndjson_file_handler import (FILE_SUFFIX,
+                                                      NdjsonFileHandler)
+
+_EXPORTS = {
+    "BulkShipper": "lumberjack.files.bulk_shipper",
+    "ShipResult": "lumberjack.files.bulk_shipper",
+    "listFiles": "lumberjack.files.bulk_shipper",
+    "Checkpoint": "lumberjack.files.checkpoint",
+    "FILE_SUFFIX": "lumberjack.files.ndjson_file_handler",
+    "NdjsonFileHandler": "lumberjack.files.ndjson_file_handler",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
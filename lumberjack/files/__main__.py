@@ -0,0 +1,5 @@
+import sys
+
+from lumberjack.files.cli import main
+
+sys.exit(main())
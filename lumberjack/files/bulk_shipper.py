@@ -0,0 +1,294 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterable, List, NamedTuple, Optional, Tuple
+
+from requests import HTTPError, RequestException
+
+from lumberjack.files.checkpoint import Checkpoint
+from lumberjack.files.ndjson_file_handler import FILE_SUFFIX
+from lumberjack.models import Log
+from lumberjack.transport import HttpTransport, Transport
+from lumberjack.utils import BatchFormat, encodeBatch, encodeColumnar
+
+REJECTED_STATUSES = frozenset((400, 413, 422))
+"""
+Responses that reject the content of a batch rather than the request, so splitting the batch may get part of it through.
+"""
+
+
+class ShipResult(NamedTuple):
+    """
+    What a bulk shipping run did.
+    """
+
+    records: int
+    """
+    The number of logs delivered.
+    """
+
+    batches: int
+    """
+    The number of requests delivered.
+    """
+
+    bytes: int
+    """
+    The size of the delivered request bodies.
+    """
+
+    skipped: int
+    """
+    The number of lines skipped because they are not valid logs or were rejected by the endpoint.
+    """
+
+    failed: bool
+    """
+    Whether the run stopped at a batch that could not be delivered.
+    """
+
+    seconds: float
+    """
+    How long the run took.
+    """
+
+
+class _Progress:
+    """
+    The running totals of a shipping run.
+    """
+
+    __slots__ = ("records", "batches", "bytes", "skipped")
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.batches = 0
+        self.bytes = 0
+        self.skipped = 0
+
+
+def listFiles(paths: Iterable[str]) -> List[str]:
+    """
+    Expands directories into the NDJSON files they hold, oldest name first.
+
+    Args:
+        paths (Iterable[str]): Files and directories.
+
+    Returns:
+        List[str]: The files, in the order they should be shipped.
+    """
+
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith(FILE_SUFFIX))
+        else:
+            files.append(path)
+    return files
+
+
+class BulkShipper:
+    """
+    Streams newline-delimited JSON log files to a Lumberjack endpoint in large batches sent in parallel.
+
+    Lines are sent as they are, without being parsed, unless `validate` is set. A batch the endpoint rejects as
+    malformed is split in halves until the offending lines are isolated, and those are skipped so they cannot hold the
+    checkpoint back. A line still being written (without its newline) is left for the next run. The checkpoint only moves past a batch once it and every
+    batch before it were delivered, so a run interrupted at any point resumes without losing logs, and at
+    worst sends again the batches that were in flight.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        transport: Optional[Transport] = None,
+        workers: int = 4,
+        batch_records: int = 1000,
+        batch_bytes: int = 4 * 1024 * 1024,
+        batch_format: BatchFormat | str = BatchFormat.JSON,
+        checkpoint: Optional[Checkpoint] = None,
+        validate: bool = False,
+    ) -> None:
+        """
+        Initializes the shipper.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            transport (Optional[Transport]): The transport used to deliver batches. Defaults to a pooled HttpTransport
+                with one connection per worker.
+            workers (int): Number of batches sent concurrently. Defaults to 4.
+            batch_records (int): Maximum number of logs per batch. Defaults to 1000.
+            batch_bytes (int): Maximum size of the lines of one batch. Defaults to 4 MiB.
+            batch_format (BatchFormat | str): How batches are combined: "json", "ndjson" or "columnar".
+                Defaults to "json".
+            checkpoint (Optional[Checkpoint]): Where the shipped offsets are kept. Defaults to an in-memory checkpoint.
+            validate (bool): Whether to check every line against the Log model and skip those that do not match.
+                Defaults to False.
+        """
+
+        self.__url = url
+        self.__workers = max(1, workers)
+        self.__transport: Transport = transport or HttpTransport(
+            pool_size=self.__workers)
+        self.__batch_records = max(1, batch_records)
+        self.__batch_bytes = max(1, batch_bytes)
+        self.__batch_format = BatchFormat(batch_format)
+        self.__checkpoint = checkpoint or Checkpoint()
+        self.__validate = validate
+
+    def ship(self, paths: Iterable[str]) -> ShipResult:
+        """
+        Ships files one after the other, stopping at the first batch that cannot be delivered.
+
+        Args:
+            paths (Iterable[str]): The files to ship. Directories are expanded into their NDJSON files.
+
+        Returns:
+            ShipResult: What was shipped.
+        """
+
+        started = time.monotonic()
+        progress = _Progress()
+        failed = False
+
+        with ThreadPoolExecutor(self.__workers, thread_name_prefix="lumberjack-ship") as pool:
+            for path in listFiles(paths):
+                if not self._shipFile(pool, path, progress):
+                    failed = True
+                    break
+
+        return ShipResult(progress.records, progress.batches, progress.bytes, progress.skipped, failed,
+                          time.monotonic() - started)
+
+    def close(self) -> None:
+        """
+        Closes the transport.
+        """
+
+        self.__transport.close()
+
+    def _shipFile(self, pool: ThreadPoolExecutor, path: str, progress: _Progress) -> bool:
+        """
+        Ships the complete lines of one file from its checkpoint on.
+
+        Args:
+            pool (ThreadPoolExecutor): Sends the batches.
+            path (str): The file to ship.
+            progress (_Progress): The totals of the run, updated in place.
+
+        Returns:
+            bool: True if every batch was delivered.
+        """
+
+        in_flight: Deque[Tuple["Future[Tuple[int, int]]", int, int]] = deque()
+        offset = committed = self.__checkpoint.offset(path)
+        batch: List[bytes] = []
+        size = 0
+
+        def complete(wait_all: bool) -> bool:
+            nonlocal committed
+            while in_flight and (wait_all or len(in_flight) >= 2 * self.__workers):
+                future, end, count = in_flight.popleft()
+                try:
+                    sent, skipped = future.result()
+                except Exception as e:
+                    print(f"Failed to ship batch: {e}")
+                    for pending, _, _ in in_flight:
+                        pending.cancel()
+                    in_flight.clear()
+                    return False
+                progress.bytes += sent
+                progress.records += count - skipped
+                progress.skipped += skipped
+                progress.batches += 1
+                self.__checkpoint.commit(path, end)
+                committed = end
+            return True
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+
+                payload = line.strip()
+                if not payload:
+                    continue
+                if self.__validate and not _isLog(payload):
+                    progress.skipped += 1
+                    continue
+
+                batch.append(payload)
+                size += len(payload) + 1
+                if len(batch) >= self.__batch_records or size >= self.__batch_bytes:
+                    in_flight.append(
+                        (pool.submit(self._post, batch), offset, len(batch)))
+                    batch, size = [], 0
+                    if not complete(wait_all=False):
+                        return False
+
+        if batch:
+            in_flight.append(
+                (pool.submit(self._post, batch), offset, len(batch)))
+        if not complete(wait_all=True):
+            return False
+        if offset != committed:
+            # Blank or skipped lines after the last batch.
+            self.__checkpoint.commit(path, offset)
+        return True
+
+    def _post(self, batch: List[bytes]) -> Tuple[int, int]:
+        """
+        Posts one batch of serialized logs, splitting it if its content is rejected.
+
+        Args:
+            batch (List[bytes]): The serialized logs.
+
+        Returns:
+            Tuple[int, int]: The size of the delivered request bodies and the number of rejected logs skipped.
+        """
+
+        try:
+            if self.__batch_format == BatchFormat.COLUMNAR:
+                body = encodeColumnar(batch)
+            else:
+                body = encodeBatch(batch, self.__batch_format)
+            self.__transport.post(self.__url, body,
+                                  self.__batch_format.content_type)
+        except Exception as e:
+            if not _isRejected(e):
+                raise
+            if len(batch) == 1:
+                print(f"Skipping rejected log: {e}")
+                return 0, 1
+            middle = len(batch) // 2
+            sent, skipped = self._post(batch[:middle])
+            rest_sent, rest_skipped = self._post(batch[middle:])
+            return sent + rest_sent, skipped + rest_skipped
+        return len(body), 0
+
+
+def _isRejected(error: BaseException) -> bool:
+    """
+    Whether a batch failed because of its content: it could not be encoded or the endpoint refused it as malformed.
+    """
+
+    if isinstance(error, HTTPError):
+        return error.response is not None and error.response.status_code in REJECTED_STATUSES
+    # Some request errors, like an invalid URL, are also ValueErrors but fail every batch alike.
+    return isinstance(error, ValueError) and not isinstance(error, RequestException)
+
+
+def _isLog(payload: bytes) -> bool:
+    """
+    Checks whether a line is a valid serialized log.
+    """
+
+    try:
+        Log.model_validate_json(payload)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+
+class Checkpoint:
+    """
+    Remembers up to which byte offset each file has been shipped, so an interrupted run resumes where it stopped.
+
+    Files are identified by path, device and inode: a file replaced or truncated since its offset was saved is
+    shipped again from the start. The offsets are saved to a JSON file, replaced atomically on every commit.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Loads the offsets saved by a previous run.
+
+        Args:
+            path (Optional[str]): The JSON file holding the offsets. Defaults to None (keep them in memory only).
+        """
+
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__files: Dict[str, Dict[str, int]] = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                self.__files = json.load(f).get("files", {})
+
+    def offset(self, filepath: str) -> int:
+        """
+        Returns the offset from which a file still has to be shipped.
+
+        Args:
+            filepath (str): The path of the file.
+
+        Returns:
+            int: The offset of the first line not shipped yet, or 0 if the file is unknown, replaced or truncated.
+        """
+
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return 0
+
+        with self.__lock:
+            entry = self.__files.get(os.path.abspath(filepath))
+        if entry is None or (entry.get("device"), entry.get("inode")) != (stat.st_dev, stat.st_ino):
+            return 0
+        if entry["offset"] > stat.st_size:
+            return 0
+        return entry["offset"]
+
+    def commit(self, filepath: str, offset: int) -> None:
+        """
+        Records that a file has been shipped up to an offset, and saves every offset.
+
+        Args:
+            filepath (str): The path of the file.
+            offset (int): The offset of the first line not shipped yet.
+        """
+
+        stat = os.stat(filepath)
+        with self.__lock:
+            self.__files[os.path.abspath(filepath)] = {
+                "offset": offset, "device": stat.st_dev, "inode": stat.st_ino}
+            if self.__path is None:
+                return
+
+            temporary = f"{self.__path}.tmp"
+            with open(temporary, "w") as f:
+                json.dump({"files": self.__files}, f)
+            os.replace(temporary, self.__path)
@@ -0,0 +1,82 @@
+"""
+Ships newline-delimited JSON log files to a Lumberjack endpoint.
+
+Usage:
+    lumberjack-ship URL PATH [PATH ...] [--checkpoint FILE] [--workers N] [--batch-records N]
+                    [--batch-bytes N] [--format {json,ndjson,columnar}] [--compression {gzip,deflate}]
+                    [--retries N] [--validate]
+"""
+
+import argparse
+from typing import List, Optional
+
+from lumberjack.files.bulk_shipper import BulkShipper
+from lumberjack.files.checkpoint import Checkpoint
+from lumberjack.transport import HttpTransport, ResilientTransport, RetryPolicy
+from lumberjack.transport.http_transport import COMPRESSIONS
+from lumberjack.utils import BatchFormat
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the `lumberjack-ship` command.
+
+    Args:
+        argv (Optional[List[str]]): The command line arguments. Defaults to None (use sys.argv).
+
+    Returns:
+        int: The exit status: 0 once every complete line was shipped, 1 if a batch could not be delivered.
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="lumberjack-ship", description=__doc__.splitlines()[1])
+    parser.add_argument("url", help="the URL of the logging endpoint")
+    parser.add_argument("paths", nargs="+", metavar="path",
+                        help="NDJSON files, or directories of .ndjson files")
+    parser.add_argument("--checkpoint",
+                        help="file remembering the shipped offsets, so an interrupted run resumes where it stopped")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="batches sent concurrently (default: 4)")
+    parser.add_argument("--batch-records", type=int, default=1000,
+                        help="maximum logs per batch (default: 1000)")
+    parser.add_argument("--batch-bytes", type=int, default=4 * 1024 * 1024,
+                        help="maximum bytes per batch (default: 4 MiB)")
+    parser.add_argument("--format", default=BatchFormat.JSON.value,
+                        choices=[
+                            batch_format.value for batch_format in BatchFormat],
+                        help="how batches are combined (default: json)")
+    parser.add_argument("--compression", choices=COMPRESSIONS,
+                        help="compress request bodies")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="retries of a failed batch before giving up (default: 3)")
+    parser.add_argument("--validate", action="store_true",
+                        help="skip lines that are not valid logs")
+    options = parser.parse_args(argv)
+
+    transport = ResilientTransport(
+        HttpTransport(pool_size=max(1, options.workers),
+                      compression=options.compression),
+        RetryPolicy(max_retries=options.retries),
+    )
+    shipper = BulkShipper(
+        options.url,
+        transport=transport,
+        workers=options.workers,
+        batch_records=options.batch_records,
+        batch_bytes=options.batch_bytes,
+        batch_format=options.format,
+        checkpoint=Checkpoint(options.checkpoint),
+        validate=options.validate,
+    )
+    try:
+        result = shipper.ship(options.paths)
+    finally:
+        shipper.close()
+
+    rate = result.records / result.seconds if result.seconds else 0.0
+    print(f"Shipped {result.records} logs in {result.batches} batches ({result.bytes} bytes) "
+          f"in {result.seconds:.1f}s, {rate:,.0f} logs/s. Skipped {result.skipped} invalid lines.")
+    if result.failed:
+        print("Stopped at a batch that could not be delivered; run again to resume.")
+        return 1
+    return 0
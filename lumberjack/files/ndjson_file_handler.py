@@ -0,0 +1,278 @@
+import logging
+import os
+import time
+from datetime import datetime
+from logging import Handler, LogRecord
+from typing import BinaryIO, List, Optional
+from weakref import WeakSet
+
+from lumberjack.utils import CodeCapture, Encoder, buildLog, getEncoder
+
+FILE_SUFFIX = ".ndjson"
+"""
+The suffix of the files written by NdjsonFileHandler.
+"""
+
+
+class NdjsonFileHandler(Handler):
+    """
+    A log handler that appends logs to local newline-delimited JSON files instead of posting them.
+
+    Each log is built like LumberjackHandler builds it and written as one JSON line. Lines are appended
+    through a write buffer, written out when it fills, when a record arrives `flush_interval` seconds
+    after the last write, on records at or above `flush_level`, and on `flush()` and `close()`. Most
+    records therefore cost no system call.
+
+    Files are named `<prefix>-<opening time>-<pid>-<sequence>.ndjson`, so sorting the names orders
+    them by age, and are never renamed: a file is rotated by starting the next one once it reaches
+    `max_bytes` or has been open for `rotate_interval` seconds. The files can be shipped with the
+    `lumberjack-ship` command.
+
+    The buffer is written out before `os.fork`, so a child never writes the parent's lines again, and the
+    child starts a file of its own on its first record.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        application_name: Optional[str] = None,
+        prefix: str = "lumberjack",
+        max_bytes: int = 64 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        backup_count: Optional[int] = None,
+        buffer_bytes: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        flush_level: int = logging.ERROR,
+        code_capture: CodeCapture | str = CodeCapture.WINDOW,
+        code_context_lines: int = 10,
+        stack_frames: bool = False,
+        encoder: Optional[str | Encoder] = None,
+    ) -> None:
+        """
+        Initializes the handler. The first file is opened on the first record.
+
+        Args:
+            directory (str): The directory the files are written to. Created if missing.
+            application_name (Optional[str]): The name of the application. Defaults to None.
+            prefix (str): The start of every file name. Defaults to "lumberjack".
+            max_bytes (int): Size at which the next file is started. Defaults to 64 MiB.
+            rotate_interval (Optional[float]): Seconds after which the next file is started. Defaults to None
+                (rotate on size only).
+            backup_count (Optional[int]): Maximum number of files with this prefix kept in the directory; the
+                oldest are deleted on rotation. Defaults to None (keep every file).
+            buffer_bytes (int): Size of the write buffer. Defaults to 64 KiB.
+            flush_interval (float): Seconds after the last write at which a record writes the buffer out.
+                Defaults to 1.0.
+            flush_level (int): Records at or above this level are written through at once. Defaults to ERROR.
+            code_capture (CodeCapture | str): How much of the calling source file to capture: "full", "window",
+                "hash" or "none". Defaults to "window", since every line of a file carries its own copy.
+            code_context_lines (int): Number of lines kept on each side of the logging call in "window" mode.
+                Defaults to 10.
+            stack_frames (bool): Whether logs of exceptions also carry the frames of the exception as a compact
+                structured list. Defaults to False.
+            encoder (Optional[str | Encoder]): Serializes each log: an encoder, or "orjson", "pydantic" or "json".
+                Defaults to orjson if installed, pydantic's serializer otherwise.
+        """
+
+        super().__init__()
+        self.__directory = directory
+        self.__application_name = application_name
+        self.__prefix = prefix
+        self.__max_bytes = max(1, max_bytes)
+        self.__rotate_interval = rotate_interval
+        self.__backup_count = backup_count
+        self.__buffer_bytes = max(1, buffer_bytes)
+        self.__flush_interval = flush_interval
+        self.__flush_level = flush_level
+        self.__code_capture = CodeCapture(code_capture)
+        self.__code_context_lines = code_context_lines
+        self.__stack_frames = stack_frames
+        self.__encode = getEncoder(encoder)
+        self.__file: Optional[BinaryIO] = None
+        self.__path: Optional[str] = None
+        self.__size = 0
+        self.__sequence = 0
+        self.__opened = 0.0
+        self.__flushed = 0.0
+
+        os.makedirs(directory, exist_ok=True)
+        _handlers.add(self)
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        The path of the file currently written to, if any.
+        """
+        return self.__path
+
+    def emit(self, record: LogRecord) -> None:
+        """
+        Appends the log of a record to the current file.
+
+        Args:
+            record (LogRecord): The log record to be emitted.
+        """
+
+        log = buildLog(
+            record,
+            self.__application_name,
+            self.__code_capture,
+            self.__code_context_lines,
+            self.__stack_frames,
+        )
+        if not log:
+            return
+
+        try:
+            line = self.__encode(log) + b"\n"
+            now = time.monotonic()
+            file = self._file(len(line), now)
+            file.write(line)
+            self.__size += len(line)
+
+            if record.levelno >= self.__flush_level or now - self.__flushed >= self.__flush_interval:
+                file.flush()
+                self.__flushed = now
+        except Exception as e:
+            print(f"Failed to write log: {e}")
+
+    def flush(self) -> None:
+        """
+        Writes the buffered logs to the current file.
+        """
+
+        self.acquire()
+        try:
+            if self.__file is not None:
+                self.__file.flush()
+                self.__flushed = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """
+        Writes the buffered logs and closes the current file.
+        """
+
+        self.acquire()
+        try:
+            self._closeFile()
+        finally:
+            self.release()
+        _handlers.discard(self)
+        super().close()
+
+    def _file(self, size: int, now: float) -> BinaryIO:
+        """
+        Returns the file the next line goes to, starting a new one if the current one is due for rotation.
+
+        Args:
+            size (int): The size of the next line in bytes.
+            now (float): The current monotonic time.
+
+        Returns:
+            BinaryIO: The open file.
+        """
+
+        if self.__file is not None:
+            full = self.__size and self.__size + size > self.__max_bytes
+            expired = self.__rotate_interval is not None and now - \
+                self.__opened >= self.__rotate_interval
+            if not full and not expired:
+                return self.__file
+            self._closeFile()
+            self._deleteOldFiles()
+
+        self.__sequence += 1
+        self.__path = os.path.join(
+            self.__directory,
+            f"{self.__prefix}-{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}-{self.__sequence:04d}{FILE_SUFFIX}")
+        file: BinaryIO = open(self.__path, "ab", buffering=self.__buffer_bytes)
+        self.__file = file
+        self.__size = file.tell()
+        self.__opened = now
+        self.__flushed = now
+        return file
+
+    def _closeFile(self) -> None:
+        """
+        Flushes and closes the current file, if any.
+        """
+
+        file, self.__file = self.__file, None
+        if file is not None:
+            file.close()
+
+    def _reinitAfterFork(self) -> None:
+        """
+        Gives a forked child a new lock and makes it start a file of its own, closing its copy of the inherited
+        one, which stays open in the parent. The buffer was written out before the fork, so nothing is lost or
+        written twice.
+        """
+
+        self.createLock()
+        file, self.__file = self.__file, None
+        if file is not None:
+            try:
+                file.close()
+            except OSError as e:
+                print(f"Failed to close inherited log file: {e}")
+
+    def _deleteOldFiles(self) -> None:
+        """
+        Deletes the oldest files with this prefix beyond `backup_count`, counting the one about to be opened.
+        """
+
+        if self.__backup_count is None:
+            return
+
+        files: List[str] = sorted(
+            name for name in os.listdir(self.__directory)
+            if name.startswith(f"{self.__prefix}-") and name.endswith(FILE_SUFFIX))
+        for name in files[:max(0, len(files) - self.__backup_count + 1)]:
+            try:
+                os.remove(os.path.join(self.__directory, name))
+            except OSError as e:
+                print(f"Failed to delete log file: {e}")
+
+
+_handlers: "WeakSet[NdjsonFileHandler]" = WeakSet()
+"""
+The handlers not closed yet.
+"""
+
+_forking: List[NdjsonFileHandler] = []
+"""
+The handlers locked for the duration of a fork.
+"""
+
+
+def _beforeFork() -> None:
+    """
+    Writes out the buffer of every open handler and holds its lock until the fork is done.
+    """
+
+    _forking[:] = list(_handlers)
+    for handler in _forking:
+        handler.acquire()
+        try:
+            handler.flush()
+        except Exception as e:
+            print(f"Failed to write logs before fork: {e}")
+
+
+def _afterForkInParent() -> None:
+    for handler in _forking:
+        handler.release()
+    _forking.clear()
+
+
+def _afterForkInChild() -> None:
+    for handler in _forking:
+        handler._reinitAfterFork()
+    _forking.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_beforeFork, after_in_parent=_afterForkInParent,
+                        after_in_child=_afterForkInChild)
@@ -0,0 +1,20 @@
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.forwarding.forwarding_handler import ForwardingHandler
+    from lumberjack.forwarding.log_shipper import LogShipper
+    from lumberjack.forwarding.records import (MAX_FRAME_SIZE, decodeFrames,
+                                               decodeRecord, encodeRecord)
+
+_EXPORTS = {
+    "ForwardingHandler": "lumberjack.forwarding.forwarding_handler",
+    "LogShipper": "lumberjack.forwarding.log_shipper",
+    "MAX_FRAME_SIZE": "lumberjack.forwarding.records",
+    "decodeFrames": "lumberjack.forwarding.records",
+    "decodeRecord": "lumberjack.forwarding.records",
+    "encodeRecord": "lumberjack.forwarding.records",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
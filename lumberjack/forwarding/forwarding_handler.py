@@ -0,0 +1,130 @@
+import os
+import socket
+import time
+from logging import Handler, LogRecord
+from typing import Optional
+
+from lumberjack.forwarding.records import encodeRecord
+
+
+class ForwardingHandler(Handler):
+    """
+    A log handler that forwards records over a Unix domain socket to a LogShipper process.
+
+    Each record costs one local socket write: building the log, reading the source code, batching and
+    HTTP delivery all happen in the shipper. Records are dropped, never buffered, while the shipper
+    is unreachable. The connection is re-opened after a fork, so one handler can be created before
+    worker processes are forked.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        timeout: float = 1.0,
+        reconnect_interval: float = 1.0,
+    ) -> None:
+        """
+        Initializes the forwarding handler. The connection is opened on the first record.
+
+        Args:
+            address (str): The path of the Unix domain socket the shipper listens on.
+            timeout (float): Maximum seconds a write may block while the shipper is busy. Defaults to 1.0.
+            reconnect_interval (float): Minimum seconds between attempts to reach an unavailable shipper.
+                Defaults to 1.0.
+        """
+
+        super().__init__()
+        self.__address = address
+        self.__timeout = timeout
+        self.__reconnect_interval = reconnect_interval
+        self.__socket: Optional[socket.socket] = None
+        self.__pid = os.getpid()
+        self.__next_attempt = 0.0
+        self.__dropped = 0
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of records dropped because the shipper could not be reached.
+        """
+        return self.__dropped
+
+    def emit(self, record: LogRecord) -> None:
+        """
+        Forwards the log record to the shipper.
+
+        Args:
+            record (LogRecord): The log record to be emitted.
+        """
+
+        try:
+            frame = encodeRecord(record)
+        except Exception as e:
+            print(f"Failed to forward log: {e}")
+            return
+
+        connection = self._connection()
+        if connection is None:
+            self.__dropped += 1
+            return
+
+        try:
+            connection.sendall(frame)
+        except OSError as e:
+            print(f"Failed to forward log: {e}")
+            self.__dropped += 1
+            self._disconnect()
+
+    def close(self) -> None:
+        """
+        Closes the connection to the shipper.
+        """
+
+        self.acquire()
+        try:
+            self._disconnect()
+        finally:
+            self.release()
+        super().close()
+
+    def _connection(self) -> Optional[socket.socket]:
+        """
+        Returns the connection of this process to the shipper, opening it if needed.
+        """
+
+        if self.__pid != os.getpid():
+            # The connection was inherited from the parent: closing this copy leaves the parent's open.
+            if self.__socket is not None:
+                self.__socket.close()
+            self.__socket = None
+            self.__pid = os.getpid()
+            self.__next_attempt = 0.0
+
+        if self.__socket is not None:
+            return self.__socket
+
+        now = time.monotonic()
+        if now < self.__next_attempt:
+            return None
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.__timeout)
+        try:
+            connection.connect(self.__address)
+        except OSError:
+            connection.close()
+            self.__next_attempt = now + self.__reconnect_interval
+            return None
+
+        self.__socket = connection
+        return connection
+
+    def _disconnect(self) -> None:
+        """
+        Closes the connection to the shipper, if any.
+        """
+
+        connection, self.__socket = self.__socket, None
+        if connection is not None:
+            connection.close()
+        self.__next_attempt = time.monotonic() + self.__reconnect_interval
@@ -0,0 +1,248 @@
+import multiprocessing
+import os
+import selectors
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from lumberjack.forwarding.records import decodeFrames
+from lumberjack.lumberjack_handler import LumberjackHandler
+
+
+class LogShipper:
+    """
+    A separate process that receives records forwarded by ForwardingHandlers over a Unix domain socket
+    and ships them to the logging endpoint.
+
+    The shipper owns the only LumberjackHandler, so batching, retries, spooling and the HTTP
+    connections are shared by every worker process instead of being repeated in each of them.
+    Start it in the parent process before workers are forked (e.g. in a gunicorn `on_starting` hook).
+
+    Example:
+        >>> shipper = LogShipper("http://localhost:8080/logs", "my-app").start()
+        >>> logger.addHandler(ForwardingHandler(shipper.address))
+    """
+
+    def __init__(
+        self,
+        url: str,
+        application_name: Optional[str] = None,
+        address: Optional[str] = None,
+        start_method: Optional[str] = None,
+        start_timeout: float = 10.0,
+        **handler_options: Any,
+    ) -> None:
+        """
+        Initializes the shipper. The process is started by `start`.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            application_name (Optional[str]): The name of the application. Defaults to None.
+            address (Optional[str]): The path of the Unix domain socket to listen on. Defaults to a new
+                socket in a private temporary directory.
+            start_method (Optional[str]): The multiprocessing start method of the shipper process. With "spawn"
+                or "forkserver", `handler_options` must be picklable. Defaults to the platform default.
+            start_timeout (float): Maximum seconds `start` waits for the shipper process to be ready. Defaults to 10.0.
+            **handler_options (Any): Additional keyword arguments passed to the shipper's LumberjackHandler,
+                which always runs in asynchronous mode.
+        """
+
+        self.__url = url
+        self.__application_name = application_name
+        self.__handler_options = handler_options
+        self.__directory: Optional[str] = None
+        if address is None:
+            self.__directory = tempfile.mkdtemp(prefix="lumberjack-")
+            address = os.path.join(self.__directory, "shipper.sock")
+        self.__address = address
+        self.__context: Any = multiprocessing.get_context(start_method)
+        self.__start_timeout = start_timeout
+        self.__process: Optional[multiprocessing.process.BaseProcess] = None
+
+    @property
+    def address(self) -> str:
+        """
+        The path of the Unix domain socket the shipper listens on.
+        """
+        return self.__address
+
+    @property
+    def pid(self) -> Optional[int]:
+        """
+        The process ID of the shipper, once started.
+        """
+        return self.__process.pid if self.__process is not None else None
+
+    def is_alive(self) -> bool:
+        """
+        Returns whether the shipper process is running.
+        """
+        return self.__process is not None and self.__process.is_alive()
+
+    def start(self) -> "LogShipper":
+        """
+        Binds the socket and starts the shipper process.
+
+        The socket is listening when this returns, so records forwarded right away are not lost, and
+        the shipper is ready to drain them on `stop`.
+
+        Returns:
+            LogShipper: The started shipper.
+        """
+
+        if self.__process is not None:
+            return self
+
+        if os.path.exists(self.__address):
+            os.unlink(self.__address)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self.__address)
+            os.chmod(self.__address, 0o600)
+            listener.listen(socket.SOMAXCONN)
+
+            ready = self.__context.Event()
+            self.__process = self.__context.Process(
+                target=_serve,
+                args=(listener, ready, os.getpid(), self.__url,
+                      self.__application_name, self.__handler_options),
+                name="lumberjack-shipper",
+                daemon=True,
+            )
+            self.__process.start()
+        finally:
+            listener.close()
+
+        ready.wait(self.__start_timeout)
+        return self
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Stops the shipper once it has shipped the records already forwarded, and removes its socket.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait for the shipper to drain before it is killed.
+                Defaults to 10.0.
+        """
+
+        process, self.__process = self.__process, None
+        if process is not None:
+            if process.is_alive():
+                process.terminate()
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+        if self.__directory is not None:
+            shutil.rmtree(self.__directory, ignore_errors=True)
+        elif os.path.exists(self.__address):
+            os.unlink(self.__address)
+
+    def __enter__(self) -> "LogShipper":
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+
+def _serve(
+    listener: socket.socket,
+    ready: Any,
+    parent_pid: int,
+    url: str,
+    application_name: Optional[str],
+    handler_options: Dict[str, Any],
+) -> None:
+    """
+    The main loop of the shipper process: accepts worker connections and hands every forwarded record
+    to a LumberjackHandler, until it is terminated or its parent exits.
+    """
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+
+    handler = LumberjackHandler(
+        url, application_name, asynchronous=True, **handler_options)
+    buffers: Dict[socket.socket, bytearray] = {}
+    ready.set()
+
+    def drop(connection: socket.socket) -> None:
+        selector.unregister(connection)
+        connection.close()
+        del buffers[connection]
+
+    def receive(connection: socket.socket) -> bool:
+        """
+        Reads what is available on a connection, returning False if nothing was read or it was closed.
+        """
+
+        try:
+            chunk = connection.recv(256 * 1024)
+        except (BlockingIOError, InterruptedError):
+            return False
+        except OSError:
+            chunk = b""
+
+        if not chunk:
+            drop(connection)
+            return False
+
+        buffer = buffers[connection]
+        buffer += chunk
+        try:
+            # Decoding stops before an oversized frame and only raises once it is at the start of the buffer.
+            records = decodeFrames(buffer)
+            while records:
+                for record in records:
+                    handler.handle(record)
+                records = decodeFrames(buffer) if buffer else []
+        except ValueError as e:
+            print(f"Dropping forwarding connection: {e}")
+            drop(connection)
+            return False
+        return True
+
+    def accept() -> bool:
+        """
+        Accepts a pending connection, returning False if there was none.
+        """
+
+        try:
+            connection, _ = listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return False
+        connection.setblocking(False)
+        selector.register(connection, selectors.EVENT_READ)
+        buffers[connection] = bytearray()
+        return True
+
+    listener.setblocking(False)
+    with selectors.DefaultSelector() as selector:
+        selector.register(listener, selectors.EVENT_READ)
+
+        while not stopping.is_set() and os.getppid() == parent_pid:
+            for key, _ in selector.select(0.2):
+                if key.fileobj is listener:
+                    accept()
+                else:
+                    assert isinstance(key.fileobj, socket.socket)
+                    receive(key.fileobj)
+
+        # Ship what the workers wrote before the shipper was stopped, including connections not accepted yet.
+        while accept():
+            pass
+        selector.unregister(listener)
+        listener.close()
+        for connection in list(buffers):
+            while receive(connection):
+                pass
+
+    for connection in list(buffers):
+        connection.close()
+    handler.close()
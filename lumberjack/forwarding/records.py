@@ -0,0 +1,134 @@
+import json
+import struct
+from logging import LogRecord, makeLogRecord
+from typing import List, Optional, Tuple
+
+from lumberjack.utils.stack_traces import getStackTrace
+
+FRAME_HEADER = struct.Struct(">I")
+"""
+The header written before every forwarded record: the length of the encoded record.
+"""
+
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+"""
+The largest encoded record accepted. A longer length prefix means the stream is corrupt or not from a ForwardingHandler.
+"""
+
+_FIELDS = ("name", "levelno", "levelname", "msg", "created",
+           "pathname", "filename", "lineno", "exc_text")
+"""
+The LogRecord attributes forwarded to the shipper, in wire order.
+"""
+
+
+def encodeRecord(record: LogRecord) -> bytes:
+    """
+    Encodes the parts of a log record the shipper needs into a length-prefixed frame.
+
+    The message is formatted and the exception rendered in the emitting process, since neither
+    the arguments nor the traceback can cross the process boundary.
+
+    Args:
+        record (LogRecord): The log record to forward.
+
+    Returns:
+        bytes: The frame to write to the shipper socket.
+
+    Raises:
+        ValueError: If the encoded record is larger than MAX_FRAME_SIZE.
+    """
+
+    exc_text = record.exc_text
+    if exc_text is None:
+        trace = getStackTrace(record.exc_info)
+        exc_text = trace.text if trace is not None else None
+
+    body = json.dumps(
+        [
+            record.name,
+            record.levelno,
+            record.levelname,
+            record.getMessage(),
+            record.created,
+            record.pathname,
+            record.filename,
+            record.lineno,
+            exc_text,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8", "surrogatepass")
+    if len(body) > MAX_FRAME_SIZE:
+        raise ValueError(
+            f"Record of {len(body)} bytes exceeds the maximum frame size of {MAX_FRAME_SIZE} bytes")
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+def decodeRecord(body: bytes) -> LogRecord:
+    """
+    Rebuilds a log record from the body of a forwarded frame.
+
+    Args:
+        body (bytes): The frame without its length header.
+
+    Returns:
+        LogRecord: A record equivalent to the one emitted, with its message already formatted.
+    """
+
+    return makeLogRecord(dict(zip(_FIELDS, json.loads(body))))
+
+
+def decodeFrames(buffer: bytearray) -> List[LogRecord]:
+    """
+    Decodes and removes every complete frame at the start of a receive buffer.
+
+    Args:
+        buffer (bytearray): The bytes received so far on one connection. Consumed frames are removed.
+
+    Returns:
+        List[LogRecord]: The decoded records. A trailing partial frame stays in the buffer, and so does a frame
+            larger than MAX_FRAME_SIZE that follows them.
+
+    Raises:
+        ValueError: If the frame at the start of the buffer is larger than MAX_FRAME_SIZE. The connection should be
+            dropped, since the stream cannot be resynchronized.
+    """
+
+    records: List[LogRecord] = []
+    offset = 0
+    while True:
+        try:
+            frame = _nextFrame(buffer, offset)
+        except ValueError:
+            if records or offset:
+                break
+            raise
+        if frame is None:
+            break
+        start, end = frame
+        try:
+            records.append(decodeRecord(bytes(buffer[start:end])))
+        except (ValueError, TypeError) as e:
+            print(f"Discarding malformed forwarded record: {e}")
+        offset = end
+    del buffer[:offset]
+    return records
+
+
+def _nextFrame(buffer: bytearray, offset: int) -> Optional[Tuple[int, int]]:
+    """
+    Returns the bounds of the body of the complete frame at `offset`, if any, and raises ValueError if its length
+    exceeds MAX_FRAME_SIZE.
+    """
+
+    if len(buffer) - offset < FRAME_HEADER.size:
+        return None
+    (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(
+            f"Frame of {length} bytes exceeds the maximum frame size of {MAX_FRAME_SIZE} bytes")
+    start = offset + FRAME_HEADER.size
+    if len(buffer) < start + length:
+        return None
+    return start, start + length
@@ -0,0 +1,111 @@
+from typing import NamedTuple, Optional
+
+from lumberjack.transport import CircuitBreaker, RetryPolicy, Transport
+from lumberjack.utils import BackpressurePolicy, BatchFormat, DiskSpool
+
+
+class BatchingOptions(NamedTuple):
+    """
+    How a LumberjackHandler queues logs and combines them into requests.
+
+    Example:
+        >>> LumberjackHandler(url, asynchronous=True, batching=BatchingOptions(senders=4, max_linger=0.5))
+    """
+
+    senders: int = 1
+    """
+    Number of background threads shipping batches concurrently in asynchronous mode, so several requests can be in
+    flight against a slow endpoint. Logs are partitioned by logger name, so the logs of one logger are still delivered
+    in order, as long as none has to be spooled. The queue limits are shared between the senders.
+    """
+
+    max_queue_size: int = 10000
+    """
+    Maximum number of logs waiting to be shipped in asynchronous mode.
+    """
+
+    max_queue_bytes: Optional[int] = None
+    """
+    Maximum estimated size of the logs waiting to be shipped in asynchronous mode. None sets no byte limit.
+    """
+
+    backpressure: BackpressurePolicy | str = BackpressurePolicy.DROP_NEWEST
+    """
+    What happens to a log when the queue is full in asynchronous mode: "block" waits up to `block_timeout` for room,
+    "drop_newest" drops the log, "drop_oldest" drops the oldest logs waiting, and "drop_lowest_level" drops the oldest
+    logs of the lowest level waiting if it is below the level of the log, so errors survive a flood of debug logs.
+    """
+
+    block_timeout: Optional[float] = 1.0
+    """
+    Maximum seconds `emit` waits for room with the "block" policy before dropping the log. None waits forever.
+    """
+
+    max_batch_records: int = 500
+    """
+    Maximum number of logs per batch in asynchronous mode.
+    """
+
+    max_batch_bytes: int = 1024 * 1024
+    """
+    Maximum size of a request body. Batches are split to fit, unless a single log is larger on its own.
+    """
+
+    max_linger: float = 1.0
+    """
+    Maximum seconds a log waits for its batch to fill in asynchronous mode.
+    """
+
+    batch_format: BatchFormat | str = BatchFormat.JSON
+    """
+    How batches are combined: "json" for a JSON array, "ndjson" for newline-delimited JSON, or "columnar" for one
+    array per field with the strings the logs share sent once per batch. Columnar batches are gathered by
+    `max_batch_records` and `max_linger`, then halved until their body fits `max_batch_bytes`.
+    """
+
+    chunk_size: Optional[int] = None
+    """
+    Streams JSON and NDJSON request bodies larger than this with chunked transfer encoding, in chunks of about this
+    size, instead of joining them into one bytes object. The transport must accept chunked bodies, as HttpTransport
+    does. None never streams.
+    """
+
+
+class DeliveryOptions(NamedTuple):
+    """
+    How a LumberjackHandler sends requests and what it does when they fail.
+
+    Example:
+        >>> LumberjackHandler(url, delivery=DeliveryOptions(retry=RetryPolicy(), spool=DiskSpool("/var/spool/app")))
+    """
+
+    transport: Optional[Transport] = None
+    """
+    The transport used to deliver logs. None uses a pooled HttpTransport with at least one connection per sender.
+    """
+
+    retry: Optional[RetryPolicy] = None
+    """
+    Retries connection errors, timeouts, 5xx and 429 responses with jittered exponential backoff. With several
+    endpoints, each attempt tries every candidate endpoint once, so a dead endpoint fails over after a single attempt.
+    None never retries.
+    """
+
+    circuit_breaker: Optional[CircuitBreaker] = None
+    """
+    Stops sending to the endpoint for a cool-down period after consecutive failures. With several endpoints, each
+    endpoint gets its own breaker with these settings; pass an EndpointPool its breaker instead. An endpoint out of
+    rotation is probed by the next log sent after its probe interval, not in the background.
+    """
+
+    spool: Optional[DiskSpool] = None
+    """
+    Keeps logs that could not be delivered because of connection errors, timeouts, 5xx or 429 responses, and replays
+    them in order once the endpoint recovers.
+    """
+
+    sources_url: Optional[str] = None
+    """
+    The URL source file bodies are uploaded to in "hash" mode. None uses the "sources" resource below the endpoint
+    each batch is sent to.
+    """
@@ -1,9 +1,11 @@
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from lumberjack.lumberjack_handler import LumberjackHandler
 from lumberjack.utils.console_formatter import ConsoleFormatter
 
+if TYPE_CHECKING:
+    from lumberjack.forwarding.log_shipper import LogShipper
+
 
 class LumberjackFactory:
     """
@@ -17,6 +19,11 @@ class LumberjackFactory:
         application_name: Optional[str] = None,
         log_level: str | int = logging.DEBUG,
         emit: bool = False,
+        asynchronous: bool = False,
+        use_asyncio: bool = False,
+        forward_to: Optional[str] = None,
+        log_directory: Optional[str] = None,
+        **handler_options: Any,
     ) -> logging.Logger:
         """
         Creates a new logger instance with optional Lumberjack handlers.
@@ -27,6 +34,15 @@ class LumberjackFactory:
             application_name (Optional[str]): Name of the application using the logger. Defaults to None.
             log_level (str | int): Logging level for the logger. Defaults to logging.DEBUG.
             emit (bool): Whether to add a Lumberjack handler to the logger. Defaults to False.
+            asynchronous (bool): Whether the Lumberjack handler ships logs in batches from a background thread
+                instead of posting each one on the calling thread. Defaults to False.
+            use_asyncio (bool): Whether to add an AsyncLumberjackHandler, which ships logs from a task on the running
+                event loop, instead of a LumberjackHandler. Defaults to False.
+            forward_to (Optional[str]): The socket address of a shipper started with `StartShipper`. When given,
+                logs are forwarded to the shipper process instead of being shipped from this process. Defaults to None.
+            log_directory (Optional[str]): Also writes the logs to rotating NDJSON files in this directory, e.g. for
+                air-gapped runs, to be shipped later with `lumberjack-ship`. Defaults to None.
+            **handler_options (Any): Additional keyword arguments passed to the Lumberjack handler.
 
         Returns:
             logging.Logger: Configured logger instance.
@@ -40,11 +56,69 @@ class LumberjackFactory:
         logger.setLevel(log_level)
         logger = LumberjackFactory._addConsoleHandler(logger, log_level)
 
-        if emit:
-            logger.addHandler(LumberjackHandler(url, application_name))
+        # The handlers are imported here, so that only the one in use (and its dependencies) is loaded.
+        if emit and forward_to:
+            from lumberjack.forwarding.forwarding_handler import \
+                ForwardingHandler
+            logger.addHandler(ForwardingHandler(forward_to, **handler_options))
+        elif emit and use_asyncio:
+            from lumberjack.async_lumberjack_handler import \
+                AsyncLumberjackHandler
+            logger.addHandler(
+                AsyncLumberjackHandler(
+                    url,
+                    application_name,
+                    **handler_options,
+                )
+            )
+        elif emit:
+            from lumberjack.lumberjack_handler import LumberjackHandler
+            logger.addHandler(
+                LumberjackHandler(
+                    url,
+                    application_name,
+                    asynchronous=asynchronous,
+                    **handler_options,
+                )
+            )
+
+        if log_directory:
+            from lumberjack.files.ndjson_file_handler import NdjsonFileHandler
+            logger.addHandler(NdjsonFileHandler(
+                log_directory, application_name))
 
         return logger
 
+    @staticmethod
+    def StartShipper(
+        url: str,
+        application_name: Optional[str] = None,
+        address: Optional[str] = None,
+        **handler_options: Any,
+    ) -> "LogShipper":
+        """
+        Starts a shipper process that ships the logs forwarded by every worker process.
+
+        Call it in the parent process before workers are forked, then create the workers' loggers
+        with `forward_to=shipper.address`.
+
+        Args:
+            url (str): URL of the logging endpoint.
+            application_name (Optional[str]): Name of the application using the logger. Defaults to None.
+            address (Optional[str]): Path of the Unix domain socket to listen on. Defaults to a private temporary path.
+            **handler_options (Any): Additional keyword arguments passed to the shipper's LumberjackHandler.
+
+        Returns:
+            LogShipper: The running shipper. Call `stop()` on shutdown to ship the remaining logs.
+
+        Example:
+            >>> shipper = LumberjackFactory.StartShipper("http://localhost:8080/logs", "my-app")
+            >>> logger = LumberjackFactory.CreateInstance("MyLogger", emit=True, forward_to=shipper.address)
+        """
+
+        from lumberjack.forwarding.log_shipper import LogShipper
+        return LogShipper(url, application_name, address, **handler_options).start()
+
     @staticmethod
     def _addConsoleHandler(logger: logging.Logger, level: int | str) -> logging.Logger:
         """
@@ -57,8 +131,10 @@ class LumberjackFactory:
         Returns:
             logging.Logger: Logger instance with the added console handler.
         """
+        # The formatter initializes colorama, which wraps sys.stderr, so it is built before the handler picks the stream.
+        formatter = ConsoleFormatter()
         handler = logging.StreamHandler()
         handler.setLevel(level)
-        handler.setFormatter(ConsoleFormatter())
+        handler.setFormatter(formatter)
         logger.addHandler(handler)
         return logger
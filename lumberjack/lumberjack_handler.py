@@ -1,52 +1,773 @@
-import json
-from logging import LogRecord, StreamHandler
-from typing import Dict, Optional
+import atexit
+import os
+import threading
+import time
+from logging import LogRecord, StreamHandler, getLevelName, makeLogRecord
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, cast
+from weakref import WeakSet, ref
 
-import requests
-from requests import HTTPError, Response
+from requests import RequestException
 
-from lumberjack.utils import buildLog
+from lumberjack.handler_options import BatchingOptions, DeliveryOptions
+from lumberjack.metrics import HandlerMetrics, MetricsServer, toPrometheus
+from lumberjack.models import Log
+from lumberjack.transport import (CircuitBreaker, EndpointPool, HttpTransport,
+                                  ResilientTransport, Transport, isRetriable,
+                                  resetTransport)
+from lumberjack.utils import (BatchFormat, BatchWorker, ChunkedBody,
+                              CodeCapture, DiskSpool, Encoder, FieldLimits,
+                              LogThrottle, RecordBuffer, SourceRegistry,
+                              buildLog, encodeBatch, encodeColumnar,
+                              getEncoder, missingSources, source_cache,
+                              sourcesUrl, splitBatch, traceback_cache)
+
+MAX_PARTITIONED_LOGGERS = 10000
+"""
+The number of loggers assigned a sender partition in turn; further loggers are assigned one by hash.
+"""
 
 
 class LumberjackHandler(StreamHandler):
     """
     A custom log handler class that formats log messages and sends them to a logging endpoint.
+
+    Handlers survive `os.fork`: in the child, the connections, the background worker and the statistics
+    inherited from the parent are replaced by new ones, and the logs still queued in the parent are left to it.
+    Open handlers are closed at interpreter exit, each waiting at most `shutdown_timeout` seconds for its
+    remaining logs to be shipped.
     """
 
     def __init__(
         self,
-        url: Optional[str] = None,
+        url: Optional[str | Sequence[str] | EndpointPool] = None,
         application_name: Optional[str] = None,
+        asynchronous: bool = False,
+        batching: Optional[BatchingOptions] = None,
+        delivery: Optional[DeliveryOptions] = None,
+        code_capture: CodeCapture | str = CodeCapture.FULL,
+        code_context_lines: int = 10,
+        stack_frames: bool = False,
+        field_limits: Optional[FieldLimits] = None,
+        encoder: Optional[str | Encoder] = None,
+        throttle: Optional[LogThrottle] = None,
+        record_buffer: Optional[RecordBuffer] = None,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = "127.0.0.1",
+        shutdown_timeout: Optional[float] = 5.0,
     ) -> None:
         """
         Initializes the Lumberjack log handler.
 
         Args:
-            url (str): The URL of the logging endpoint.
+            url (Optional[str | Sequence[str] | EndpointPool]): The URL of the logging endpoint, or several URLs to
+                spread the requests across in turn, taking failing endpoints out of rotation, or an EndpointPool to
+                configure how. A request that fails on one endpoint is tried on the next. Defaults to None.
             application_name (str, optional): The name of the application. Defaults to None.
+            asynchronous (bool): Whether to enqueue logs and ship them in batches from background threads
+                instead of posting each one on the calling thread. Defaults to False.
+            batching (Optional[BatchingOptions]): How logs are queued and combined into requests: the number of
+                senders, the queue limits and backpressure policy, the batch limits and format. Defaults to
+                BatchingOptions().
+            delivery (Optional[DeliveryOptions]): How requests are sent and what happens when they fail: the
+                transport, retries, circuit breaker, spool and sources URL. Defaults to DeliveryOptions().
+            code_capture (CodeCapture | str): How much of the calling source file to capture: "full", "window",
+                "hash" or "none". In "hash" mode logs only carry the hash of their source file, and each distinct
+                file body is uploaded once per session to the sources URL. Defaults to "full".
+            code_context_lines (int): Number of lines kept on each side of the logging call in "window" mode.
+                Defaults to 10.
+            stack_frames (bool): Whether logs of exceptions also carry the frames of the exception as a compact
+                structured list, next to the rendered traceback. Defaults to False.
+            field_limits (Optional[FieldLimits]): Cuts the message, stack trace and code of each log to byte limits
+                when it is built, marking what was cut, so no single log can grow megabytes large. Defaults to None
+                (no limits).
+            encoder (Optional[str | Encoder]): Serializes each log straight into request body bytes: an encoder,
+                or "orjson", "pydantic" or "json". Defaults to orjson if installed, pydantic's serializer otherwise.
+            throttle (Optional[LogThrottle]): Samples records by level, rate-limits each call site and collapses
+                repeated messages before any log is built. The summaries of collapsed repeats are shipped by a
+                background thread once their window closes. Defaults to None (ship every record).
+            record_buffer (Optional[RecordBuffer]): Keeps the latest DEBUG records of each logger or request in
+                memory without building them, and ships them as one batch with the next record at its trigger level,
+                e.g. ERROR. Defaults to None (ship every record as it comes).
+            metrics_port (Optional[int]): Serves the handler statistics in the Prometheus text format on this
+                port, 0 picking a free one. Defaults to None (no endpoint; `stats()` is always available).
+            metrics_host (str): The interface the metrics endpoint listens on. Defaults to "127.0.0.1".
+            shutdown_timeout (Optional[float]): Maximum seconds `close()`, also called at interpreter exit, waits
+                for the queued logs to be shipped. None waits forever. Defaults to 5.0.
         """
 
         super().__init__()
+        batching = batching or BatchingOptions()
+        delivery = delivery or DeliveryOptions()
+        circuit_breaker = delivery.circuit_breaker
+        self.__endpoints: Optional[EndpointPool] = None
+        if isinstance(url, EndpointPool):
+            if circuit_breaker is not None:
+                raise ValueError(
+                    "The circuit breaker of an EndpointPool is configured on the pool.")
+            self.__endpoints = url
+            url = url.urls[0]
+        elif url is not None and not isinstance(url, str):
+            urls = list(url)
+            if len(urls) > 1:
+                self.__endpoints = EndpointPool(
+                    urls, circuit_breaker=circuit_breaker)
+            url = urls[0] if urls else None
         self.__url: Optional[str] = url
         self.__application_name = application_name
+        self.__code_capture = CodeCapture(code_capture)
+        self.__code_context_lines = code_context_lines
+        self.__stack_frames = stack_frames
+        self.__field_limits = field_limits
+        self.__encode = getEncoder(encoder)
+        self.__batch_format = BatchFormat(batching.batch_format)
+        self.__chunk_size = batching.chunk_size
+        self.__senders = max(1, batching.senders)
+        self.__transport: Transport = delivery.transport or HttpTransport(
+            pool_size=max(10, self.__senders))
+        self.__circuit_breaker = circuit_breaker
+        self.__retry = delivery.retry
+        if self.__endpoints is None and (self.__retry is not None or circuit_breaker is not None):
+            self.__transport = ResilientTransport(
+                self.__transport, self.__retry, circuit_breaker)
+        self.__spool = delivery.spool
+        self.__sources = SourceRegistry()
+        self.__sources_url = delivery.sources_url
+        self.__throttle = throttle
+        self.__summaries_stopped: Optional[threading.Event] = None
+        self.__record_buffer = record_buffer
+        self.__metrics = HandlerMetrics()
+        self.__max_batch_records = batching.max_batch_records
+        self.__max_batch_bytes = batching.max_batch_bytes
+        self.__shutdown_timeout = shutdown_timeout
+        self.__closed = False
+        self.__worker_options: Optional[Dict[str, Any]] = None
+        self.__workers: List[BatchWorker] = []
+        self.__partitions: Dict[Optional[str], int] = {}
+
+        if asynchronous and url:
+            max_queue_bytes = batching.max_queue_bytes
+            self.__worker_options = dict(
+                max_queue_size=-(-batching.max_queue_size // self.__senders),
+                max_queue_bytes=None if max_queue_bytes is None else -
+                (-max_queue_bytes // self.__senders),
+                backpressure=batching.backpressure,
+                block_timeout=batching.block_timeout,
+                max_batch_records=batching.max_batch_records,
+                max_batch_bytes=batching.max_batch_bytes,
+                max_linger=batching.max_linger,
+                encoder=self._encode,
+                batch_logs=self.__batch_format == BatchFormat.COLUMNAR,
+            )
+            self.__workers = self._startWorkers()
+        if throttle is not None and throttle.dedup_window is not None:
+            self._startSummaries()
+
+        self.__metrics_server: Optional[MetricsServer] = None
+        if metrics_port is not None:
+            self.__metrics_server = MetricsServer(
+                lambda: toPrometheus(self.stats()), metrics_host, metrics_port).start()
+
+        _handlers.add(self)
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """
+        The circuit breaker guarding the endpoint, if any, e.g. to report its state in health checks. None with
+        several endpoints, whose breakers are in `circuit_breakers`.
+        """
+
+        if self.__endpoints is not None:
+            return None
+        return self.__circuit_breaker
+
+    @property
+    def circuit_breakers(self) -> Dict[str, CircuitBreaker]:
+        """
+        The circuit breaker guarding each endpoint, by URL, e.g. to report their states in health checks.
+        """
+
+        if self.__endpoints is not None:
+            return self.__endpoints.circuit_breakers
+        if self.__circuit_breaker is None or not self.__url:
+            return {}
+        return {self.__url: self.__circuit_breaker}
+
+    @property
+    def endpoints(self) -> Optional[EndpointPool]:
+        """
+        The endpoints the requests are spread across, if several, e.g. to report which are in rotation.
+        """
+        return self.__endpoints
+
+    @property
+    def throttle(self) -> Optional[LogThrottle]:
+        """
+        The throttle deciding which records are shipped, if any, e.g. to report how many were suppressed.
+        """
+        return self.__throttle
+
+    @property
+    def metrics_server(self) -> Optional[MetricsServer]:
+        """
+        The endpoint serving the handler statistics in the Prometheus text format, if enabled.
+        """
+        return self.__metrics_server
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns counters and histograms describing what the handler did with the records it received.
+
+        Counters: records_built, records_sent, records_failed (deliveries that failed, whether spooled or not),
+        records_spooled, records_dropped (lost to a full queue, a full spool or a rejected delivery),
+        requests_sent and requests_failed, plus records_sampled_out, records_rate_limited and
+        records_deduplicated when a throttle is set, fields_truncated when field limits are set, records_buffered,
+        records_released and records_expired when a record buffer is set, records_dropped_by_level, the records the
+        full queue dropped by level name, and requests_by_endpoint and requests_failed_by_endpoint, by URL, with several
+        endpoints. Gauges: queue_depth, queue_bytes (zero without a byte limit), spool_depth, buffer_depth
+        when a record buffer is set, and endpoints_healthy with several endpoints.
+        Histograms, as HistogramSnapshot: batch_records, batch_bytes, serialization_seconds and
+        http_request_seconds.
+
+        Returns:
+            Dict[str, Any]: The statistics by name.
+        """
+
+        stats = self.__metrics.snapshot()
+        stats["records_dropped"] += sum(
+            worker.dropped for worker in self.__workers)
+        if self.__throttle is not None:
+            stats["records_sampled_out"] = self.__throttle.sampled_out
+            stats["records_rate_limited"] = self.__throttle.rate_limited
+            stats["records_deduplicated"] = self.__throttle.deduplicated
+        if self.__field_limits is not None:
+            stats["fields_truncated"] = self.__field_limits.truncated
+        if self.__record_buffer is not None:
+            stats["records_buffered"] = self.__record_buffer.buffered
+            stats["records_released"] = self.__record_buffer.released
+            stats["records_expired"] = self.__record_buffer.expired
+            stats["buffer_depth"] = len(self.__record_buffer)
+        dropped_by_level: Dict[str, int] = {}
+        for worker in self.__workers:
+            for level, dropped in worker.dropped_by_level.items():
+                name = getLevelName(level)
+                dropped_by_level[name] = dropped_by_level.get(
+                    name, 0) + dropped
+        stats["records_dropped_by_level"] = dropped_by_level
+        stats["queue_depth"] = sum(worker.depth for worker in self.__workers)
+        stats["queue_bytes"] = sum(
+            worker.depth_bytes for worker in self.__workers)
+        stats["spool_depth"] = len(
+            self.__spool) if self.__spool is not None else 0
+        if self.__endpoints is not None:
+            stats["requests_by_endpoint"] = self.__endpoints.requests_by_endpoint
+            stats["requests_failed_by_endpoint"] = self.__endpoints.requests_failed_by_endpoint
+            stats["endpoints_healthy"] = len(self.__endpoints.healthy)
+        return stats
 
     def emit(self, record: LogRecord) -> None:
         """
         Emits the log record to the Lumberjack logging endpoint.
 
+        In asynchronous mode the log is only enqueued and shipped later by the background worker.
+        Records suppressed by the throttle are dropped before any log is built, and records kept by the
+        record buffer are only built once a record at its trigger level releases them.
+
+        Args:
+            record (LogRecord): The log record to be emitted.
+        """
+
+        throttle = self.__throttle
+        if throttle is not None:
+            self._emitCollapsed()
+            if not throttle.admit(record):
+                return
+
+        record_buffer = self.__record_buffer
+        if record_buffer is not None:
+            records = record_buffer.admit(record)
+            if len(records) > 1:
+                self._emitBatch(records)
+            elif records:
+                self._emitLog(record)
+            return
+
+        self._emitLog(record)
+
+    def _emitLog(self, record: LogRecord) -> None:
+        """
+        Builds the log of a record and ships it, or enqueues it in asynchronous mode.
+
         Args:
             record (LogRecord): The log record to be emitted.
         """
 
-        log = buildLog(record, self.__application_name)
+        log = self._buildLog(record)
+        if log is None:
+            return
+
+        if self.__workers:
+            self._worker(log).put(log)
+            return
+
+        payload = self._encode(log)
+        self._deliver(
+            [payload], lambda url: self._post(url, payload, "application/json", 1))
+
+    def _emitCollapsed(self, flush: bool = False) -> None:
+        """
+        Ships the summaries of the repeats collapsed by the throttle whose window closed.
+
+        Args:
+            flush (bool): Whether to close every window now. Defaults to False.
+        """
+
+        if self.__throttle is None:
+            return
+        records = self.__throttle.collapsed(flush)
+        if not records:
+            return
+        self.acquire()
+        try:
+            for record in records:
+                self._emitLog(record)
+        finally:
+            self.release()
+
+    def _startSummaries(self) -> None:
+        """
+        Starts the thread shipping the summaries of collapsed repeats once their window closes, even if nothing
+        else is logged. It only holds a weak reference, so an unused handler can still be collected.
+        """
+
+        assert self.__throttle is not None and self.__throttle.dedup_window is not None
+        stopped = self.__summaries_stopped = threading.Event()
+        interval = min(self.__throttle.dedup_window, 1.0)
+        handler = ref(self)
+
+        def run() -> None:
+            while not stopped.wait(interval):
+                current = handler()
+                if current is None:
+                    return
+                current._emitCollapsed()
+                del current
+
+        threading.Thread(
+            target=run, name="lumberjack-summaries", daemon=True).start()
+
+    def _emitBatch(self, records: List[LogRecord]) -> None:
+        """
+        Builds the logs of records and ships them as one batch, or enqueues them in asynchronous mode.
+
+        Args:
+            records (List[LogRecord]): The log records to be emitted.
+        """
+
+        logs = [log for log in map(self._buildLog, records) if log is not None]
+        if not logs:
+            return
+
+        if self.__workers:
+            for log in logs:
+                self._worker(log).put(log)
+            return
+
+        self._postBatch([self._encode(log) for log in logs])
+
+    def _buildLog(self, record: LogRecord) -> Optional[Log]:
+        """
+        Builds the log of a record and registers its source file.
+
+        Args:
+            record (LogRecord): The log record.
+
+        Returns:
+            Optional[Log]: The log, or None if it could not be built or there is no endpoint to ship it to.
+        """
+
+        log = buildLog(
+            record,
+            self.__application_name,
+            self.__code_capture,
+            self.__code_context_lines,
+            self.__stack_frames,
+            self.__field_limits,
+        )
+        if not log or not self.__url:
+            return None
+
+        self.__metrics.increment("records_built")
+        if log.codeHash and log.filepath:
+            self.__sources.register(log.codeHash, log.filepath)
+        return log
+
+    def flush(self) -> None:
+        """
+        Ships every log enqueued so far when running in asynchronous mode, the repeats collapsed by the throttle
+        whose window closed, and replays the spool, if any. Flushing a closed handler does nothing: `close` already
+        shipped what it could within its deadline, e.g. before `logging.shutdown` flushes every handler.
+        """
+
+        if self.__closed:
+            return
+        self._emitCollapsed()
+        for worker in self.__workers:
+            worker.flush()
+        if self.__spool is not None and len(self.__spool):
+            self._deliver([], lambda url: None)
+        super().flush()
+
+    def close(self) -> None:
+        """
+        Ships the remaining logs, waiting at most `shutdown_timeout` seconds, and stops the background worker,
+        if any. Closing a handler again does nothing.
+        """
+
+        if self.__closed:
+            return
+        self.__closed = True
+        _handlers.discard(self)
+
+        if self.__summaries_stopped is not None:
+            self.__summaries_stopped.set()
+        self._emitCollapsed(flush=True)
+        deadline = None if self.__shutdown_timeout is None else time.monotonic() + \
+            self.__shutdown_timeout
+        stopped = True
+        for worker in self.__workers:
+            remaining = None if deadline is None else max(
+                0.0, deadline - time.monotonic())
+            stopped = worker.close(remaining) and stopped
+        if not stopped:
+            print(
+                f"Failed to ship the remaining logs within {self.__shutdown_timeout} seconds: "
+                f"{sum(worker.depth for worker in self.__workers)} still queued")
+        self.__transport.close()
+        if self.__spool is not None:
+            self.__spool.close()
+        if self.__metrics_server is not None:
+            self.__metrics_server.stop()
+        super().close()
+
+    def _reinitAfterFork(self) -> None:
+        """
+        Replaces the state inherited from the parent process in a forked child.
+
+        The child gets new connections, new background threads with empty queues, since the parent ships the
+        logs it had queued, and its own statistics. The throttle and the record buffer get new locks and forget
+        the repeats and records the parent reports. The spool and the metrics endpoint stay with the parent:
+        two processes appending to the same spool would corrupt it, so the child delivers without one.
+        """
+
+        resetTransport(self.__transport)
+        if self.__endpoints is not None:
+            self.__endpoints.reset()
+        if self.__throttle is not None:
+            self.__throttle.reset()
+        if self.__record_buffer is not None:
+            self.__record_buffer.reset()
+        if self.__field_limits is not None:
+            self.__field_limits.reset()
+        self.__sources.reset()
+        self.__metrics = HandlerMetrics()
+        self.__spool = None
+        self.__metrics_server = None
+        if self.__worker_options is not None and not self.__closed:
+            self.__workers = self._startWorkers()
+        if self.__summaries_stopped is not None and not self.__closed:
+            self._startSummaries()
+
+    def _startWorkers(self) -> List[BatchWorker]:
+        """
+        Starts one background worker per sender.
+
+        Returns:
+            List[BatchWorker]: The workers, indexed by partition.
+        """
+
+        assert self.__worker_options is not None
+        return [BatchWorker(self._postBatch, name=f"lumberjack-sender-{i}", **self.__worker_options)
+                for i in range(self.__senders)]
+
+    def _worker(self, log: Log) -> BatchWorker:
+        """
+        Returns the worker of the partition of a log. Each logger is assigned a partition the first time it is
+        seen, in turn, so that the loggers are spread evenly and the logs of a logger are queued, and delivered,
+        in order. Beyond `MAX_PARTITIONED_LOGGERS` loggers, new ones are assigned by hash instead.
+
+        Args:
+            log (Log): The log to enqueue.
+
+        Returns:
+            BatchWorker: The worker.
+        """
+
+        workers = self.__workers
+        if len(workers) == 1:
+            return workers[0]
+
+        partitions = self.__partitions
+        partition = partitions.get(log.loggerName)
+        if partition is None:
+            if len(partitions) < MAX_PARTITIONED_LOGGERS:
+                partition = partitions.setdefault(
+                    log.loggerName, len(partitions) % len(workers))
+            else:
+                partition = hash(log.loggerName) % len(workers)
+        return workers[partition]
+
+    def _postBatch(self, payloads: Sequence[Log | bytes]) -> None:
+        """
+        Delivers a batch handed over by the background worker or released by the record buffer, in as many
+        requests as `max_batch_bytes` requires.
+
+        Args:
+            payloads (Sequence[Log | bytes]): The serialized logs, or the logs themselves in columnar format.
+        """
+
+        content_type = self.__batch_format.content_type
+        for batch, body in self._encodeBatches(payloads):
+            self._deliver(batch, lambda url: self._post(
+                url, body, content_type, len(batch)))
+
+    def _encodeBatches(
+        self, payloads: Sequence[Log | bytes]
+    ) -> List[Tuple[Sequence[Log | bytes], bytes | ChunkedBody]]:
+        """
+        Encodes a batch of logs in the configured batch format, split into request bodies of at most
+        `max_batch_bytes`. JSON and NDJSON batches are split by the size of the serialized logs, columnar
+        batches are halved until their body fits.
+
+        Args:
+            payloads (Sequence[Log | bytes]): The serialized logs, or the logs themselves in columnar format.
+
+        Returns:
+            List[Tuple[Sequence[Log | bytes], bytes | ChunkedBody]]: The logs of each request and its body, in order.
+        """
+
+        if self.__batch_format == BatchFormat.COLUMNAR:
+            body = encodeColumnar(payloads)
+            if len(body) <= self.__max_batch_bytes or len(payloads) == 1:
+                return [(payloads, body)]
+            half = len(payloads) // 2
+            return self._encodeBatches(payloads[:half]) + self._encodeBatches(payloads[half:])
+
+        bodies: List[Tuple[Sequence[Log | bytes], bytes | ChunkedBody]] = []
+        chunk_size = self.__chunk_size
+        for batch in splitBatch(cast(List[bytes], payloads), self.__max_batch_bytes):
+            chunked = None if chunk_size is None else ChunkedBody(
+                batch, self.__batch_format, chunk_size)
+            if chunked is not None and chunked.size > chunked.chunk_size:
+                bodies.append((batch, chunked))
+            else:
+                bodies.append(
+                    (batch, encodeBatch(batch, self.__batch_format)))
+        return bodies
+
+    def _post(self, url: str, body: bytes | ChunkedBody, content_type: str, records: int) -> None:
+        """
+        Posts a request body through the transport, recording its size and duration.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            body (bytes | ChunkedBody): The serialized logs.
+            content_type (str): The content type of the body.
+            records (int): The number of logs in the body.
+        """
+
+        size = len(body) if isinstance(body, bytes) else body.size
+        started = time.perf_counter()
+        try:
+            self.__transport.post(url, body, content_type)
+        except RequestException:
+            self.__metrics.observeRequest(
+                records, size, time.perf_counter() - started, True)
+            raise
+        self.__metrics.observeRequest(
+            records, size, time.perf_counter() - started, False)
+
+    def _encode(self, log: Log) -> bytes:
+        """
+        Serializes a log with the configured encoder, recording how long it took.
+
+        Args:
+            log (Log): The log to serialize.
+
+        Returns:
+            bytes: The serialized log.
+        """
+
+        started = time.perf_counter()
+        payload = self.__encode(log)
+        self.__metrics.observe("serialization_seconds",
+                               time.perf_counter() - started)
+        return payload
+
+    def _deliver(self, payloads: Sequence[Log | bytes], send: Callable[[str], None]) -> None:
+        """
+        Sends logs after anything still spooled, spooling them if the endpoint is unavailable. Logs that cannot
+        be spooled, e.g. because the disk is full, are dropped and the error is reported through `handleError`.
+
+        Args:
+            payloads (Sequence[Log | bytes]): The logs being sent, serialized unless they are batched in columnar
+                format.
+            send (Callable[[str], None]): Posts the logs to the endpoint URL it is given.
+        """
+
+        try:
+            if self.__spool is not None and len(self.__spool):
+                self.__spool.replay(
+                    self._replayBatch, self.__max_batch_records, self.__max_batch_bytes)
+            if payloads:
+                self._send(send)
+        except RequestException as e:
+            print(e)
+            stored = 0
+            if self.__spool is not None and payloads and isRetriable(e):
+                try:
+                    stored = self.__spool.append(
+                        [payload if isinstance(payload, bytes) else self.__encode(payload) for payload in payloads])
+                except OSError:
+                    self._spoolFailed(len(payloads))
+            self.__metrics.increment("records_failed", len(payloads))
+            self.__metrics.increment("records_spooled", stored)
+            self.__metrics.increment(
+                "records_dropped", len(payloads) - stored)
+            return
+        except OSError:
+            # Replaying the spool failed on the disk itself, before the logs could be sent.
+            self._spoolFailed(len(payloads))
+            self.__metrics.increment("records_failed", len(payloads))
+            self.__metrics.increment("records_dropped", len(payloads))
+            return
+
+        self.__metrics.increment("records_sent", len(payloads))
+
+    def _spoolFailed(self, count: int) -> None:
+        """
+        Reports the error being handled while reading or writing the spool through `handleError`.
+
+        Args:
+            count (int): The number of logs dropped because of it.
+        """
+
+        self.handleError(makeLogRecord(
+            {"msg": "Failed to spool %d logs", "args": (count,)}))
+
+    def _replayBatch(self, payloads: List[bytes]) -> None:
+        """
+        Sends a batch read back from the spool, dropping it if the endpoint rejects it outright.
+
+        Args:
+            payloads (List[bytes]): The serialized logs.
+        """
+
+        content_type = self.__batch_format.content_type
+        try:
+            for batch, body in self._encodeBatches(payloads):
+                self._send(lambda url: self._post(
+                    url, body, content_type, len(batch)))
+        except RequestException as e:
+            if isRetriable(e):
+                raise
+            print(e)
+            self.__metrics.increment("records_failed", len(payloads))
+            self.__metrics.increment("records_dropped", len(payloads))
+            return
+
+        self.__metrics.increment("records_sent", len(payloads))
+
+    def _send(self, send: Callable[[str], None]) -> None:
+        """
+        Sends logs to the endpoint, or to the endpoints of the pool in turn until one accepts them, retrying whole
+        rounds of the pool with the retry policy, if any.
+
+        Args:
+            send (Callable[[str], None]): Posts the logs to the endpoint URL it is given.
+        """
+
+        endpoints = self.__endpoints
+        if endpoints is not None:
+            def attempt() -> None:
+                endpoints.call(lambda url: self._sendTo(url, send))
+
+            if self.__retry is not None:
+                self.__retry.call(attempt)
+            else:
+                attempt()
+            return
+
+        assert self.__url is not None
+        self._sendTo(self.__url, send)
+
+    def _sendTo(self, url: str, send: Callable[[str], None]) -> None:
+        """
+        Uploads the source files the logs refer to that the endpoint has not received yet, then sends the logs.
+        Uploads are tracked per sources URL, so each endpoint of a pool gets the sources it lacks.
+
+        If the endpoint rejects the logs because it is missing some of their sources, those are uploaded
+        again and the logs are sent once more.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            send (Callable[[str], None]): Posts the logs to the endpoint URL it is given.
+        """
+
+        sources_url = self.__sources_url or sourcesUrl(url)
+        self._uploadSources(sources_url)
+        try:
+            send(url)
+        except RequestException as e:
+            if sources_url is None or not self.__sources.markMissing(sources_url, missingSources(e)):
+                raise
+            self._uploadSources(sources_url)
+            send(url)
+
+    def _uploadSources(self, sources_url: Optional[str]) -> None:
+        """
+        Posts the source file bodies not uploaded to a URL yet.
+
+        Args:
+            sources_url (Optional[str]): The URL the sources are uploaded to, matching the endpoint the logs
+                referring to them are sent to.
+        """
+
+        if not sources_url or not self.__sources.pending(sources_url):
+            return
+
+        digests, body = self.__sources.encodePending(sources_url)
+        if digests:
+            self.__transport.post(sources_url, body)
+        self.__sources.markUploaded(sources_url, digests)
+
+
+_handlers: "WeakSet[LumberjackHandler]" = WeakSet()
+"""
+The handlers not closed yet.
+"""
+
+
+def _reinitAfterFork() -> None:
+    """
+    Reinitializes every open handler in a forked child, after giving the process-wide caches new locks, since a
+    thread of the parent may have held them.
+    """
+
+    source_cache.reset()
+    traceback_cache.reset()
+    for handler in list(_handlers):
+        handler._reinitAfterFork()
+
+
+def _closeAtExit() -> None:
+    """
+    Closes every open handler at interpreter exit, so the logs still queued are shipped.
+    """
+
+    for handler in list(_handlers):
+        handler.close()
+
 
-        if log and self.__url:
-            payload = json.loads(log.model_dump_json())
-            try:
-                headers: Dict = {"Content-Type": "application/json"}
-                request: Response = requests.post(
-                    self.__url, json=payload, headers=headers
-                )
-                request.raise_for_status()
-            except HTTPError as e:
-                print(e)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinitAfterFork)
+atexit.register(_closeAtExit)
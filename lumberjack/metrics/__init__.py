@@ -0,0 +1,18 @@
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.metrics.handler_metrics import (HandlerMetrics, Histogram,
+                                                    HistogramSnapshot)
+    from lumberjack.metrics.prometheus import MetricsServer, toPrometheus
+
+_EXPORTS = {
+    "HandlerMetrics": "lumberjack.metrics.handler_metrics",
+    "Histogram": "lumberjack.metrics.handler_metrics",
+    "HistogramSnapshot": "lumberjack.metrics.handler_metrics",
+    "MetricsServer": "lumberjack.metrics.prometheus",
+    "toPrometheus": "lumberjack.metrics.prometheus",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
@@ -0,0 +1,174 @@
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+
+class HistogramSnapshot(NamedTuple):
+    """
+    The state of a histogram at one point in time.
+    """
+
+    samples: int
+    """
+    The number of observed values.
+    """
+
+    sum: float
+    """
+    The sum of the observed values.
+    """
+
+    buckets: List[Tuple[float, int]]
+    """
+    The cumulative number of values less than or equal to each upper bound, ending with infinity.
+    """
+
+
+class Histogram:
+    """
+    A histogram with fixed bucket bounds. Observing a value is a binary search and three additions.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """
+        Initializes an empty histogram.
+
+        Args:
+            bounds (Sequence[float]): The upper bounds of the buckets, in increasing order.
+        """
+
+        self.bounds = tuple(bounds)
+        self.__counts = [0] * (len(self.bounds) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Records a value. The caller must hold the lock of the owning HandlerMetrics.
+
+        Args:
+            value (float): The observed value.
+        """
+
+        self.__counts[bisect_left(self.bounds, value)] += 1
+        self.__count += 1
+        self.__sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        """
+        Returns the current state of the histogram.
+        """
+
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.__counts):
+            total += count
+            buckets.append((bound, total))
+        return HistogramSnapshot(self.__count, self.__sum, buckets)
+
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""
+Histogram bounds for HTTP request durations, in seconds.
+"""
+
+SERIALIZATION_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001,
+                         0.000025, 0.00005, 0.0001, 0.00025, 0.001, 0.01)
+"""
+Histogram bounds for the time spent serializing one log, in seconds.
+"""
+
+RECORDS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+"""
+Histogram bounds for the number of logs in one request.
+"""
+
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+"""
+Histogram bounds for the size of one request body, in bytes.
+"""
+
+
+class HandlerMetrics:
+    """
+    Counters and histograms describing what a handler did with the records it received.
+
+    Updates take an uncontended lock and touch a few integers, cheap enough to leave on in production.
+    """
+
+    COUNTERS = ("records_built", "records_sent", "records_failed",
+                "records_spooled", "records_dropped", "requests_sent", "requests_failed")
+    """
+    The names of the counters.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes every counter to zero and every histogram to empty.
+        """
+
+        self.__lock = threading.Lock()
+        self.__counters: Dict[str, int] = dict.fromkeys(self.COUNTERS, 0)
+        self.__histograms: Dict[str, Histogram] = {
+            "batch_records": Histogram(RECORDS_BUCKETS),
+            "batch_bytes": Histogram(BYTES_BUCKETS),
+            "serialization_seconds": Histogram(SERIALIZATION_BUCKETS),
+            "http_request_seconds": Histogram(SECONDS_BUCKETS),
+        }
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        """
+        Adds to a counter.
+
+        Args:
+            counter (str): The name of the counter, one of COUNTERS.
+            amount (int): The amount to add. Defaults to 1.
+        """
+
+        with self.__lock:
+            self.__counters[counter] += amount
+
+    def observe(self, histogram: str, value: float) -> None:
+        """
+        Records a value in a histogram.
+
+        Args:
+            histogram (str): The name of the histogram.
+            value (float): The observed value.
+        """
+
+        with self.__lock:
+            self.__histograms[histogram].observe(value)
+
+    def observeRequest(self, records: int, size: int, seconds: float, failed: bool) -> None:
+        """
+        Records one request to the endpoint.
+
+        Args:
+            records (int): The number of logs in the request.
+            size (int): The size of the request body in bytes.
+            seconds (float): How long the request took.
+            failed (bool): Whether the request failed.
+        """
+
+        with self.__lock:
+            self.__counters["requests_failed" if failed else "requests_sent"] += 1
+            self.__histograms["http_request_seconds"].observe(seconds)
+            if not failed:
+                self.__histograms["batch_records"].observe(records)
+                self.__histograms["batch_bytes"].observe(size)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the current value of every counter and histogram.
+
+        Returns:
+            Dict[str, Any]: The counters as integers and the histograms as HistogramSnapshot, by name.
+        """
+
+        with self.__lock:
+            snapshot: Dict[str, Any] = dict(self.__counters)
+            for name, histogram in self.__histograms.items():
+                snapshot[name] = histogram.snapshot()
+        return snapshot
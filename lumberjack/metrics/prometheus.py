@@ -0,0 +1,165 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from lumberjack.metrics.handler_metrics import HistogramSnapshot
+
+GAUGES = frozenset(("queue_depth", "queue_bytes",
+                   "spool_depth", "buffer_depth", "endpoints_healthy"))
+"""
+The statistics that are current levels rather than running totals.
+"""
+
+LABELS = {"records_dropped_by_level": "level", "requests_by_endpoint": "endpoint",
+          "requests_failed_by_endpoint": "endpoint"}
+"""
+The label of the counters broken down by a key, by statistic.
+"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""
+The content type of the Prometheus text exposition format.
+"""
+
+
+def toPrometheus(stats: Mapping[str, Any], prefix: str = "lumberjack", labels: Optional[Dict[str, str]] = None) -> str:
+    """
+    Renders handler statistics in the Prometheus text exposition format.
+
+    Args:
+        stats (Mapping[str, Any]): The statistics returned by `LumberjackHandler.stats()`.
+        prefix (str): Prepended to every metric name. Defaults to "lumberjack".
+        labels (Optional[Dict[str, str]]): Labels added to every sample. Defaults to None.
+
+    Returns:
+        str: The metrics, one sample per line.
+    """
+
+    base = _labels(labels or {})
+    lines: List[str] = []
+
+    for name, value in stats.items():
+        metric = f"{prefix}_{name}"
+        if isinstance(value, HistogramSnapshot):
+            lines.append(f"# TYPE {metric} histogram")
+            for bound, count in value.buckets:
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(
+                    f"{metric}_bucket{_labels({**(labels or {}), 'le': le})} {count}")
+            lines.append(f"{metric}_sum{base} {value.sum!r}")
+            lines.append(f"{metric}_count{base} {value.samples}")
+        elif isinstance(value, Mapping) and name in LABELS:
+            lines.append(f"# TYPE {metric}_total counter")
+            for key, count in value.items():
+                lines.append(
+                    f"{metric}_total{_labels({**(labels or {}), LABELS[name]: str(key)})} {count}")
+        elif isinstance(value, (int, float)):
+            if name in GAUGES:
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric}{base} {value}")
+            else:
+                lines.append(f"# TYPE {metric}_total counter")
+                lines.append(f"{metric}_total{base} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers every GET request with the current metrics.
+    """
+
+    server: "_MetricsHTTPServer"
+
+    def do_GET(self) -> None:
+        try:
+            body = self.server.render().encode()
+        except Exception as e:
+            self.send_error(500, str(e))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, render: Callable[[], str], host: str, port: int) -> None:
+        super().__init__((host, port), _MetricsRequestHandler)
+        self.render = render
+
+
+class MetricsServer:
+    """
+    A tiny HTTP endpoint exposing metrics in the Prometheus text format, served from a daemon thread.
+
+    Example:
+        >>> server = MetricsServer(lambda: toPrometheus(handler.stats()), port=9464).start()
+    """
+
+    def __init__(self, render: Callable[[], str], host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        Binds the endpoint.
+
+        Args:
+            render (Callable[[], str]): Returns the metrics text for each scrape.
+            host (str): The interface to listen on. Defaults to "127.0.0.1".
+            port (int): The port to listen on. Defaults to 0 (a free port).
+        """
+
+        self.__host = host
+        self.__server = _MetricsHTTPServer(render, host, port)
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """
+        The port the endpoint listens on.
+        """
+        return self.__server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """
+        The URL of the endpoint.
+        """
+        return f"http://{self.__host}:{self.port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        """
+        Starts serving scrapes on a background thread.
+        """
+
+        if self.__thread is None:
+            self.__thread = threading.Thread(
+                target=self.__server.serve_forever, args=(0.5,), name="lumberjack-metrics", daemon=True)
+            self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the endpoint and closes its socket.
+        """
+
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread = None
+        self.__server.server_close()
@@ -1 +1,21 @@
-from lumberjack.models.log import Log
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.models.log import OMITTED_WHEN_UNSET, Log
+    from lumberjack.models.process_context import (ProcessContext,
+                                                   getProcessContext,
+                                                   refreshProcessContext)
+    from lumberjack.models.stack_frame import StackFrame
+
+_EXPORTS = {
+    "Log": "lumberjack.models.log",
+    "OMITTED_WHEN_UNSET": "lumberjack.models.log",
+    "ProcessContext": "lumberjack.models.process_context",
+    "getProcessContext": "lumberjack.models.process_context",
+    "refreshProcessContext": "lumberjack.models.process_context",
+    "StackFrame": "lumberjack.models.stack_frame",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
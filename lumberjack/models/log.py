@@ -1,10 +1,18 @@
-import getpass
-import platform
-import socket
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, model_validator
+from pydantic import (BaseModel, SerializerFunctionWrapHandler,
+                      model_serializer, model_validator)
+
+from lumberjack.models.process_context import getProcessContext
+from lumberjack.models.stack_frame import StackFrame
+
+OMITTED_WHEN_UNSET = ("stackFrames", "codeStartLine",
+                      "codeHash", "occurrences")
+"""
+The fields left out of a serialized log when they are None instead of being sent as null, since most logs do not
+have them.
+"""
 
 
 class Log(BaseModel):
@@ -87,6 +95,11 @@ class Log(BaseModel):
     The stack trace associated with the log entry, if available.
     """
 
+    stackFrames: Optional[List[StackFrame]] = None
+    """
+    The frames of the logged exception, innermost last, when structured frames are captured.
+    """
+
     filename: Optional[str] = None
     """
     The filename where the logger was invoked.
@@ -107,6 +120,22 @@ class Log(BaseModel):
     The source code where the logger was invoked.
     """
 
+    codeStartLine: Optional[int] = None
+    """
+    The line number of the first line of `code`, when only part of the file was captured.
+    """
+
+    codeHash: Optional[str] = None
+    """
+    The content hash of the source file where the logger was invoked, sent instead of `code` when
+    the file body is uploaded separately.
+    """
+
+    occurrences: Optional[int] = None
+    """
+    The number of identical logs this entry stands for, when repeats of a message were collapsed.
+    """
+
     @model_validator(mode="before")
     @classmethod
     def set_defaults(cls, values: dict) -> Dict:
@@ -120,12 +149,30 @@ class Log(BaseModel):
             dict: The modified values dictionary with default values set.
 
         """
-        values.setdefault("language", platform.python_implementation())
-        values.setdefault("languageVersion", platform.python_version())
-        values.setdefault("username", getpass.getuser())
-        values.setdefault("machineName", socket.gethostname())
+        context = getProcessContext()
+        values.setdefault("language", context.language)
+        values.setdefault("languageVersion", context.languageVersion)
+        values.setdefault("username", context.username)
+        values.setdefault("machineName", context.machineName)
         return values
 
+    @model_serializer(mode="wrap")
+    def omit_unset(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        """
+        Leaves the fields of `OMITTED_WHEN_UNSET` out of the serialized log when they are None.
+
+        Args:
+            handler (SerializerFunctionWrapHandler): Serializes every field.
+
+        Returns:
+            dict: The serialized fields.
+        """
+        fields = handler(self)
+        for name in OMITTED_WHEN_UNSET:
+            if fields.get(name, 0) is None:
+                del fields[name]
+        return fields
+
     def __str__(self) -> str:
         """
         Returns a formatted string representation of the Log object.
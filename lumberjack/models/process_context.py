@@ -0,0 +1,90 @@
+import getpass
+import os
+import platform
+import socket
+import threading
+from typing import NamedTuple, Optional
+
+
+class ProcessContext(NamedTuple):
+    """
+    Host and runtime metadata that stays the same for the whole life of a process.
+    """
+
+    language: str
+    """
+    The name of the language.
+    """
+
+    languageVersion: str
+    """
+    The version of the language.
+    """
+
+    username: str
+    """
+    The username of the user running the process.
+    """
+
+    machineName: str
+    """
+    The name of the machine running the process.
+    """
+
+    environment: Optional[str]
+    """
+    The name of the environment, read from the `ENV` environment variable.
+    """
+
+
+_context: Optional[ProcessContext] = None
+_lock = threading.Lock()
+
+
+def getProcessContext() -> ProcessContext:
+    """
+    Returns the process context, computing it on first use.
+
+    Returns:
+        ProcessContext: The snapshot shared by every log built in this process.
+    """
+
+    context = _context
+    if context is None:
+        context = refreshProcessContext()
+    return context
+
+
+def refreshProcessContext() -> ProcessContext:
+    """
+    Recomputes the process context, e.g. after the hostname or the `ENV` variable changed.
+
+    Returns:
+        ProcessContext: The new snapshot.
+    """
+
+    global _context
+
+    context = ProcessContext(
+        language=platform.python_implementation(),
+        languageVersion=platform.python_version(),
+        username=getpass.getuser(),
+        machineName=socket.gethostname(),
+        environment=os.environ.get("ENV"),
+    )
+    with _lock:
+        _context = context
+    return context
+
+
+def _resetAfterFork() -> None:
+    """
+    Drops the snapshot in a forked child so it is recomputed on first use.
+    """
+
+    global _context
+    _context = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_resetAfterFork)
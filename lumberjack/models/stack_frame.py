@@ -0,0 +1,22 @@
+from typing import NamedTuple
+
+
+class StackFrame(NamedTuple):
+    """
+    One frame of a stack trace. Serialized as a compact `[filepath, lineno, function]` array.
+    """
+
+    filepath: str
+    """
+    The path of the file the frame was executing.
+    """
+
+    lineno: int
+    """
+    The line the frame was executing.
+    """
+
+    function: str
+    """
+    The name of the function the frame was executing.
+    """
@@ -0,0 +1,13 @@
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.testing.stub_server import StubRequest, StubServer
+
+_EXPORTS = {
+    "StubRequest": "lumberjack.testing.stub_server",
+    "StubServer": "lumberjack.testing.stub_server",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
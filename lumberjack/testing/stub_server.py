@@ -0,0 +1,285 @@
+import gzip
+import json
+import random
+import socket
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from lumberjack.utils import MISSING_SOURCES_HEADER, hashSource
+
+
+class StubRequest(NamedTuple):
+    """
+    A request received by the stub server.
+    """
+
+    path: str
+    headers: Dict[str, str]
+    raw_body: bytes
+    body: bytes
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles every request on one keep-alive connection to the stub server.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server: "_StubHTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub._connectionOpened(self.connection)
+
+    def finish(self) -> None:
+        super().finish()
+        self.server.stub._connectionClosed(self.connection)
+
+    def do_POST(self) -> None:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            raw_body = self._readChunks()
+        else:
+            raw_body = self.rfile.read(
+                int(self.headers.get("Content-Length", 0)))
+
+        body = raw_body
+        match self.headers.get("Content-Encoding"):
+            case "gzip":
+                body = gzip.decompress(raw_body)
+            case "deflate":
+                body = zlib.decompress(raw_body)
+
+        stub = self.server.stub
+        stub._record(StubRequest(
+            self.path, dict(self.headers), raw_body, body))
+
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        status, headers = stub._status(), {}
+        if stub.validate_json and status < 400 and not _isJson(body, self.headers.get("Content-Type", "")):
+            status = 400
+        if stub.require_sources and status < 400:
+            if self.path.rstrip("/").endswith("/sources"):
+                if not stub._storeSources(body):
+                    status = 400
+            else:
+                missing = stub._missingSources(body)
+                if missing:
+                    status = 409
+                    headers[MISSING_SOURCES_HEADER] = ",".join(missing)
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status >= 200 and status not in (204, 304):
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _readChunks(self) -> bytes:
+        """
+        Reads a body sent with chunked transfer encoding.
+        """
+
+        chunks: List[bytes] = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            if size == 0:
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def _isJson(body: bytes, content_type: str) -> bool:
+    """
+    Checks whether a request body is valid JSON, line by line for NDJSON.
+    """
+
+    documents = body.splitlines(
+    ) if content_type == "application/x-ndjson" else [body]
+    try:
+        for document in documents:
+            if document.strip():
+                json.loads(document)
+    except ValueError:
+        return False
+    return True
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent senders open their connections at once; the default backlog of 5 drops some of them.
+    request_queue_size = 128
+
+    def __init__(self, stub: "StubServer", port: int) -> None:
+        super().__init__(("127.0.0.1", port), _StubRequestHandler)
+        self.stub = stub
+
+
+class StubServer:
+    """
+    A local stand-in for a Lumberjack ingest endpoint, recording what it receives.
+
+    Example:
+        >>> with StubServer() as server:
+        ...     handler = LumberjackHandler(server.url)
+    """
+
+    def __init__(
+        self,
+        status: int = 200,
+        port: int = 0,
+        require_sources: bool = False,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        validate_json: bool = False,
+    ) -> None:
+        """
+        Initializes the stub server on a local port.
+
+        Args:
+            status (int): The HTTP status returned for every request. Defaults to 200.
+            port (int): The port to listen on. Defaults to 0 (a free port).
+            require_sources (bool): Whether to check the source upload protocol: source bodies posted to
+                ".../sources" must match their hash, and batches referring to a hash not received yet are
+                answered with 409 and the missing hashes. Defaults to False.
+            latency (float): Seconds to wait before answering each request. Defaults to 0.0.
+            error_rate (float): Fraction of requests answered with `error_status` instead of `status`. Defaults to 0.0.
+            error_status (int): The HTTP status of injected errors. Defaults to 503.
+            seed (Optional[int]): Seeds the choice of failed requests, for reproducible runs. Defaults to None.
+            validate_json (bool): Whether to answer 400 to bodies that are not valid JSON, or not valid JSON on every
+                line for NDJSON bodies. Defaults to False.
+        """
+
+        self.status = status
+        self.require_sources = require_sources
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.validate_json = validate_json
+        self.__random = random.Random(seed)
+        self.sources: Dict[str, str] = {}
+        self.requests: List[StubRequest] = []
+        self.connections = 0
+        self.bytes_received = 0
+        self.__lock = threading.Lock()
+        self.__sockets: Set[socket.socket] = set()
+        self.__server = _StubHTTPServer(self, port)
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """
+        The port the stub server listens on.
+        """
+        return self.__server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """
+        The URL of the stub server.
+        """
+        return f"http://127.0.0.1:{self.port}/"
+
+    def start(self) -> "StubServer":
+        """
+        Starts serving requests on a background thread.
+        """
+
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, args=(0.05,), daemon=True)
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops the server and closes its socket and every open connection.
+        """
+
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread = None
+        self.__server.server_close()
+
+        with self.__lock:
+            sockets = list(self.__sockets)
+        for connection in sockets:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def _connectionOpened(self, connection: socket.socket) -> None:
+        with self.__lock:
+            self.connections += 1
+            self.__sockets.add(connection)
+
+    def _connectionClosed(self, connection: socket.socket) -> None:
+        with self.__lock:
+            self.__sockets.discard(connection)
+
+    def _status(self) -> int:
+        """
+        Returns the status of the next response, injecting errors at the configured rate.
+        """
+
+        if self.error_rate:
+            with self.__lock:
+                if self.__random.random() < self.error_rate:
+                    return self.error_status
+        return self.status
+
+    def _record(self, request: StubRequest) -> None:
+        with self.__lock:
+            self.requests.append(request)
+            self.bytes_received += len(request.raw_body)
+
+    def _storeSources(self, body: bytes) -> bool:
+        """
+        Stores uploaded source bodies, returning False if any of them does not match its hash.
+        """
+
+        try:
+            sources = json.loads(body)
+        except ValueError:
+            return False
+
+        for source in sources:
+            if hashSource(source["code"]) != source["codeHash"]:
+                return False
+        with self.__lock:
+            for source in sources:
+                self.sources[source["codeHash"]] = source["code"]
+        return True
+
+    def _missingSources(self, body: bytes) -> List[str]:
+        """
+        Returns the source hashes referred to by a batch of logs that were not uploaded yet.
+        """
+
+        try:
+            logs = json.loads(body)
+        except ValueError:
+            logs = [json.loads(line) for line in body.splitlines() if line]
+        if isinstance(logs, dict):
+            logs = [logs]
+
+        with self.__lock:
+            return sorted({log["codeHash"] for log in logs
+                           if log.get("codeHash") and log["codeHash"] not in self.sources})
@@ -0,0 +1,36 @@
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.transport.async_http_transport import AsyncHttpTransport
+    from lumberjack.transport.circuit_breaker import (CircuitBreaker,
+                                                      CircuitOpenError,
+                                                      CircuitState)
+    from lumberjack.transport.endpoint_pool import (EndpointPool,
+                                                    EndpointStrategy,
+                                                    NoEndpointAvailableError)
+    from lumberjack.transport.http_transport import HttpTransport
+    from lumberjack.transport.resilient_transport import ResilientTransport
+    from lumberjack.transport.retry import RetryPolicy
+    from lumberjack.transport.transport import (Body, Transport, isRetriable,
+                                                resetTransport)
+
+_EXPORTS = {
+    "AsyncHttpTransport": "lumberjack.transport.async_http_transport",
+    "CircuitBreaker": "lumberjack.transport.circuit_breaker",
+    "CircuitOpenError": "lumberjack.transport.circuit_breaker",
+    "CircuitState": "lumberjack.transport.circuit_breaker",
+    "EndpointPool": "lumberjack.transport.endpoint_pool",
+    "EndpointStrategy": "lumberjack.transport.endpoint_pool",
+    "NoEndpointAvailableError": "lumberjack.transport.endpoint_pool",
+    "HttpTransport": "lumberjack.transport.http_transport",
+    "ResilientTransport": "lumberjack.transport.resilient_transport",
+    "RetryPolicy": "lumberjack.transport.retry",
+    "Body": "lumberjack.transport.transport",
+    "Transport": "lumberjack.transport.transport",
+    "isRetriable": "lumberjack.transport.transport",
+    "resetTransport": "lumberjack.transport.transport",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
@@ -0,0 +1,245 @@
+import asyncio
+import ssl
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests import (ConnectionError, ConnectTimeout, HTTPError, ReadTimeout,
+                      RequestException, Timeout)
+from requests.structures import CaseInsensitiveDict
+
+from lumberjack.transport.http_transport import COMPRESSIONS, compressBody
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+_BODILESS_STATUSES = frozenset((204, 304))
+"""
+The final statuses whose responses never have a body.
+"""
+
+
+class AsyncHttpTransport:
+    """
+    Delivers logs over a persistent HTTP/1.1 connection built on asyncio streams, without blocking the event loop.
+
+    Errors are reported with the same `requests` exception types as HttpTransport, so retry and
+    spooling decisions apply unchanged.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+        compression_level: int = 6,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        """
+        Initializes the transport. The connection is opened on the first request.
+
+        Args:
+            connect_timeout (float): Seconds to wait for a connection to be established. Defaults to 3.05.
+            read_timeout (float): Seconds to wait for the endpoint to accept the request, then to respond.
+                Defaults to 10.0.
+            compression (Optional[str]): "gzip" or "deflate" to compress request bodies. Defaults to None.
+            compression_threshold (int): Minimum body size in bytes before compression is applied. Defaults to 1024.
+            compression_level (int): The zlib compression level, from 1 (fastest) to 9 (smallest). Defaults to 6.
+            ssl_context (Optional[ssl.SSLContext]): The TLS settings for https URLs. Defaults to the system defaults.
+        """
+
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported compression '{compression}', expected one of {COMPRESSIONS}.")
+
+        self.__connect_timeout = connect_timeout
+        self.__read_timeout = read_timeout
+        self.__compression = compression
+        self.__compression_threshold = compression_threshold
+        self.__compression_level = compression_level
+        self.__ssl_context = ssl_context
+        self.__connection: Optional[_Connection] = None
+        self.__address: Optional[Tuple[str, int, bool]] = None
+
+    async def post(self, url: str, body: bytes, content_type: str = "application/json") -> None:
+        """
+        Posts a request body to the endpoint, compressing it if it is large enough.
+
+        A kept-alive connection closed by the server is transparently replaced once.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            body (bytes): The serialized request body.
+            content_type (str): The content type of the body. Defaults to "application/json".
+
+        Raises:
+            requests.RequestException: If the request could not be delivered or was rejected.
+        """
+
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        host = parts.hostname or "localhost"
+        port = parts.port or (443 if secure else 80)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        headers: Dict[str, str] = {
+            "Host": parts.netloc,
+            "Content-Type": content_type,
+            "Connection": "keep-alive",
+        }
+        if self.__compression and len(body) >= self.__compression_threshold:
+            body = compressBody(
+                body, self.__compression, self.__compression_level)
+            headers["Content-Encoding"] = self.__compression
+        headers["Content-Length"] = str(len(body))
+
+        head = f"POST {path} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+        request = head.encode("latin-1") + body
+
+        if self.__address != (host, port, secure):
+            await self.close()
+            self.__address = (host, port, secure)
+
+        reused = self.__connection is not None
+        try:
+            status, response_headers = await self._exchange(host, port, secure, request)
+        except RequestException:
+            await self.close()
+            raise
+        except (OSError, asyncio.IncompleteReadError) as e:
+            await self.close()
+            if not reused:
+                raise ConnectionError(e) from e
+            try:
+                status, response_headers = await self._exchange(host, port, secure, request)
+            except RequestException:
+                await self.close()
+                raise
+            except (OSError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                raise ConnectionError(e) from e
+
+        if status >= 400:
+            response = requests.Response()
+            response.status_code = status
+            response.headers = CaseInsensitiveDict(response_headers)
+            response.url = url
+            raise HTTPError(f"{status} Error for url: {url}",
+                            response=response)
+
+    async def close(self) -> None:
+        """
+        Closes the persistent connection, if any. A request still being written, e.g. after a send timeout, is
+        abandoned rather than flushed.
+        """
+
+        connection, self.__connection = self.__connection, None
+        if connection is not None:
+            _, writer = connection
+            if writer.transport.get_write_buffer_size():
+                writer.transport.abort()
+            else:
+                writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+    async def _connect(self, host: str, port: int, secure: bool) -> _Connection:
+        """
+        Returns the persistent connection, opening it if needed.
+        """
+
+        if self.__connection is None:
+            context = (
+                self.__ssl_context or ssl.create_default_context()) if secure else None
+            try:
+                self.__connection = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=context), self.__connect_timeout)
+            except asyncio.TimeoutError as e:
+                raise ConnectTimeout(
+                    f"Timed out connecting to {host}:{port}") from e
+        return self.__connection
+
+    async def _exchange(self, host: str, port: int, secure: bool, request: bytes) -> Tuple[int, Dict[str, str]]:
+        """
+        Writes a request and reads the response on the persistent connection.
+
+        Returns:
+            Tuple[int, Dict[str, str]]: The status code and headers of the response.
+        """
+
+        reader, writer = await self._connect(host, port, secure)
+        writer.write(request)
+        try:
+            await asyncio.wait_for(writer.drain(), self.__read_timeout)
+        except asyncio.TimeoutError as e:
+            await self.close()
+            raise Timeout(f"Timed out sending to {host}:{port}") from e
+
+        try:
+            status, headers, keep_alive = await asyncio.wait_for(
+                _readResponse(reader), self.__read_timeout)
+        except asyncio.TimeoutError as e:
+            await self.close()
+            raise ReadTimeout(f"Timed out waiting for {host}:{port}") from e
+        except ValueError as e:
+            await self.close()
+            raise ConnectionError(
+                f"Malformed response from {host}:{port}: {e}") from e
+
+        if not keep_alive:
+            await self.close()
+        return status, headers
+
+
+async def _readResponse(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bool]:
+    """
+    Reads an HTTP/1.1 response, discarding its body. Interim 1xx responses are skipped.
+
+    Returns:
+        Tuple[int, Dict[str, str], bool]: The status code, the headers, and whether the connection can be reused.
+
+    Raises:
+        ValueError: If the status line, a chunk size or the content length is malformed.
+    """
+
+    while True:
+        status_line = await reader.readuntil(b"\r\n")
+        version, status_text, *_ = status_line.decode("latin-1").split(" ", 2)
+        status = int(status_text)
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if not 100 <= status < 200:
+            break
+
+    keep_alive = version == "HTTP/1.1" and headers.get(
+        "connection", "").lower() != "close"
+
+    if status in _BODILESS_STATUSES:
+        # RFC 9112 section 6.3: these responses end with their headers, whatever they announce.
+        pass
+    elif headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if size == 0:
+                break
+            await reader.readexactly(size + 2)
+        # The last chunk is followed by optional trailer fields and a blank line.
+        while await reader.readuntil(b"\r\n") != b"\r\n":
+            pass
+    elif "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    else:
+        await reader.read()
+        keep_alive = False
+
+    return status, headers, keep_alive
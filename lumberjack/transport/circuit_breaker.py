@@ -0,0 +1,172 @@
+import threading
+import time
+from enum import Enum
+from typing import Callable, Optional
+
+from requests import RequestException
+
+from lumberjack.transport.transport import isRetriable
+
+
+class CircuitState(str, Enum):
+    """
+    The state of a circuit breaker.
+    """
+
+    CLOSED = "closed"
+    """
+    Requests are sent normally.
+    """
+
+    OPEN = "open"
+    """
+    Requests are short-circuited until the cool-down period has passed.
+    """
+
+    HALF_OPEN = "half_open"
+    """
+    The cool-down period has passed and a single probe request is allowed through.
+    """
+
+
+class CircuitOpenError(RequestException):
+    """
+    Raised instead of sending a request while the circuit breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Stops sending to an endpoint after consecutive failures, for a cool-down period.
+
+    Only retriable failures (connection errors, timeouts, 5xx and 429 responses) count; any other
+    response shows the endpoint is up and closes the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes a closed circuit breaker.
+
+        Args:
+            failure_threshold (int): Number of consecutive failures that open the circuit. Defaults to 5.
+            cooldown (float): Seconds the circuit stays open before a probe is allowed. Defaults to 30.0.
+            clock (Callable[[], float]): Returns the current time in seconds. Defaults to time.monotonic.
+        """
+
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__failures = 0
+        self.__opened_at: Optional[float] = None
+        self.__probing = False
+
+    def copy(self) -> "CircuitBreaker":
+        """
+        Returns a new, closed breaker with the same settings, e.g. to guard another endpoint.
+
+        Returns:
+            CircuitBreaker: The new breaker.
+        """
+
+        return CircuitBreaker(self.failure_threshold, self.cooldown, self.__clock)
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        The current state of the circuit.
+        """
+
+        with self.__lock:
+            return self._state()
+
+    @property
+    def consecutive_failures(self) -> int:
+        """
+        The number of failures since the last success.
+        """
+        return self.__failures
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent now. In the half-open state only one probe is allowed at a time.
+
+        Returns:
+            bool: True if the request may be sent.
+        """
+
+        with self.__lock:
+            match self._state():
+                case CircuitState.CLOSED:
+                    return True
+                case CircuitState.HALF_OPEN if not self.__probing:
+                    self.__probing = True
+                    return True
+                case _:
+                    return False
+
+    def recordSuccess(self) -> None:
+        """
+        Records a successful request, closing the circuit.
+        """
+
+        with self.__lock:
+            self.__failures = 0
+            self.__opened_at = None
+            self.__probing = False
+
+    def recordFailure(self) -> None:
+        """
+        Records a failed request, opening the circuit once the threshold is reached or a probe failed.
+        """
+
+        with self.__lock:
+            self.__failures += 1
+            if self.__probing or self.__failures >= self.failure_threshold:
+                self.__opened_at = self.__clock()
+            self.__probing = False
+
+    def call(self, send: Callable[[], None]) -> None:
+        """
+        Calls `send` unless the circuit is open, recording the outcome.
+
+        Args:
+            send (Callable[[], None]): Delivers the logs.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+            requests.RequestException: If `send` fails.
+        """
+
+        if not self.allow():
+            raise CircuitOpenError(
+                "Circuit breaker is open, request not sent.")
+
+        try:
+            send()
+        except RequestException as e:
+            if isRetriable(e):
+                self.recordFailure()
+            else:
+                self.recordSuccess()
+            raise
+        except BaseException:
+            self.recordFailure()
+            raise
+        self.recordSuccess()
+
+    def _state(self) -> CircuitState:
+        """
+        Computes the current state. Must hold the lock.
+        """
+
+        if self.__opened_at is None:
+            return CircuitState.CLOSED
+        if self.__clock() - self.__opened_at >= self.cooldown:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
@@ -0,0 +1,317 @@
+import threading
+import time
+from enum import Enum
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence
+
+from requests import RequestException
+
+from lumberjack.transport.circuit_breaker import (CircuitBreaker,
+                                                  CircuitOpenError)
+from lumberjack.transport.transport import isRetriable
+
+
+class EndpointStrategy(str, Enum):
+    """
+    How requests are spread across the healthy endpoints.
+    """
+
+    ROUND_ROBIN = "round_robin"
+    """
+    Each request goes to the next healthy endpoint in turn.
+    """
+
+    LEAST_LATENCY = "least_latency"
+    """
+    Each request goes to the healthy endpoint with the lowest smoothed latency, weighted by the number of requests
+    already in flight to it, so concurrent senders spill over to the next fastest endpoint instead of queueing
+    behind the fastest one.
+    """
+
+
+class NoEndpointAvailableError(RequestException):
+    """
+    Raised instead of sending a request while every endpoint is out of rotation and none is due for a probe.
+    """
+
+
+class _Endpoint:
+    """
+    The health of one endpoint.
+    """
+
+    def __init__(self, url: str, breaker: Optional[CircuitBreaker]) -> None:
+        self.url = url
+        self.breaker = breaker
+        self.failures = 0
+        self.healthy = True
+        self.retry_at = 0.0
+        self.probing = False
+        self.latency: Optional[float] = None
+        self.in_flight = 0
+        self.requests = 0
+        self.requests_failed = 0
+
+
+class EndpointPool:
+    """
+    Spreads requests across several endpoints, tracking the health of each.
+
+    An endpoint is taken out of rotation after `failure_threshold` consecutive retriable failures (connection
+    errors, timeouts, 5xx and 429 responses). Once `probe_interval` seconds have passed, the next request is sent
+    to it first as a probe: a success brings it back into rotation, a failure keeps it out for another interval.
+    A failed request is tried again on the next endpoint, so a probe or a node going down does not lose the
+    request as long as another endpoint is up. Probes piggyback on requests: nothing is sent in the background,
+    so an endpoint out of rotation is only probed, and brought back, by the first request after its interval.
+
+    With a circuit breaker, each endpoint gets its own, and an endpoint whose breaker is open is skipped without
+    counting as a failure.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: EndpointStrategy | str = EndpointStrategy.ROUND_ROBIN,
+        failure_threshold: int = 3,
+        probe_interval: float = 10.0,
+        latency_smoothing: float = 0.2,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes the pool with every endpoint in rotation.
+
+        Args:
+            urls (Sequence[str]): The URLs of the logging endpoints.
+            strategy (EndpointStrategy | str): How requests are spread: "round_robin" or "least_latency".
+                Defaults to "round_robin".
+            failure_threshold (int): Number of consecutive failures that take an endpoint out of rotation.
+                Defaults to 3.
+            probe_interval (float): Seconds between probes of an endpoint out of rotation. Defaults to 10.0.
+            latency_smoothing (float): Weight of the latest request in the smoothed latency of an endpoint, from 0
+                to 1. Defaults to 0.2.
+            circuit_breaker (Optional[CircuitBreaker]): The settings of the breaker each endpoint gets a copy of.
+                Defaults to None.
+            clock (Callable[[], float]): Returns the current time in seconds. Defaults to time.monotonic.
+        """
+
+        if not urls:
+            raise ValueError("At least one endpoint URL is required.")
+
+        self.strategy = EndpointStrategy(strategy)
+        self.failure_threshold = max(1, failure_threshold)
+        self.probe_interval = probe_interval
+        self.latency_smoothing = latency_smoothing
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.circuit_breaker = circuit_breaker
+        self.__endpoints = {url: _Endpoint(url, circuit_breaker and circuit_breaker.copy())
+                            for url in urls}
+        self.__next = 0
+
+    @property
+    def urls(self) -> List[str]:
+        """
+        The URLs of every endpoint.
+        """
+        return list(self.__endpoints)
+
+    @property
+    def healthy(self) -> List[str]:
+        """
+        The URLs of the endpoints in rotation.
+        """
+
+        with self.__lock:
+            return [endpoint.url for endpoint in self.__endpoints.values() if endpoint.healthy]
+
+    def latency(self, url: str) -> Optional[float]:
+        """
+        Returns the smoothed latency of an endpoint in seconds, or None before its first successful request.
+
+        Args:
+            url (str): The URL of the endpoint.
+        """
+
+        return self._endpoint(url).latency
+
+    def circuitBreaker(self, url: str) -> Optional[CircuitBreaker]:
+        """
+        Returns the circuit breaker of an endpoint, if any.
+
+        Args:
+            url (str): The URL of the endpoint.
+        """
+
+        return self._endpoint(url).breaker
+
+    @property
+    def circuit_breakers(self) -> Dict[str, CircuitBreaker]:
+        """
+        The circuit breaker of each endpoint, by URL, if the pool has breakers.
+        """
+
+        return {endpoint.url: endpoint.breaker for endpoint in self.__endpoints.values()
+                if endpoint.breaker is not None}
+
+    @property
+    def requests_by_endpoint(self) -> Dict[str, int]:
+        """
+        The number of requests sent, by endpoint URL.
+        """
+
+        with self.__lock:
+            return {endpoint.url: endpoint.requests for endpoint in self.__endpoints.values()}
+
+    @property
+    def requests_failed_by_endpoint(self) -> Dict[str, int]:
+        """
+        The number of requests that failed, by endpoint URL.
+        """
+
+        with self.__lock:
+            return {endpoint.url: endpoint.requests_failed for endpoint in self.__endpoints.values()}
+
+    def candidates(self) -> List[str]:
+        """
+        Returns the endpoints to try for the next request, in order: an endpoint due for a probe first, if any,
+        then the endpoints in rotation as ordered by the strategy. The endpoint returned as a probe is not
+        returned again until its outcome is recorded.
+
+        Returns:
+            List[str]: The URLs to try.
+        """
+
+        with self.__lock:
+            now = self.__clock()
+            probes = [endpoint for endpoint in self.__endpoints.values()
+                      if not endpoint.healthy and not endpoint.probing and now >= endpoint.retry_at]
+            healthy = [
+                endpoint for endpoint in self.__endpoints.values() if endpoint.healthy]
+
+            if self.strategy == EndpointStrategy.LEAST_LATENCY:
+                healthy.sort(key=lambda endpoint: (
+                    endpoint.latency or 0.0) * (endpoint.in_flight + 1))
+            elif healthy:
+                start = self.__next % len(healthy)
+                self.__next += 1
+                healthy = healthy[start:] + healthy[:start]
+
+            ordered = probes[:1] + healthy
+            if probes:
+                probes[0].probing = True
+            return [endpoint.url for endpoint in ordered]
+
+    def recordSuccess(self, url: str, seconds: float) -> None:
+        """
+        Records a successful request, bringing the endpoint back into rotation.
+
+        Args:
+            url (str): The URL of the endpoint.
+            seconds (float): How long the request took.
+        """
+
+        endpoint = self._endpoint(url)
+        with self.__lock:
+            endpoint.failures = 0
+            endpoint.healthy = True
+            endpoint.probing = False
+            endpoint.requests += 1
+            if endpoint.latency is None:
+                endpoint.latency = seconds
+            else:
+                endpoint.latency += self.latency_smoothing * \
+                    (seconds - endpoint.latency)
+
+    def recordFailure(self, url: str) -> None:
+        """
+        Records a failed request, taking the endpoint out of rotation once the threshold is reached or a probe
+        failed.
+
+        Args:
+            url (str): The URL of the endpoint.
+        """
+
+        endpoint = self._endpoint(url)
+        with self.__lock:
+            endpoint.failures += 1
+            endpoint.requests += 1
+            endpoint.requests_failed += 1
+            if endpoint.probing or endpoint.failures >= self.failure_threshold:
+                endpoint.healthy = False
+                endpoint.retry_at = self.__clock() + self.probe_interval
+            endpoint.probing = False
+
+    def call(self, send: Callable[[str], None]) -> None:
+        """
+        Calls `send` with each candidate endpoint in turn until one succeeds, recording the outcomes. Each endpoint
+        is tried once: retries belong around this call, so a dead endpoint fails over after a single attempt.
+
+        Failures that are not retriable show the endpoint is up: they are raised without trying other endpoints.
+        Endpoints whose circuit breaker is open are skipped without being charged a failure.
+
+        Args:
+            send (Callable[[str], None]): Delivers the logs to the endpoint URL it is given.
+
+        Raises:
+            NoEndpointAvailableError: If every endpoint is out of rotation and none is due for a probe.
+            requests.RequestException: If `send` failed or was short-circuited on every endpoint, the last error.
+        """
+
+        urls = self.candidates()
+        if not urls:
+            raise NoEndpointAvailableError(
+                "Every endpoint is out of rotation, request not sent.")
+
+        error: Optional[RequestException] = None
+        for url in urls:
+            endpoint = self._endpoint(url)
+            with self.__lock:
+                endpoint.in_flight += 1
+            started = time.perf_counter()
+            try:
+                if endpoint.breaker is not None:
+                    endpoint.breaker.call(partial(send, url))
+                else:
+                    send(url)
+            except CircuitOpenError as e:
+                with self.__lock:
+                    endpoint.probing = False
+                error = e
+                continue
+            except RequestException as e:
+                if not isRetriable(e):
+                    self.recordSuccess(url, time.perf_counter() - started)
+                    raise
+                self.recordFailure(url)
+                error = e
+                continue
+            except BaseException:
+                self.recordFailure(url)
+                raise
+            finally:
+                with self.__lock:
+                    endpoint.in_flight -= 1
+            self.recordSuccess(url, time.perf_counter() - started)
+            return
+
+        assert error is not None
+        raise error
+
+    def reset(self) -> None:
+        """
+        Forgets the requests in flight and the probes under way, e.g. in a forked child, whose parent threads
+        sending them do not exist.
+        """
+
+        self.__lock = threading.Lock()
+        for endpoint in self.__endpoints.values():
+            endpoint.in_flight = 0
+            endpoint.probing = False
+
+    def _endpoint(self, url: str) -> _Endpoint:
+        """
+        Returns the health of an endpoint by URL.
+        """
+
+        return self.__endpoints[url]
@@ -0,0 +1,155 @@
+import gzip
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lumberjack.transport.transport import Body
+
+COMPRESSIONS = ("gzip", "deflate")
+"""
+The supported values for the `compression` option.
+"""
+
+
+def compressBody(body: bytes, compression: str, level: int = 6) -> bytes:
+    """
+    Compresses a request body.
+
+    Args:
+        body (bytes): The uncompressed body.
+        compression (str): "gzip" or "deflate".
+        level (int): The zlib compression level, from 1 (fastest) to 9 (smallest). Defaults to 6.
+
+    Returns:
+        bytes: The compressed body.
+    """
+
+    if compression == "gzip":
+        return gzip.compress(body, compresslevel=level)
+    return zlib.compress(body, level)
+
+
+def compressChunks(chunks: Iterable[bytes], compression: str, level: int = 6) -> Iterator[bytes]:
+    """
+    Compresses a request body chunk by chunk, without holding it whole.
+
+    Args:
+        chunks (Iterable[bytes]): The uncompressed chunks.
+        compression (str): "gzip" or "deflate".
+        level (int): The zlib compression level, from 1 (fastest) to 9 (smallest). Defaults to 6.
+
+    Returns:
+        Iterator[bytes]: The compressed chunks, in the same format as `compressBody`.
+    """
+
+    compressor = zlib.compressobj(
+        level, zlib.DEFLATED, 31 if compression == "gzip" else 15)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+class HttpTransport:
+    """
+    Delivers logs over a pooled, keep-alive HTTP session with optional body compression.
+
+    Chunked bodies are streamed with chunked transfer encoding, and compressed as they are streamed, whatever
+    their size.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+        compression_level: int = 6,
+    ) -> None:
+        """
+        Initializes the transport and its connection pool.
+
+        Args:
+            pool_size (int): Maximum number of persistent connections kept per host. Defaults to 10.
+            connect_timeout (float): Seconds to wait for a connection to be established. Defaults to 3.05.
+            read_timeout (float): Seconds to wait for the endpoint to respond. Defaults to 10.0.
+            compression (Optional[str]): "gzip" or "deflate" to compress request bodies. Defaults to None.
+            compression_threshold (int): Minimum body size in bytes before compression is applied. Defaults to 1024.
+            compression_level (int): The zlib compression level, from 1 (fastest) to 9 (smallest). Defaults to 6.
+        """
+
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unsupported compression '{compression}', expected one of {COMPRESSIONS}.")
+
+        self.__timeout = (connect_timeout, read_timeout)
+        self.__compression = compression
+        self.__compression_threshold = compression_threshold
+        self.__compression_level = compression_level
+        self.__pool_size = pool_size
+        self.__session = self._newSession()
+
+    def post(self, url: str, body: Body, content_type: str = "application/json") -> None:
+        """
+        Posts a request body to the endpoint, compressing it if it is large enough.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            body (Body): The serialized request body, or its chunks.
+            content_type (str): The content type of the body. Defaults to "application/json".
+
+        Raises:
+            requests.RequestException: If the request could not be delivered or was rejected.
+        """
+
+        headers: Dict[str, str] = {"Content-Type": content_type}
+
+        data: bytes | Iterator[bytes]
+        if isinstance(body, bytes):
+            data = body
+            if self.__compression and len(body) >= self.__compression_threshold:
+                data = compressBody(
+                    body, self.__compression, self.__compression_level)
+                headers["Content-Encoding"] = self.__compression
+        else:
+            # A generator has no length, so requests sends it with chunked transfer encoding.
+            data = iter(body)
+            if self.__compression:
+                data = compressChunks(
+                    data, self.__compression, self.__compression_level)
+                headers["Content-Encoding"] = self.__compression
+
+        response = self.__session.post(
+            url, data=data, headers=headers, timeout=self.__timeout)
+        response.raise_for_status()
+
+    def close(self) -> None:
+        """
+        Closes the session and every pooled connection.
+        """
+
+        self.__session.close()
+
+    def reset(self) -> None:
+        """
+        Replaces the session with a new one without closing the pooled connections, e.g. in a forked child,
+        whose inherited connections still belong to the parent.
+        """
+
+        self.__session = self._newSession()
+
+    def _newSession(self) -> requests.Session:
+        """
+        Creates a session with a connection pool of `pool_size` connections per host.
+        """
+
+        adapter = HTTPAdapter(pool_connections=self.__pool_size,
+                              pool_maxsize=self.__pool_size)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
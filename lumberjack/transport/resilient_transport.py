@@ -0,0 +1,73 @@
+from typing import Optional
+
+from lumberjack.transport.circuit_breaker import CircuitBreaker
+from lumberjack.transport.retry import RetryPolicy
+from lumberjack.transport.transport import Body, Transport, resetTransport
+
+
+class ResilientTransport:
+    """
+    Wraps a transport with retries and a circuit breaker.
+
+    Retries happen inside the breaker, so one exhausted sequence of retries counts as a single failure.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        retry: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Initializes the wrapper.
+
+        Args:
+            transport (Transport): The transport delivering the requests.
+            retry (Optional[RetryPolicy]): How failed requests are retried. Defaults to None (no retries).
+            circuit_breaker (Optional[CircuitBreaker]): Short-circuits requests to a failing endpoint. Defaults to None.
+        """
+
+        self.transport = transport
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+
+    def post(self, url: str, body: Body, content_type: str = "application/json") -> None:
+        """
+        Posts a request body to the endpoint, retrying and short-circuiting as configured.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            body (Body): The serialized request body, or its chunks.
+            content_type (str): The content type of the body. Defaults to "application/json".
+
+        Raises:
+            requests.RequestException: If the request could not be delivered or was rejected.
+        """
+
+        def send() -> None:
+            self.transport.post(url, body, content_type)
+
+        def retried() -> None:
+            if self.retry is not None:
+                self.retry.call(send)
+            else:
+                send()
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.call(retried)
+        else:
+            retried()
+
+    def close(self) -> None:
+        """
+        Closes the wrapped transport.
+        """
+
+        self.transport.close()
+
+    def reset(self) -> None:
+        """
+        Resets the wrapped transport, if it supports it.
+        """
+
+        resetTransport(self.transport)
@@ -0,0 +1,95 @@
+import random
+import time
+from typing import Callable, Optional
+
+from requests import HTTPError, RequestException
+
+from lumberjack.transport.transport import isRetriable
+
+
+class RetryPolicy:
+    """
+    Retries retriable delivery failures with jittered exponential backoff.
+
+    Connection errors, timeouts, 5xx and 429 responses are retried; other errors are raised immediately.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 10.0,
+        jitter: bool = True,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initializes the retry policy.
+
+        Args:
+            max_retries (int): Maximum number of retries after the first attempt. Defaults to 3.
+            backoff_base (float): Delay in seconds before the first retry, doubled for every further retry. Defaults to 0.1.
+            backoff_max (float): Upper bound for a single delay in seconds. Defaults to 10.0.
+            jitter (bool): Whether to pick each delay uniformly between zero and its upper bound. Defaults to True.
+            sleep (Callable[[float], None]): Waits between attempts. Defaults to time.sleep.
+        """
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.__sleep = sleep
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Computes the delay before a retry, honouring a Retry-After header up to `backoff_max`.
+
+        Args:
+            attempt (int): The number of attempts made so far, starting at 1.
+            error (Optional[BaseException]): The error of the last attempt. Defaults to None.
+
+        Returns:
+            float: The delay in seconds.
+        """
+
+        retry_after = _retryAfter(error)
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def call(self, send: Callable[[], None]) -> None:
+        """
+        Calls `send`, retrying it while it fails with a retriable error.
+
+        Args:
+            send (Callable[[], None]): Delivers the logs.
+
+        Raises:
+            requests.RequestException: The error of the last attempt, or the first non-retriable error.
+        """
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                send()
+                return
+            except RequestException as e:
+                if attempt > self.max_retries or not isRetriable(e):
+                    raise
+                self.__sleep(self.backoff(attempt, e))
+
+
+def _retryAfter(error: Optional[BaseException]) -> Optional[float]:
+    """
+    Reads the Retry-After header, in seconds, of a rejected request.
+    """
+
+    if not isinstance(error, HTTPError) or error.response is None:
+        return None
+
+    try:
+        return max(0.0, float(error.response.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
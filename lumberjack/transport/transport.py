@@ -0,0 +1,69 @@
+from typing import Iterable, Protocol
+
+from requests import HTTPError, RequestException
+
+Body = bytes | Iterable[bytes]
+"""
+A request body: bytes, or chunks streamed with chunked transfer encoding. Chunked bodies must be iterable
+several times, to be sent again on retry.
+"""
+
+
+class Transport(Protocol):
+    """
+    The interface used by LumberjackHandler to deliver serialized logs to an endpoint.
+    """
+
+    def post(self, url: str, body: Body, content_type: str = "application/json") -> None:
+        """
+        Posts a request body to the endpoint.
+
+        Args:
+            url (str): The URL of the logging endpoint.
+            body (Body): The serialized request body, or its chunks. Chunked bodies are only passed to transports
+                by handlers configured to stream them.
+            content_type (str): The content type of the body. Defaults to "application/json".
+
+        Raises:
+            requests.RequestException: If the request could not be delivered or was rejected.
+        """
+        ...
+
+    def close(self) -> None:
+        """
+        Releases every connection held by the transport.
+        """
+        ...
+
+
+def resetTransport(transport: Transport) -> None:
+    """
+    Makes a transport drop the connections inherited from the parent process in a forked child.
+
+    Transports opt in by implementing a `reset()` method, which is not part of the Transport interface;
+    the others are left as they are.
+
+    Args:
+        transport (Transport): The transport to reset.
+    """
+
+    reset = getattr(transport, "reset", None)
+    if callable(reset):
+        reset()
+
+
+def isRetriable(error: BaseException) -> bool:
+    """
+    Whether a failed delivery may succeed later: connection problems, timeouts, 5xx and 429 responses.
+
+    Args:
+        error (BaseException): The error raised by a transport.
+
+    Returns:
+        bool: True if the logs should be kept and sent again later.
+    """
+
+    if isinstance(error, HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        return status is None or status >= 500 or status == 429
+    return isinstance(error, RequestException)
@@ -1,2 +1,69 @@
-from lumberjack.utils.helpers import getCode
-from lumberjack.utils.log_builder import buildLog
+from typing import TYPE_CHECKING
+
+from lumberjack.utils.lazy_import import lazyExports
+
+if TYPE_CHECKING:
+    from lumberjack.utils.batch_worker import BatchWorker
+    from lumberjack.utils.columnar import decodeColumnar, encodeColumnar
+    from lumberjack.utils.disk_spool import DiskSpool
+    from lumberjack.utils.encoders import (BatchFormat, ChunkedBody, Encoder,
+                                           encodeBatch, encodeOrjson,
+                                           encodePydantic, encodeStdlib,
+                                           getEncoder, splitBatch)
+    from lumberjack.utils.field_limits import (TRUNCATION_MARKER, FieldLimits,
+                                               truncateText)
+    from lumberjack.utils.helpers import (CodeCapture, CodeSnippet,
+                                          SourceCache, getCode, getCodeHash,
+                                          getCodeSnippet, hashSource,
+                                          source_cache)
+    from lumberjack.utils.log_buffer import BackpressurePolicy, LogBuffer
+    from lumberjack.utils.log_builder import buildLog
+    from lumberjack.utils.log_throttle import LogThrottle
+    from lumberjack.utils.record_buffer import RecordBuffer
+    from lumberjack.utils.source_registry import (MISSING_SOURCES_HEADER,
+                                                  SourceRegistry,
+                                                  missingSources, sourcesUrl)
+    from lumberjack.utils.stack_traces import (StackTrace, TracebackCache,
+                                               getStackTrace, traceback_cache)
+
+_EXPORTS = {
+    "BatchWorker": "lumberjack.utils.batch_worker",
+    "decodeColumnar": "lumberjack.utils.columnar",
+    "encodeColumnar": "lumberjack.utils.columnar",
+    "DiskSpool": "lumberjack.utils.disk_spool",
+    "BatchFormat": "lumberjack.utils.encoders",
+    "ChunkedBody": "lumberjack.utils.encoders",
+    "Encoder": "lumberjack.utils.encoders",
+    "encodeBatch": "lumberjack.utils.encoders",
+    "encodeOrjson": "lumberjack.utils.encoders",
+    "encodePydantic": "lumberjack.utils.encoders",
+    "encodeStdlib": "lumberjack.utils.encoders",
+    "getEncoder": "lumberjack.utils.encoders",
+    "splitBatch": "lumberjack.utils.encoders",
+    "TRUNCATION_MARKER": "lumberjack.utils.field_limits",
+    "FieldLimits": "lumberjack.utils.field_limits",
+    "truncateText": "lumberjack.utils.field_limits",
+    "CodeCapture": "lumberjack.utils.helpers",
+    "CodeSnippet": "lumberjack.utils.helpers",
+    "SourceCache": "lumberjack.utils.helpers",
+    "getCode": "lumberjack.utils.helpers",
+    "getCodeHash": "lumberjack.utils.helpers",
+    "getCodeSnippet": "lumberjack.utils.helpers",
+    "hashSource": "lumberjack.utils.helpers",
+    "source_cache": "lumberjack.utils.helpers",
+    "buildLog": "lumberjack.utils.log_builder",
+    "BackpressurePolicy": "lumberjack.utils.log_buffer",
+    "LogBuffer": "lumberjack.utils.log_buffer",
+    "LogThrottle": "lumberjack.utils.log_throttle",
+    "RecordBuffer": "lumberjack.utils.record_buffer",
+    "MISSING_SOURCES_HEADER": "lumberjack.utils.source_registry",
+    "SourceRegistry": "lumberjack.utils.source_registry",
+    "missingSources": "lumberjack.utils.source_registry",
+    "sourcesUrl": "lumberjack.utils.source_registry",
+    "StackTrace": "lumberjack.utils.stack_traces",
+    "TracebackCache": "lumberjack.utils.stack_traces",
+    "getStackTrace": "lumberjack.utils.stack_traces",
+    "traceback_cache": "lumberjack.utils.stack_traces",
+}
+
+__getattr__, __dir__ = lazyExports(__name__, _EXPORTS)
@@ -0,0 +1,258 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from lumberjack.models import Log
+from lumberjack.utils.encoders import Encoder, getEncoder
+from lumberjack.utils.log_buffer import BackpressurePolicy, LogBuffer
+
+_LOG_OVERHEAD = 400
+"""
+The approximate serialized size of a log besides its strings: field names, numbers, dates and punctuation.
+"""
+
+
+class _FlushRequest:
+    """
+    A marker placed on the queue to force the pending batch out.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+"""
+A marker placed on the queue to stop the worker once everything before it has been shipped.
+"""
+
+
+class BatchWorker:
+    """
+    Drains a bounded in-memory queue of logs on a background thread and ships them in batches.
+
+    A batch is shipped as soon as it holds `max_batch_records` logs, reaches `max_batch_bytes`
+    of serialized payload, or its oldest log has been waiting for `max_linger` seconds.
+
+    With `batch_logs`, the logs themselves are shipped, for batch formats that encode a whole batch
+    at once, and batches are bounded by `max_batch_records` and `max_linger` only.
+
+    The queue holds at most `max_queue_size` logs and, if set, `max_queue_bytes` of estimated payload.
+    When it is full, `backpressure` decides whether the caller waits or which logs are dropped.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[Any]], None],
+        max_queue_size: int = 10000,
+        max_batch_records: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+        max_linger: float = 1.0,
+        name: str = "lumberjack-batch-worker",
+        encoder: Optional[Encoder] = None,
+        batch_logs: bool = False,
+        max_queue_bytes: Optional[int] = None,
+        backpressure: BackpressurePolicy | str = BackpressurePolicy.DROP_NEWEST,
+        block_timeout: Optional[float] = 1.0,
+    ) -> None:
+        """
+        Initializes the worker and starts its background thread.
+
+        Args:
+            send (Callable[[List[Any]], None]): Ships one batch of serialized logs, or of logs with `batch_logs`.
+            max_queue_size (int): Maximum number of logs waiting in the queue. Defaults to 10000.
+            max_batch_records (int): Maximum number of logs in one batch. Defaults to 500.
+            max_batch_bytes (int): Maximum size of the JSON or NDJSON body of one batch in bytes, unless a single log
+                is larger on its own. Defaults to 1 MiB.
+            max_linger (float): Maximum seconds a log waits for its batch to fill. Defaults to 1.0.
+            name (str): Name of the background thread. Defaults to "lumberjack-batch-worker".
+            encoder (Optional[Encoder]): Serializes each log exactly once. Defaults to the fastest available encoder.
+            batch_logs (bool): Whether to ship the logs unserialized. Defaults to False.
+            max_queue_bytes (Optional[int]): Maximum estimated size of the logs waiting in the queue.
+                Defaults to None (no byte limit).
+            backpressure (BackpressurePolicy | str): What happens when the queue is full: "block", "drop_newest",
+                "drop_oldest" or "drop_lowest_level". Defaults to "drop_newest".
+            block_timeout (Optional[float]): Maximum seconds `put` waits for room with the "block" policy.
+                None waits forever. Defaults to 1.0.
+        """
+
+        self.__send = send
+        self.__encode = encoder or getEncoder()
+        self.__batch_logs = batch_logs
+        self.__max_batch_records = max(1, max_batch_records)
+        self.__max_batch_bytes = max(1, max_batch_bytes)
+        self.__max_linger = max(0.0, max_linger)
+        self.__queue = LogBuffer(
+            max_queue_size, max_queue_bytes, backpressure, block_timeout)
+        self.__measure = max_queue_bytes is not None
+        self.__dropped = 0
+        self.__closed = False
+        self.__thread = threading.Thread(
+            target=self._run, name=name, daemon=True)
+        self.__thread.start()
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of logs dropped because the queue was full or the worker was closed.
+        """
+        return self.__dropped + self.__queue.dropped
+
+    @property
+    def dropped_by_level(self) -> Dict[int, int]:
+        """
+        The number of logs dropped because the queue was full, by level.
+        """
+        return self.__queue.dropped_by_level
+
+    @property
+    def depth(self) -> int:
+        """
+        The number of logs waiting in the queue.
+        """
+        return len(self.__queue)
+
+    @property
+    def depth_bytes(self) -> int:
+        """
+        The estimated size of the logs waiting in the queue, if it is limited in bytes.
+        """
+        return self.__queue.bytes
+
+    def put(self, log: Log) -> bool:
+        """
+        Enqueues a log, applying the backpressure policy if the queue is full. Only the "block" policy waits, and
+        never on the worker's own thread.
+
+        Args:
+            log (Log): The log to ship.
+
+        Returns:
+            bool: True if the log was enqueued, False if it was dropped.
+        """
+
+        if self.__closed:
+            self.__dropped += 1
+            return False
+
+        size = _estimateSize(log) if self.__measure else 0
+        return self.__queue.put(log, log.logLevel, size,
+                                block=threading.current_thread() is not self.__thread)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ships every log enqueued so far and waits for the send to finish.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if the flush completed within the timeout, False if it did not or the worker is closed,
+                since a flush queued behind the request to stop would never be served.
+        """
+
+        if self.__closed:
+            return False
+        if not self.__thread.is_alive():
+            return True
+
+        request = _FlushRequest()
+        self.__queue.putControl(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ships the remaining logs and stops the background thread.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            bool: True if the thread stopped within the timeout, False if it is still shipping.
+        """
+
+        if not self.__closed:
+            self.__closed = True
+            self.__queue.putControl(_STOP)
+        self.__thread.join(timeout)
+        return not self.__thread.is_alive()
+
+    def _run(self) -> None:
+        """
+        The background loop collecting logs into batches and shipping them.
+        """
+
+        batch: List[Any] = []
+        size = 0
+        deadline: Optional[float] = None
+
+        while True:
+            timeout = None if deadline is None else max(
+                0.0, deadline - time.monotonic())
+            try:
+                item = self.__queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, _FlushRequest):
+                self._ship(batch)
+                batch, size, deadline = [], 0, None
+                if isinstance(item, _FlushRequest):
+                    item.done.set()
+                if item is _STOP:
+                    return
+                continue
+
+            assert isinstance(item, Log)
+            if self.__batch_logs:
+                payload: Log | bytes = item
+            else:
+                payload = self.__encode(item)
+                # Counts the separator of each log and the brackets of a JSON array, so the body fits exactly.
+                if batch and size + len(payload) + 2 > self.__max_batch_bytes:
+                    self._ship(batch)
+                    batch, size, deadline = [], 0, None
+                size += len(payload) + 1
+
+            if not batch:
+                deadline = time.monotonic() + self.__max_linger
+            batch.append(payload)
+
+            if len(batch) >= self.__max_batch_records or size + 1 >= self.__max_batch_bytes:
+                self._ship(batch)
+                batch, size, deadline = [], 0, None
+
+    def _ship(self, batch: List[Any]) -> None:
+        """
+        Hands a batch to the send callback, never letting an error kill the worker.
+
+        Args:
+            batch (List[Any]): The serialized logs, or the logs, to ship.
+        """
+
+        if not batch:
+            return
+
+        try:
+            self.__send(batch)
+        except Exception as e:
+            print(f"Failed to ship batch: {e}")
+
+
+def _estimateSize(log: Log) -> int:
+    """
+    Estimates the serialized size of a log from its strings, without serializing it.
+
+    Args:
+        log (Log): The log.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+
+    size = _LOG_OVERHEAD
+    for value in log.__dict__.values():
+        if type(value) is str:
+            size += len(value)
+    return size
@@ -0,0 +1,138 @@
+import json
+from typing import (Any, Dict, Iterable, List, Mapping, Sequence, Union,
+                    get_args)
+
+from lumberjack.models import OMITTED_WHEN_UNSET, Log
+from lumberjack.utils.encoders import _default, _orjsonDefault, orjson
+
+COLUMNAR_VERSION = 1
+"""
+The version of the columnar batch layout, sent in its "version" member.
+"""
+
+FIELDS = tuple(Log.model_fields)
+"""
+The columns of a columnar batch: every Log field, in declaration order.
+"""
+
+INTERNED_FIELDS = frozenset(
+    name for name, field in Log.model_fields.items()
+    if field.annotation is str or str in get_args(field.annotation))
+"""
+The columns whose strings are replaced by their index in the batch string table.
+"""
+
+_OMITTED = frozenset(OMITTED_WHEN_UNSET)
+
+Row = Union[Log, Mapping[str, Any], bytes]
+"""
+A log, the JSON object of a serialized log, or the serialized log itself.
+"""
+
+
+def encodeColumnar(logs: Sequence[Row]) -> bytes:
+    """
+    Encodes a batch of logs column by column, with repeated strings sent once.
+
+    The body is a JSON object holding a string table and one array per field. Every string field
+    (logger name, file path, code, machine name and so on) holds indexes into the string table instead
+    of the strings themselves, so values shared by the records of a batch are written once. Other
+    fields hold their JSON values, and missing values are null. The columns of `OMITTED_WHEN_UNSET` are left out
+    when no log of the batch has them.
+
+    Example:
+        >>> encodeColumnar([log])
+        b'{"format":"columnar","version":1,"count":1,"strings":["WARNING",...],"columns":{"logLevel":[30],...}}'
+
+    Args:
+        logs (Sequence[Row]): The logs. Logs already serialized as JSON, e.g. read back from a spool, are parsed.
+
+    Returns:
+        bytes: The request body.
+    """
+
+    gathered: Iterable[Sequence[Any]]
+    if all(type(log) is Log for log in logs):
+        # The fields of a log are stored in declaration order, so the rows can be transposed at once.
+        gathered = zip(*(log.__dict__.values() for log in logs))
+    else:
+        rows = [_row(log) for log in logs]
+        gathered = ([row.get(field) for row in rows] for field in FIELDS)
+
+    strings: Dict[str, int] = {}
+    intern = strings.setdefault
+    columns: Dict[str, List[Any]] = {}
+
+    for field, column in zip(FIELDS, gathered):
+        values = list(column)
+        if field in _OMITTED and values.count(None) == len(values):
+            continue
+        if field in INTERNED_FIELDS and values:
+            first = values[0]
+            if values.count(first) == len(values):
+                # Most string fields hold one value across a batch: intern it once.
+                values = [first if first is None else intern(
+                    first, len(strings))] * len(values)
+            else:
+                # The index of a new string is the size of the table before it is added.
+                values = [value if value is None else intern(value, len(strings))
+                          for value in values]
+        columns[field] = values
+
+    batch = {
+        "format": "columnar",
+        "version": COLUMNAR_VERSION,
+        "count": len(logs),
+        "strings": list(strings),
+        "columns": columns,
+    }
+    if orjson is not None:
+        return orjson.dumps(batch, default=_orjsonDefault)
+    return json.dumps(batch, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _row(log: Row) -> Mapping[str, Any]:
+    if isinstance(log, Log):
+        return log.__dict__
+    if isinstance(log, bytes):
+        return orjson.loads(log) if orjson is not None else json.loads(log)
+    return log
+
+
+def decodeColumnar(body: bytes | str) -> List[Dict[str, Any]]:
+    """
+    Decodes a columnar batch back into one JSON object per log, as the JSON batch format would carry them, without
+    the fields of `OMITTED_WHEN_UNSET` a log does not have.
+
+    Args:
+        body (bytes | str): The request body produced by `encodeColumnar`.
+
+    Returns:
+        List[Dict[str, Any]]: The logs, in batch order.
+    """
+
+    batch = json.loads(body)
+    if batch.get("format") != "columnar" or batch.get("version") != COLUMNAR_VERSION:
+        raise ValueError(
+            f"Unsupported batch layout {batch.get('format')!r} version {batch.get('version')!r}.")
+
+    strings: List[str] = batch["strings"]
+    count: int = batch["count"]
+    columns: Dict[str, List[Any]] = {}
+    for field, values in batch["columns"].items():
+        if len(values) != count:
+            raise ValueError(
+                f"Column '{field}' holds {len(values)} values, expected {count}.")
+        if field in INTERNED_FIELDS:
+            values = [value if value is None else strings[value]
+                      for value in values]
+        columns[field] = values
+
+    omitted = [field for field in OMITTED_WHEN_UNSET if field in columns]
+    logs = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    if omitted:
+        for log in logs:
+            for field in omitted:
+                if log[field] is None:
+                    del log[field]
+    return logs
@@ -1,9 +1,33 @@
 import logging
+import threading
+from typing import Dict, Optional, Tuple
 
-from colorama import Fore, Style, init
+CYAN = "\x1b[36m"
+GREEN = "\x1b[32m"
+YELLOW = "\x1b[33m"
+RED = "\x1b[31m"
+BRIGHT = "\x1b[1m"
+RESET_ALL = "\x1b[0m"
+"""
+The ANSI codes of the colours, the same as colorama's `Fore` and `Style`.
+"""
 
-# Initialize Colorama
-init()
+_colorama_lock = threading.Lock()
+_colorama_initialized = False
+
+
+def _initColorama() -> None:
+    """
+    Initializes colorama once, when the first formatter is created rather than when the module is imported.
+    """
+
+    global _colorama_initialized
+    with _colorama_lock:
+        if _colorama_initialized:
+            return
+        from colorama import init
+        init()
+        _colorama_initialized = True
 
 
 class ConsoleFormatter(logging.Formatter):
@@ -14,6 +38,9 @@ class ConsoleFormatter(logging.Formatter):
     different colors to the log level part of messages depending on their severity level.
     It supports DEBUG, INFO, WARNING, ERROR, and CRITICAL levels. Other levels
     will use the default formatting style.
+
+    The format of every level is compiled once at construction and `format` never mutates the
+    formatter, so one instance can be shared by threads logging concurrently.
     """
 
     # Calculate max length once
@@ -23,9 +50,26 @@ class ConsoleFormatter(logging.Formatter):
     # Base format with time only (hours, minutes, seconds)
     BASE_FORMAT = "%(asctime)s [%(levelname)s]: %(message)s"
 
+    # Colour applied to the level name of each level
+    LEVEL_COLORS = {
+        logging.DEBUG: CYAN,
+        logging.INFO: GREEN,
+        logging.WARNING: YELLOW,
+        logging.ERROR: RED,
+        logging.CRITICAL: RED + BRIGHT,
+    }
+
     def __init__(self) -> None:
+        _initColorama()
         super().__init__(fmt=self.BASE_FORMAT, datefmt="%H:%M:%S")
 
+        self.__styles: Dict[int, logging.PercentStyle] = {
+            level: logging.PercentStyle(self._levelFormat(
+                logging.getLevelName(level), color))
+            for level, color in self.LEVEL_COLORS.items()
+        }
+        self.__asctime: Tuple[int, str] = (-1, "")
+
     def format(self, record: logging.LogRecord) -> str:
         """
         Format the specified record as text.
@@ -35,30 +79,58 @@ class ConsoleFormatter(logging.Formatter):
         This method is called automatically by the logging system.
         """
 
-        # Adjust padding dynamically
-        padding = self.MAX_LEVEL_LENGTH - len(record.levelname)
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record, self.datefmt)
 
-        # Create a dynamic format for levelname
-        levelname_format = f"[%(levelname)s]{' ' * padding}"
+        style = self.__styles.get(record.levelno)
+        if style is None:
+            style = logging.PercentStyle(
+                self._levelFormat(record.levelname, None))
+        formatted_record = style.format(record)
 
-        # Apply color only to levelname
-        match record.levelno:
-            case logging.DEBUG:
-                colored_levelname = Fore.CYAN + levelname_format + Style.RESET_ALL
-            case logging.INFO:
-                colored_levelname = Fore.GREEN + levelname_format + Style.RESET_ALL
-            case logging.WARNING:
-                colored_levelname = Fore.YELLOW + levelname_format + Style.RESET_ALL
-            case logging.ERROR:
-                colored_levelname = Fore.RED + levelname_format + Style.RESET_ALL
-            case logging.CRITICAL:
-                colored_levelname = Fore.RED + Style.BRIGHT + levelname_format + Style.RESET_ALL
-            case _:
-                colored_levelname = levelname_format  # Default format
-
-        # Set the dynamic format
-        self._style._fmt = f"%(asctime)s {colored_levelname}: %(message)s"
-
-        # Format the record
-        formatted_record = super().format(record)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            if formatted_record[-1:] != "\n":
+                formatted_record += "\n"
+            formatted_record += record.exc_text
+        if record.stack_info:
+            if formatted_record[-1:] != "\n":
+                formatted_record += "\n"
+            formatted_record += self.formatStack(record.stack_info)
         return formatted_record
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """
+        Formats the creation time of a record, rebuilding the string only when the second changes.
+        """
+
+        if not datefmt or datefmt != self.datefmt:
+            # Without a date format the milliseconds are included, so the string changes with every record.
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        cached_second, asctime = self.__asctime
+        if second != cached_second:
+            asctime = super().formatTime(record, datefmt)
+            # A single tuple assignment, so concurrent readers never see a mismatched pair.
+            self.__asctime = (second, asctime)
+        return asctime
+
+    def _levelFormat(self, levelname: str, color: Optional[str]) -> str:
+        """
+        Builds the format string of one level, with the level name padded and coloured.
+
+        Args:
+            levelname (str): The name of the level, used to compute the padding.
+            color (Optional[str]): The colour of the level name, or None to leave it uncoloured.
+
+        Returns:
+            str: The format string.
+        """
+
+        padding = self.MAX_LEVEL_LENGTH - len(levelname)
+        levelname_format = f"[%(levelname)s]{' ' * padding}"
+        if color is not None:
+            levelname_format = color + levelname_format + RESET_ALL
+        return f"%(asctime)s {levelname_format}: %(message)s"
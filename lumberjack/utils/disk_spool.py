@@ -0,0 +1,389 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+_HEADER = struct.Struct(">II")
+"""
+The header written before every record: payload length and CRC-32 of the payload.
+"""
+
+_CURSOR = struct.Struct(">QQ")
+"""
+The cursor file content: segment number and offset of the first undelivered record.
+"""
+
+_SEGMENT_SUFFIX = ".seg"
+_CURSOR_FILE = "cursor"
+
+
+class DiskSpool:
+    """
+    An append-only, on-disk spool of serialized logs that could not be delivered.
+
+    Records are written to numbered segment files, each record prefixed with its length and
+    CRC-32 so a torn write at a crash is detected and discarded on the next start. A cursor file
+    remembers the first undelivered record, so spooled logs survive a process restart and are
+    replayed in the order they were spooled.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        segment_bytes: int = 4 * 1024 * 1024,
+        fsync: bool = False,
+    ) -> None:
+        """
+        Opens the spool, recovering any records left by a previous process.
+
+        Args:
+            directory (str): The directory holding the segment files. Created if missing.
+            max_bytes (int): Maximum size of all segment files. New records are dropped beyond it. Defaults to 64 MiB.
+            segment_bytes (int): Size at which a new segment file is started. Defaults to 4 MiB.
+            fsync (bool): Whether to fsync after every append and cursor update. Defaults to False.
+        """
+
+        self.__directory = directory
+        self.__max_bytes = max_bytes
+        self.__segment_bytes = segment_bytes
+        self.__fsync = fsync
+        self.__lock = threading.Lock()
+        self.__replay_lock = threading.Lock()
+        self.__dropped = 0
+        self.__pending = 0
+        self.__size = 0
+        self.__segments: List[int] = []
+        self.__cursor: Tuple[int, int] = (0, 0)
+        self.__writer: Optional[BinaryIO] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def __len__(self) -> int:
+        """
+        The number of spooled records not delivered yet.
+        """
+        return self.__pending
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of records dropped because the spool was full.
+        """
+        return self.__dropped
+
+    @property
+    def size(self) -> int:
+        """
+        The size of all segment files in bytes.
+        """
+        return self.__size
+
+    def append(self, payloads: List[bytes]) -> int:
+        """
+        Appends serialized logs to the spool.
+
+        Args:
+            payloads (List[bytes]): The serialized logs.
+
+        Returns:
+            int: The number of logs spooled; the rest were dropped because the spool was full.
+        """
+
+        stored = 0
+        with self.__lock:
+            writer = self._writer()
+            for payload in payloads:
+                record = _HEADER.pack(
+                    len(payload), zlib.crc32(payload)) + payload
+
+                if self.__size + len(record) > self.__max_bytes:
+                    self.__dropped += 1
+                    continue
+
+                if writer.tell() and writer.tell() + len(record) > self.__segment_bytes:
+                    writer = self._roll()
+
+                writer.write(record)
+                self.__size += len(record)
+                self.__pending += 1
+                stored += 1
+
+            writer.flush()
+            if self.__fsync:
+                os.fsync(writer.fileno())
+        return stored
+
+    def replay(
+        self,
+        send: Callable[[List[bytes]], None],
+        max_batch_records: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+    ) -> int:
+        """
+        Sends the spooled logs in order, in batches, removing each batch once it has been sent.
+
+        Stops at the first batch whose send raises; that batch stays in the spool and the exception propagates.
+
+        Args:
+            send (Callable[[List[bytes]], None]): Ships one batch of serialized logs.
+            max_batch_records (int): Maximum number of logs in one batch. Defaults to 500.
+            max_batch_bytes (int): Maximum serialized size of one batch in bytes. Defaults to 1 MiB.
+
+        Returns:
+            int: The number of logs sent.
+        """
+
+        sent = 0
+        with self.__replay_lock:
+            while True:
+                batch, cursor = self._read(max_batch_records, max_batch_bytes)
+                if not batch:
+                    return sent
+                send(batch)
+                self._commit(cursor, len(batch))
+                sent += len(batch)
+
+    def close(self) -> None:
+        """
+        Closes the segment file being written. Spooled records stay on disk.
+        """
+
+        with self.__lock:
+            if self.__writer is not None:
+                self.__writer.close()
+                self.__writer = None
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.__directory, f"{segment:012d}{_SEGMENT_SUFFIX}")
+
+    def _writer(self) -> BinaryIO:
+        """
+        Returns the file of the last segment, opening it if needed. Must hold the lock.
+        """
+
+        if self.__writer is None:
+            if not self.__segments:
+                self.__segments.append(self.__cursor[0])
+            self.__writer = open(self._path(self.__segments[-1]), "ab")
+        return self.__writer
+
+    def _roll(self) -> BinaryIO:
+        """
+        Closes the last segment and starts a new one. Must hold the lock.
+        """
+
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+        self.__segments.append(self.__segments[-1] + 1)
+        return self._writer()
+
+    def _read(self, max_records: int, max_bytes: int) -> Tuple[List[bytes], Tuple[int, int]]:
+        """
+        Reads the next batch of undelivered records from the segment under the cursor.
+
+        Returns:
+            Tuple[List[bytes], Tuple[int, int]]: The records and the cursor just past them.
+        """
+
+        while True:
+            with self.__lock:
+                if not self.__pending:
+                    return [], self.__cursor
+                segment, offset = self.__cursor
+                later = [s for s in self.__segments if s > segment]
+
+            records, end, complete = _scan(
+                self._path(segment), offset, max_records, max_bytes)
+
+            if records:
+                return records, (segment, end)
+
+            if not later:
+                return self._discardTail(segment, offset, max_records, max_bytes)
+
+            # The segment is exhausted (or its tail is corrupt): move on to the next one.
+            if not complete:
+                print(f"Discarding corrupt spool segment {segment}")
+            self._commit((later[0], 0), 0)
+
+    def _discardTail(
+        self,
+        segment: int,
+        offset: int,
+        max_records: int,
+        max_bytes: int,
+    ) -> Tuple[List[bytes], Tuple[int, int]]:
+        """
+        Handles a last segment holding no valid record past the cursor although records are pending: its tail is
+        torn or corrupt. Scans it again under the lock, so a record being appended is not mistaken for it, then
+        forgets the pending records, starting over with a new segment.
+
+        Returns:
+            Tuple[List[bytes], Tuple[int, int]]: The records appended meanwhile and the cursor just past them, or
+                no records and the new cursor.
+        """
+
+        with self.__lock:
+            records, end, _ = _scan(
+                self._path(segment), offset, max_records, max_bytes)
+            if records:
+                return records, (segment, end)
+            if self.__pending:
+                print(
+                    f"Discarding {self.__pending} unreadable records from spool segment {segment}")
+                self._advance((segment, end), self.__pending)
+            return [], self.__cursor
+
+    def _commit(self, cursor: Tuple[int, int], count: int) -> None:
+        """
+        Moves the cursor past delivered records and deletes fully delivered segments.
+        """
+
+        with self.__lock:
+            self._advance(cursor, count)
+
+    def _advance(self, cursor: Tuple[int, int], count: int) -> None:
+        """
+        Moves the cursor past delivered records and deletes fully delivered segments. Must hold the lock.
+        """
+
+        self.__pending = max(0, self.__pending - count)
+
+        if not self.__pending:
+            # Everything was delivered: start over with an empty segment.
+            if self.__writer is not None:
+                self.__writer.close()
+                self.__writer = None
+            next_segment = self.__segments[-1] + \
+                1 if self.__segments else cursor[0]
+            for segment in self.__segments:
+                self._remove(segment)
+            self.__segments = []
+            cursor = (next_segment, 0)
+        else:
+            for segment in [s for s in self.__segments if s < cursor[0]]:
+                self._remove(segment)
+                self.__segments.remove(segment)
+
+        self.__cursor = cursor
+        self._saveCursor()
+
+    def _remove(self, segment: int) -> None:
+        """
+        Deletes a segment file. Must hold the lock.
+        """
+
+        path = self._path(segment)
+        try:
+            self.__size -= os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _saveCursor(self) -> None:
+        """
+        Atomically persists the cursor. Must hold the lock.
+        """
+
+        path = os.path.join(self.__directory, _CURSOR_FILE)
+        with open(path + ".tmp", "wb") as f:
+            f.write(_CURSOR.pack(*self.__cursor))
+            f.flush()
+            if self.__fsync:
+                os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _recover(self) -> None:
+        """
+        Loads the segments and cursor left on disk, discarding a torn record at the end of the last segment.
+        """
+
+        self.__segments = sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(self.__directory)
+            if name.endswith(_SEGMENT_SUFFIX) and name[:-len(_SEGMENT_SUFFIX)].isdigit()
+        )
+
+        cursor_path = os.path.join(self.__directory, _CURSOR_FILE)
+        try:
+            with open(cursor_path, "rb") as f:
+                self.__cursor = _CURSOR.unpack(f.read(_CURSOR.size))
+        except (OSError, struct.error):
+            self.__cursor = (self.__segments[0] if self.__segments else 0, 0)
+
+        for segment in [s for s in self.__segments if s < self.__cursor[0]]:
+            os.remove(self._path(segment))
+            self.__segments.remove(segment)
+
+        if self.__segments and self.__segments[0] > self.__cursor[0]:
+            self.__cursor = (self.__segments[0], 0)
+
+        for segment in self.__segments:
+            path = self._path(segment)
+            offset = self.__cursor[1] if segment == self.__cursor[0] else 0
+            records, end, complete = _scan(path, offset)
+            self.__pending += len(records)
+            if not complete and segment == self.__segments[-1]:
+                os.truncate(path, end)
+            self.__size += os.path.getsize(path)
+
+
+def _scan(
+    path: str,
+    offset: int,
+    max_records: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Tuple[List[bytes], int, bool]:
+    """
+    Reads consecutive valid records from a memory-mapped segment file.
+
+    Args:
+        path (str): The segment file.
+        offset (int): Where to start reading.
+        max_records (Optional[int]): Maximum number of records to read. Defaults to None (no limit).
+        max_bytes (Optional[int]): Maximum total payload size to read, unless a single record is larger. Defaults to None.
+
+    Returns:
+        Tuple[List[bytes], int, bool]: The records, the offset just past them, and False if reading
+            stopped at a torn or corrupt record.
+    """
+
+    records: List[bytes] = []
+    size = 0
+
+    try:
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            if length <= offset:
+                return records, offset, True
+            with mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ) as view:
+                while offset < length:
+                    if max_records is not None and len(records) >= max_records:
+                        break
+                    if offset + _HEADER.size > length:
+                        return records, offset, False
+
+                    payload_length, crc = _HEADER.unpack_from(view, offset)
+                    start = offset + _HEADER.size
+                    if start + payload_length > length:
+                        return records, offset, False
+
+                    if max_bytes is not None and records and size + payload_length > max_bytes:
+                        break
+
+                    payload = view[start:start + payload_length]
+                    if zlib.crc32(payload) != crc:
+                        return records, offset, False
+
+                    records.append(payload)
+                    size += payload_length
+                    offset = start + payload_length
+    except OSError:
+        return records, offset, False
+
+    return records, offset, True
@@ -0,0 +1,262 @@
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from pydantic_core import to_json
+
+from lumberjack.models import OMITTED_WHEN_UNSET, Log
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+Encoder = Callable[[Log], bytes]
+"""
+Serializes a log straight into request body bytes.
+"""
+
+
+class BatchFormat(str, Enum):
+    """
+    How several serialized logs are combined into one request body.
+    """
+
+    JSON = "json"
+    """
+    A JSON array of logs.
+    """
+
+    NDJSON = "ndjson"
+    """
+    Newline-delimited JSON, one log per line.
+    """
+
+    COLUMNAR = "columnar"
+    """
+    A JSON object with one array per field and a per-batch table of the strings the logs share,
+    built by `encodeColumnar`.
+    """
+
+    @property
+    def content_type(self) -> str:
+        """
+        The content type of a request body in this format.
+        """
+        return _CONTENT_TYPES[self]
+
+
+_CONTENT_TYPES = {
+    BatchFormat.JSON: "application/json",
+    BatchFormat.NDJSON: "application/x-ndjson",
+    BatchFormat.COLUMNAR: "application/vnd.lumberjack.columnar+json",
+}
+"""
+The content type of each batch format.
+"""
+
+
+def encodePydantic(log: Log) -> bytes:
+    """
+    Serializes a log with pydantic's compiled serializer.
+
+    Args:
+        log (Log): The log to serialize.
+
+    Returns:
+        bytes: The JSON representation of the log.
+    """
+
+    return to_json(log)
+
+
+def _fields(log: Log) -> dict:
+    # Like the pydantic serializer, leave out the fields that most logs do not have.
+    fields = log.__dict__.copy()
+    for name in OMITTED_WHEN_UNSET:
+        if fields[name] is None:
+            del fields[name]
+    return fields
+
+
+def _orjsonDefault(value: object) -> list:
+    # orjson rejects tuple subclasses such as StackFrame, which every other encoder writes as arrays.
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encodeOrjson(log: Log) -> bytes:
+    """
+    Serializes a log with orjson.
+
+    Args:
+        log (Log): The log to serialize.
+
+    Returns:
+        bytes: The JSON representation of the log.
+    """
+
+    return orjson.dumps(_fields(log), default=_orjsonDefault)
+
+
+def _default(value: object) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encodeStdlib(log: Log) -> bytes:
+    """
+    Serializes a log with the standard library json module.
+
+    Args:
+        log (Log): The log to serialize.
+
+    Returns:
+        bytes: The JSON representation of the log.
+    """
+
+    return json.dumps(_fields(log), default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+ENCODERS = {
+    "orjson": encodeOrjson,
+    "pydantic": encodePydantic,
+    "json": encodeStdlib,
+}
+"""
+The built-in encoders by name.
+"""
+
+
+def getEncoder(encoder: Optional[str | Encoder] = None) -> Encoder:
+    """
+    Resolves an encoder by name, or picks the fastest one available.
+
+    Args:
+        encoder (Optional[str | Encoder]): An encoder, the name of a built-in encoder ("orjson", "pydantic"
+            or "json"), or None to use orjson if it is installed and pydantic's serializer otherwise.
+
+    Returns:
+        Encoder: The resolved encoder.
+    """
+
+    if encoder is None:
+        return encodeOrjson if orjson is not None else encodePydantic
+
+    if callable(encoder):
+        return encoder
+
+    if encoder not in ENCODERS:
+        raise ValueError(
+            f"Unknown encoder '{encoder}', expected one of {tuple(ENCODERS)}.")
+    if encoder == "orjson" and orjson is None:
+        raise ValueError("The orjson encoder requires the orjson package.")
+    return ENCODERS[encoder]
+
+
+def encodeBatch(payloads: List[bytes], batch_format: BatchFormat = BatchFormat.JSON) -> bytes:
+    """
+    Combines serialized logs into one request body without re-encoding them.
+
+    Args:
+        payloads (List[bytes]): The serialized logs.
+        batch_format (BatchFormat): How to combine them, JSON or NDJSON. Columnar batches are built from the
+            logs themselves by `encodeColumnar`. Defaults to BatchFormat.JSON.
+
+    Returns:
+        bytes: The request body.
+    """
+
+    if batch_format == BatchFormat.COLUMNAR:
+        raise ValueError("Columnar batches are encoded with encodeColumnar.")
+    if batch_format == BatchFormat.NDJSON:
+        return b"\n".join(payloads) + b"\n"
+    return b"[" + b",".join(payloads) + b"]"
+
+
+def splitBatch(payloads: Sequence[bytes], max_bytes: int) -> List[List[bytes]]:
+    """
+    Splits serialized logs into consecutive batches whose JSON or NDJSON request body is at most `max_bytes`.
+
+    Args:
+        payloads (Sequence[bytes]): The serialized logs.
+        max_bytes (int): Maximum size of a request body. A log larger than this on its own gets a batch of its own.
+
+    Returns:
+        List[List[bytes]]: The batches, in order.
+    """
+
+    batches: List[List[bytes]] = []
+    batch: List[bytes] = []
+    # A JSON array takes one byte per log for its separators plus one for its brackets; NDJSON takes less.
+    size = 1
+    for payload in payloads:
+        if batch and size + len(payload) + 1 > max_bytes:
+            batches.append(batch)
+            batch, size = [], 1
+        batch.append(payload)
+        size += len(payload) + 1
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class ChunkedBody:
+    """
+    A JSON or NDJSON request body produced in chunks of about `chunk_size` bytes from the serialized logs, so
+    it is streamed with chunked transfer encoding instead of being joined into one bytes object.
+
+    It can be iterated several times, e.g. to send it again on retry.
+    """
+
+    def __init__(self, payloads: Sequence[bytes], batch_format: BatchFormat = BatchFormat.JSON, chunk_size: int = 64 * 1024) -> None:
+        """
+        Initializes the body.
+
+        Args:
+            payloads (Sequence[bytes]): The serialized logs.
+            batch_format (BatchFormat): How to combine them, JSON or NDJSON. Defaults to BatchFormat.JSON.
+            chunk_size (int): The size above which pending bytes are emitted as a chunk. Defaults to 64 KiB.
+        """
+
+        if batch_format == BatchFormat.COLUMNAR:
+            raise ValueError(
+                "Columnar batches are encoded with encodeColumnar.")
+        self.payloads = payloads
+        self.batch_format = batch_format
+        self.chunk_size = max(1, chunk_size)
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the whole body in bytes.
+        """
+
+        size = sum(len(payload)
+                   for payload in self.payloads) + len(self.payloads)
+        return size if self.batch_format == BatchFormat.NDJSON else size + 1
+
+    def __iter__(self) -> Iterator[bytes]:
+        ndjson = self.batch_format == BatchFormat.NDJSON
+        pending: List[bytes] = [] if ndjson else [b"["]
+        pending_size = len(pending)
+        for i, payload in enumerate(self.payloads):
+            if ndjson:
+                pending += (payload, b"\n")
+            elif i:
+                pending += (b",", payload)
+            else:
+                pending.append(payload)
+            pending_size += len(payload) + 1
+            if pending_size >= self.chunk_size:
+                yield b"".join(pending)
+                pending, pending_size = [], 0
+        if not ndjson:
+            pending.append(b"]")
+        if pending:
+            yield b"".join(pending)
@@ -0,0 +1,133 @@
+import threading
+from typing import Optional
+
+TRUNCATION_MARKER = "…[truncated {} bytes]…"
+"""
+Replaces the part of a field cut to fit its limit, with the number of bytes cut.
+"""
+
+
+def truncateText(text: str, max_bytes: int, keep_tail: bool = False) -> str:
+    """
+    Cuts a string so its UTF-8 encoding fits a byte limit, marking where and how much was cut.
+
+    Args:
+        text (str): The string.
+        max_bytes (int): Maximum size of the result in UTF-8 bytes, marker included. A limit too small to hold
+            the marker cuts the string without one.
+        keep_tail (bool): Whether to keep the end of the string too, cutting its middle instead of its end,
+            e.g. for a stack trace whose last line holds the exception. Defaults to False.
+
+    Returns:
+        str: The string itself if it fits, the cut string otherwise.
+    """
+
+    # A character takes at most 4 bytes in UTF-8, so short strings fit without being encoded.
+    if len(text) * 4 <= max_bytes:
+        return text
+    data = text.encode("utf-8", "surrogatepass")
+    if len(data) <= max_bytes:
+        return text
+
+    marker = TRUNCATION_MARKER.format(len(data))
+    if len(marker.encode()) > max_bytes:
+        return data[:max(0, max_bytes)].decode("utf-8", "ignore")
+
+    budget = max_bytes - len(marker.encode())
+    if not keep_tail:
+        head = data[:budget].decode("utf-8", "ignore")
+        return head + TRUNCATION_MARKER.format(len(data) - len(head.encode("utf-8", "surrogatepass")))
+
+    head = data[:budget // 2].decode("utf-8", "ignore")
+    tail = data[len(data) - (budget - budget // 2):].decode("utf-8", "ignore")
+    kept = len(head.encode("utf-8", "surrogatepass")) + \
+        len(tail.encode("utf-8", "surrogatepass"))
+    return head + TRUNCATION_MARKER.format(len(data) - kept) + tail
+
+
+class FieldLimits:
+    """
+    Byte limits on the free-text fields of a log, applied when it is built, so a single huge message, stack
+    trace or source file cannot make a log megabytes large.
+
+    A field over its limit is cut, and the cut part is replaced by a marker holding the number of bytes cut.
+    Messages and source code keep their beginning; stack traces keep their beginning and their end, where
+    the exception is.
+    """
+
+    def __init__(
+        self,
+        message: Optional[int] = 32 * 1024,
+        stack_trace: Optional[int] = 64 * 1024,
+        code: Optional[int] = 256 * 1024,
+    ) -> None:
+        """
+        Initializes the limits.
+
+        Args:
+            message (Optional[int]): Maximum size of `logMessage` in UTF-8 bytes. None for no limit.
+                Defaults to 32 KiB.
+            stack_trace (Optional[int]): Maximum size of `stackTrace` in UTF-8 bytes. None for no limit.
+                Defaults to 64 KiB.
+            code (Optional[int]): Maximum size of `code` in UTF-8 bytes. None for no limit. Defaults to 256 KiB.
+        """
+
+        self.message = message
+        self.stack_trace = stack_trace
+        self.code = code
+        self.__lock = threading.Lock()
+        self.__truncated = 0
+
+    @property
+    def truncated(self) -> int:
+        """
+        The number of fields cut so far.
+        """
+        return self.__truncated
+
+    def limitMessage(self, message: str) -> str:
+        """
+        Cuts a message to its limit.
+        """
+
+        if self.message is None:
+            return message
+        return self._count(message, truncateText(message, self.message))
+
+    def limitStackTrace(self, stack_trace: Optional[str]) -> Optional[str]:
+        """
+        Cuts a stack trace to its limit, keeping its beginning and its end.
+        """
+
+        if stack_trace is None or self.stack_trace is None:
+            return stack_trace
+        return self._count(stack_trace, truncateText(stack_trace, self.stack_trace, keep_tail=True))
+
+    def limitCode(self, code: Optional[str]) -> Optional[str]:
+        """
+        Cuts source code to its limit.
+        """
+
+        if code is None or self.code is None:
+            return code
+        return self._count(code, truncateText(code, self.code))
+
+    def reset(self) -> None:
+        """
+        Replaces the lock, e.g. in a forked child, where a thread of the parent may have held it.
+        """
+
+        self.__lock = threading.Lock()
+
+    def _count(self, text: str, limited: str) -> str:
+        """
+        Counts a field if it was cut.
+
+        Returns:
+            str: The field as limited.
+        """
+
+        if limited is not text:
+            with self.__lock:
+                self.__truncated += 1
+        return limited
@@ -1,4 +1,255 @@
-from typing import Optional
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class CodeCapture(str, Enum):
+    """
+    How much of the source file is captured in the `code` field of a log.
+    """
+
+    FULL = "full"
+    """
+    The whole source file.
+    """
+
+    WINDOW = "window"
+    """
+    Only the lines around the line where the logger was invoked.
+    """
+
+    HASH = "hash"
+    """
+    Only the content hash of the source file. Each distinct file body is uploaded once per session.
+    """
+
+    NONE = "none"
+    """
+    No source code at all.
+    """
+
+
+class CodeSnippet(NamedTuple):
+    """
+    A piece of captured source code.
+    """
+
+    code: str
+    """
+    The captured source code.
+    """
+
+    start_line: int
+    """
+    The line number of the first line of `code` in its file.
+    """
+
+
+class _SourceFile:
+    """
+    A cached source file.
+    """
+
+    __slots__ = ("key", "text", "lines", "digest", "size")
+
+    def __init__(self, key: Tuple[str, int, int], text: str) -> None:
+        self.key = key
+        self.text = text
+        self.lines: Optional[List[str]] = None
+        self.digest: Optional[str] = None
+        self.size = key[2]
+
+
+def hashSource(code: str) -> str:
+    """
+    Computes the content hash identifying a source file body on the wire.
+
+    Args:
+        code (str): The source code.
+
+    Returns:
+        str: The hex-encoded SHA-256 of the UTF-8 encoded code.
+    """
+
+    return hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class SourceCache:
+    """
+    A thread-safe LRU cache of source files with a bounded memory budget.
+
+    Entries are keyed by path, modification time and size, so an edited file is re-read. Files are measured by
+    their size on disk, counted once more when they are split into lines for window captures. A file larger
+    than the whole budget is never read: it is reported as unreadable from its size alone.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): Maximum size in bytes of the files held across the cache. Defaults to 16 MiB.
+        """
+
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__size = 0
+        self.__files: "OrderedDict[str, _SourceFile]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """
+        The size in bytes of the files currently held by the cache.
+        """
+        return self.__size
+
+    def read(self, filepath: str, lineno: Optional[int] = None, context_lines: Optional[int] = None) -> Optional[CodeSnippet]:
+        """
+        Reads a source file, or the lines around `lineno` when `context_lines` is given.
+
+        Args:
+            filepath (str): The path of the file to read.
+            lineno (Optional[int]): The line to centre the window on. Defaults to None.
+            context_lines (Optional[int]): Number of lines kept on each side of `lineno`. Defaults to None (whole file).
+
+        Returns:
+            Optional[CodeSnippet]: The captured code, or None if the file cannot be read or is larger than the
+                cache budget.
+        """
+
+        file = self._load(filepath)
+        if file is None:
+            return None
+
+        if context_lines is None or lineno is None:
+            return CodeSnippet(file.text, 1)
+
+        lines = file.lines
+        if lines is None:
+            lines = file.text.splitlines(keepends=True)
+            with self.__lock:
+                if file.lines is None and self.__files.get(filepath) is file:
+                    file.lines = lines
+                    file.size += file.key[2]
+                    self.__size += file.key[2]
+                    self._evict()
+
+        start = max(0, lineno - 1 - context_lines)
+        return CodeSnippet("".join(lines[start:lineno + context_lines]), start + 1)
+
+    def digest(self, filepath: str) -> Optional[str]:
+        """
+        Returns the content hash of a source file, computed once per version of the file.
+
+        Args:
+            filepath (str): The path of the file to hash.
+
+        Returns:
+            Optional[str]: The hash as computed by `hashSource`, or None if the file cannot be read.
+        """
+
+        file = self._load(filepath)
+        if file is None:
+            return None
+        if file.digest is None:
+            file.digest = hashSource(file.text)
+        return file.digest
+
+    def clear(self) -> None:
+        """
+        Removes every cached file and resets the hit and miss counters.
+        """
+
+        with self.__lock:
+            self.__files.clear()
+            self.__size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def reset(self) -> None:
+        """
+        Replaces the lock, e.g. in a forked child, where a thread of the parent may have held it. The cached files
+        are kept.
+        """
+
+        self.__lock = threading.Lock()
+
+    def _load(self, filepath: str) -> Optional[_SourceFile]:
+        """
+        Returns the cached file, reading it from disk if it is missing or out of date.
+
+        Args:
+            filepath (str): The path of the file.
+
+        Returns:
+            Optional[_SourceFile]: The file, or None if it cannot be read or is larger than the cache budget.
+        """
+
+        try:
+            stat = os.stat(filepath)
+        except (OSError, ValueError):
+            return None
+
+        if stat.st_size > self.max_bytes:
+            return None
+
+        key = (filepath, stat.st_mtime_ns, stat.st_size)
+
+        with self.__lock:
+            file = self.__files.get(filepath)
+            if file is not None and file.key == key:
+                self.__files.move_to_end(filepath)
+                self.hits += 1
+            else:
+                file = None
+                self.misses += 1
+
+        if file is None:
+            try:
+                with open(filepath, 'r') as f:
+                    file = _SourceFile(key, f.read())
+            except:
+                return None
+            self._store(filepath, file)
+
+        return file
+
+    def _store(self, filepath: str, file: _SourceFile) -> None:
+        """
+        Adds a file to the cache, evicting the least recently used files to stay within budget.
+
+        Args:
+            filepath (str): The path of the file.
+            file (_SourceFile): The file read from disk.
+        """
+
+        with self.__lock:
+            previous = self.__files.pop(filepath, None)
+            if previous is not None:
+                self.__size -= previous.size
+            self.__files[filepath] = file
+            self.__size += file.size
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Evicts the least recently used files until the cache is within budget. Must hold the lock.
+        """
+
+        while self.__size > self.max_bytes and self.__files:
+            _, evicted = self.__files.popitem(last=False)
+            self.__size -= evicted.size
+
+
+source_cache = SourceCache()
+"""
+The process-wide cache used by `getCode`.
+"""
 
 
 def getCode(filepath: str) -> Optional[str]:
@@ -15,9 +266,49 @@ def getCode(filepath: str) -> Optional[str]:
     if not filepath:
         return None
 
-    try:
-        with open(filepath, 'r') as f:
-            code: str = f.read()
-            return code
-    except:
+    snippet = source_cache.read(filepath)
+    return snippet.code if snippet else None
+
+
+def getCodeHash(filepath: str) -> Optional[str]:
+    """
+    Computes the content hash of the file at the provided filepath.
+
+    Args:
+        filepath (str): The path of the file to hash.
+
+    Returns:
+        Optional[str]: The hash of the file, or None if it cannot be read.
+    """
+
+    if not filepath:
+        return None
+
+    return source_cache.digest(filepath)
+
+
+def getCodeSnippet(
+    filepath: str,
+    lineno: Optional[int] = None,
+    capture: CodeCapture = CodeCapture.FULL,
+    context_lines: int = 10,
+) -> Optional[CodeSnippet]:
+    """
+    Captures the code from the provided filepath according to a capture mode.
+
+    Args:
+        filepath (str): The path of the file to read.
+        lineno (Optional[int]): The line where the logger was invoked. Defaults to None.
+        capture (CodeCapture): How much of the file to capture. Defaults to CodeCapture.FULL.
+        context_lines (int): Number of lines kept on each side of `lineno` in window mode. Defaults to 10.
+
+    Returns:
+        Optional[CodeSnippet]: The captured code, or None if nothing was captured.
+    """
+
+    if not filepath or capture in (CodeCapture.NONE, CodeCapture.HASH):
         return None
+
+    if capture == CodeCapture.WINDOW:
+        return source_cache.read(filepath, lineno, max(0, context_lines))
+    return source_cache.read(filepath)
@@ -0,0 +1,34 @@
+import importlib
+import sys
+from typing import Any, Callable, List, Mapping, Tuple
+
+
+def lazyExports(package: str, exports: Mapping[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds the module `__getattr__` and `__dir__` (PEP 562) of a package whose names are imported on first use.
+
+    Importing a package then only costs its own `__init__`; the module defining a name, and whatever it
+    imports, is loaded the first time the name is looked up, e.g. by `from package import Name`. The value
+    is then stored on the package, so later lookups are plain attribute reads.
+
+    Args:
+        package (str): The name of the package, usually `__name__`.
+        exports (Mapping[str, str]): The module defining each exported name.
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: The `__getattr__` and `__dir__` of the package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,287 @@
+import queue
+import threading
+import time
+from collections import deque
+from enum import Enum
+from itertools import count
+from typing import Deque, Dict, Optional, Tuple
+
+
+class BackpressurePolicy(str, Enum):
+    """
+    What happens to a log that arrives while the buffer is full.
+    """
+
+    BLOCK = "block"
+    """
+    The caller waits up to a timeout for room, then the log is dropped.
+    """
+
+    DROP_NEWEST = "drop_newest"
+    """
+    The arriving log is dropped.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    """
+    The oldest logs waiting are dropped to make room.
+    """
+
+    DROP_LOWEST_LEVEL = "drop_lowest_level"
+    """
+    The oldest logs of the lowest level waiting are dropped to make room, if that level is below the level of the
+    arriving log; otherwise the arriving log is dropped. A flood of DEBUG logs therefore never pushes out an ERROR.
+    """
+
+
+_CONTROL = float("inf")
+"""
+The level under which control items are kept. They are never dropped and do not count towards the limits.
+"""
+
+_Entry = Tuple[int, object, int]
+
+
+class LogBuffer:
+    """
+    A bounded first-in first-out buffer of logs, limited both in number of logs and in bytes, which applies a
+    backpressure policy when full.
+
+    Logs are kept in one queue per level, each entry tagged with an arrival sequence number, so the oldest log of
+    any level can be found or dropped in constant time for the handful of levels in use, and `get` still returns
+    the items in arrival order across levels.
+    """
+
+    def __init__(
+        self,
+        max_records: int = 10000,
+        max_bytes: Optional[int] = None,
+        policy: BackpressurePolicy | str = BackpressurePolicy.DROP_NEWEST,
+        block_timeout: Optional[float] = 1.0,
+    ) -> None:
+        """
+        Initializes the buffer.
+
+        Args:
+            max_records (int): Maximum number of logs held. Defaults to 10000.
+            max_bytes (Optional[int]): Maximum total size of the logs held. A log larger than this on its own is
+                only accepted into an empty buffer. Defaults to None (no byte limit).
+            policy (BackpressurePolicy | str): What happens when the buffer is full: "block", "drop_newest",
+                "drop_oldest" or "drop_lowest_level". Defaults to "drop_newest".
+            block_timeout (Optional[float]): Maximum seconds a caller waits for room with the "block" policy.
+                None waits forever. Defaults to 1.0.
+        """
+
+        self.__max_records = max(1, max_records)
+        self.__max_bytes = max_bytes
+        self.__policy = BackpressurePolicy(policy)
+        self.__block_timeout = block_timeout
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        self.__levels: Dict[float, Deque[_Entry]] = {}
+        self.__level_bytes: Dict[float, int] = {}
+        self.__sequence = count()
+        self.__records = 0
+        self.__bytes = 0
+        self.__dropped: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """
+        The number of logs held.
+        """
+        return self.__records
+
+    @property
+    def bytes(self) -> int:
+        """
+        The total size of the logs held.
+        """
+        return self.__bytes
+
+    @property
+    def dropped(self) -> int:
+        """
+        The number of logs dropped.
+        """
+        with self.__lock:
+            return sum(self.__dropped.values())
+
+    @property
+    def dropped_by_level(self) -> Dict[int, int]:
+        """
+        The number of logs dropped, by level.
+        """
+        with self.__lock:
+            return dict(self.__dropped)
+
+    def put(self, item: object, level: int, size: int = 0, block: bool = True) -> bool:
+        """
+        Adds a log, applying the backpressure policy if the buffer is full.
+
+        Args:
+            item (object): The log.
+            level (int): Its level.
+            size (int): Its size in bytes. Defaults to 0.
+            block (bool): Whether the "block" policy may wait. When False, a full buffer drops the log instead,
+                e.g. for logs emitted by the thread draining the buffer. Defaults to True.
+
+        Returns:
+            bool: True if the log was added, False if it was dropped.
+        """
+
+        with self.__lock:
+            if not self._fits(size):
+                if self.__policy == BackpressurePolicy.BLOCK and block:
+                    if not self._waitForRoom(size):
+                        return self._drop(level)
+                elif self.__policy == BackpressurePolicy.DROP_OLDEST:
+                    while not self._fits(size):
+                        self._dropOldest(self._oldestLevel())
+                elif self.__policy == BackpressurePolicy.DROP_LOWEST_LEVEL:
+                    if not self._dropBelow(level, size):
+                        return self._drop(level)
+                else:
+                    return self._drop(level)
+
+            self._append(level, (next(self.__sequence), item, size))
+            self.__records += 1
+            self.__bytes += size
+            return True
+
+    def putControl(self, item: object) -> None:
+        """
+        Adds an item that is returned in order with the logs but is never dropped and never waits, such as a
+        request to flush.
+
+        Args:
+            item (object): The item.
+        """
+
+        with self.__lock:
+            self._append(_CONTROL, (next(self.__sequence), item, 0))
+
+    def get(self, timeout: Optional[float] = None) -> object:
+        """
+        Removes and returns the oldest item, waiting for one if the buffer is empty.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait. Defaults to None (wait forever).
+
+        Returns:
+            object: The item.
+
+        Raises:
+            queue.Empty: If no item arrived within the timeout.
+        """
+
+        with self.__lock:
+            if not self.__not_empty.wait_for(self._hasItems, timeout):
+                raise queue.Empty
+
+            level = self._oldestLevel(controls=True)
+            _, item, size = self.__levels[level].popleft()
+            if level != _CONTROL:
+                self.__level_bytes[level] -= size
+                self.__records -= 1
+                self.__bytes -= size
+                self.__not_full.notify()
+            return item
+
+    def _fits(self, size: int) -> bool:
+        """
+        Checks whether a log of a size can be added without going over the limits.
+        """
+
+        if self.__records == 0:
+            return True
+        if self.__records >= self.__max_records:
+            return False
+        return self.__max_bytes is None or self.__bytes + size <= self.__max_bytes
+
+    def _hasItems(self) -> bool:
+        return any(self.__levels.values())
+
+    def _append(self, level: float, entry: _Entry) -> None:
+        """
+        Appends an entry to the queue of its level and wakes up a waiting reader.
+        """
+
+        entries = self.__levels.get(level)
+        if entries is None:
+            entries = self.__levels[level] = deque()
+            self.__level_bytes[level] = 0
+        entries.append(entry)
+        self.__level_bytes[level] += entry[2]
+        self.__not_empty.notify()
+
+    def _oldestLevel(self, controls: bool = False) -> float:
+        """
+        Returns the level whose queue holds the oldest entry.
+
+        Args:
+            controls (bool): Whether control items are considered. Defaults to False.
+        """
+
+        return min((entries[0][0], level) for level, entries in self.__levels.items()
+                   if entries and (controls or level != _CONTROL))[1]
+
+    def _waitForRoom(self, size: int) -> bool:
+        """
+        Waits up to the block timeout for a log of a size to fit.
+        """
+
+        deadline = None if self.__block_timeout is None else time.monotonic() + \
+            self.__block_timeout
+        while not self._fits(size):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self.__not_full.wait(remaining)
+        return True
+
+    def _dropBelow(self, level: int, size: int) -> bool:
+        """
+        Makes room for a log by dropping the oldest logs of the lowest levels below its own, if that is enough.
+
+        Returns:
+            bool: True if the log now fits, False if nothing was dropped because it would not be enough.
+        """
+
+        lower = sorted(entry_level for entry_level, entries in self.__levels.items()
+                       if entries and entry_level < level)
+        records = sum(len(self.__levels[entry_level])
+                      for entry_level in lower)
+        size_below = sum(self.__level_bytes[entry_level]
+                         for entry_level in lower)
+        if records < self.__records and (
+                self.__records - records >= self.__max_records
+                or (self.__max_bytes is not None and self.__bytes - size_below + size > self.__max_bytes)):
+            return False
+
+        for entry_level in lower:
+            while self.__levels[entry_level] and not self._fits(size):
+                self._dropOldest(entry_level)
+        return True
+
+    def _dropOldest(self, level: float) -> None:
+        """
+        Drops the oldest log of a level.
+        """
+
+        _, _, size = self.__levels[level].popleft()
+        self.__level_bytes[level] -= size
+        self.__records -= 1
+        self.__bytes -= size
+        self._drop(int(level))
+
+    def _drop(self, level: int) -> bool:
+        """
+        Counts a dropped log.
+
+        Returns:
+            bool: Always False, for `put` to return.
+        """
+
+        self.__dropped[level] = self.__dropped.get(level, 0) + 1
+        return False
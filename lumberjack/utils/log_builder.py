@@ -1,15 +1,20 @@
-import os
-import traceback
 from datetime import datetime
 from logging import LogRecord
 from typing import Optional
 
-from lumberjack.models import Log
-from lumberjack.utils import getCode
+from lumberjack.models import Log, getProcessContext
+from lumberjack.utils.field_limits import FieldLimits
+from lumberjack.utils.helpers import CodeCapture, getCodeHash, getCodeSnippet
+from lumberjack.utils.stack_traces import getStackTrace
 
 
 def buildLog(
-    record: LogRecord, application_name: Optional[str] = None
+    record: LogRecord,
+    application_name: Optional[str] = None,
+    code_capture: CodeCapture = CodeCapture.FULL,
+    code_context_lines: int = 10,
+    stack_frames: bool = False,
+    field_limits: Optional[FieldLimits] = None,
 ) -> Optional[Log]:
     """
     Builds a Log object from a log record.
@@ -17,30 +22,54 @@ def buildLog(
     Args:
         record (LogRecord): The log record used to build the Log object.
         application_name: The name of the application using the logger. Defaults to None.
+        code_capture (CodeCapture): How much of the source file to capture. Defaults to CodeCapture.FULL.
+        code_context_lines (int): Number of lines kept on each side of the logging call in window mode. Defaults to 10.
+        stack_frames (bool): Whether to add the frames of the logged exception as a structured list. Defaults to False.
+        field_limits (Optional[FieldLimits]): Cuts the message, stack trace and code to their byte limits.
+            Defaults to None (no limits).
 
     Returns:
         Log: The built Log object.
     """
 
     stack_trace: Optional[str] = None
+    frames = None
 
     try:
-        if record.exc_info is not None:
-            stack_trace = traceback.format_exc()
+        trace = getStackTrace(record.exc_info)
+        if trace is not None:
+            stack_trace = trace.text
+            frames = trace.frames if stack_frames else None
+        elif record.exc_text:
+            stack_trace = record.exc_text
+
+        snippet = getCodeSnippet(
+            record.pathname, record.lineno, code_capture, code_context_lines)
+        message = record.getMessage()
+        code = snippet.code if snippet else None
+        if field_limits is not None:
+            message = field_limits.limitMessage(message)
+            stack_trace = field_limits.limitStackTrace(stack_trace)
+            code = field_limits.limitCode(code)
 
         log = Log(
             logLevel=record.levelno,
             logLevelName=record.levelname,
-            logMessage=record.getMessage(),
+            logMessage=message,
             loggerName=record.name,
-            environment=os.environ.get("ENV"),
+            environment=getProcessContext().environment,
             applicationName=application_name,
-            timestamp=datetime.now(),
+            timestamp=datetime.fromtimestamp(record.created),
             stackTrace=stack_trace,
+            stackFrames=frames,
             filename=record.filename,
             filepath=record.pathname,
             lineno=record.lineno,
-            code=getCode(record.pathname),
+            code=code,
+            codeStartLine=snippet.start_line if snippet and code_capture == CodeCapture.WINDOW else None,
+            codeHash=getCodeHash(
+                record.pathname) if code_capture == CodeCapture.HASH else None,
+            occurrences=getattr(record, "occurrences", None),
         )
         return log
     except Exception as e:
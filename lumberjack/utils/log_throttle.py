@@ -0,0 +1,271 @@
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from logging import LogRecord
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+_Site = Tuple[str, str, int]
+"""
+A call site: logger name, file path and line number.
+"""
+
+_Message = Tuple[str, str, int, int, str]
+"""
+A message at a call site: logger name, file path, line number, level and formatted message.
+"""
+
+_SUMMARY_FIELDS = ("name", "levelno", "levelname", "pathname", "filename", "module", "lineno", "funcName",
+                   "created", "msecs", "stack_info")
+"""
+The attributes of a suppressed repeat kept to build its summary. Its exception and rendered traceback are not kept:
+the first occurrence already carried them, so its traceback frames can be freed and formatters do not print it again.
+"""
+
+
+class _Bucket:
+    """
+    The token bucket of one call site.
+    """
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float) -> None:
+        self.tokens = tokens
+        self.updated = updated
+
+
+class _Window:
+    """
+    The dedup window of one message.
+    """
+
+    __slots__ = ("deadline", "suppressed", "last")
+
+    def __init__(self, deadline: float) -> None:
+        self.deadline = deadline
+        self.suppressed = 0
+        self.last: Optional[Dict[str, Any]] = None
+
+
+class LogThrottle:
+    """
+    Decides which log records are shipped, before any log is built from them.
+
+    Records are first sampled by level, then identical messages repeated within the dedup window are
+    collapsed, then each call site (logger, file and line) is held to a token-bucket rate limit.
+    Every check is cheap, so a suppressed record costs almost nothing.
+
+    Collapsed duplicates are not lost: once the window of a message closes, or is forgotten to stay under
+    `max_sites`, one record standing for all its suppressed repeats is returned by `collapsed`, with their number
+    in its `occurrences` attribute. It carries the message and call site of the last repeat, but not its
+    exception or rendered traceback.
+    """
+
+    def __init__(
+        self,
+        rate_limit: Optional[float] = None,
+        burst: int = 10,
+        sample_rates: Optional[Mapping[int | str, float]] = None,
+        dedup_window: Optional[float] = None,
+        max_sites: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+        random: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Initializes the throttle.
+
+        Args:
+            rate_limit (Optional[float]): Maximum sustained records per second from one call site. Defaults to None
+                (no limit).
+            burst (int): Number of records a call site may emit at once before the rate limit applies. Defaults to 10.
+            sample_rates (Optional[Mapping[int | str, float]]): The fraction of records kept per level, e.g.
+                {"DEBUG": 0.01, "INFO": 0.1}. Levels not listed are always kept. Defaults to None.
+            dedup_window (Optional[float]): Seconds during which repeats of a message are collapsed. Defaults to None
+                (no deduplication).
+            max_sites (int): Maximum number of call sites and messages tracked; the least recently seen are
+                forgotten beyond it. Defaults to 10000.
+            clock (Callable[[], float]): Returns the current time in seconds. Defaults to time.monotonic.
+            random (Callable[[], float]): Returns a random number in [0, 1). Defaults to random.random.
+        """
+
+        self.rate_limit = rate_limit
+        self.burst = max(1, burst)
+        self.dedup_window = dedup_window
+        self.max_sites = max(1, max_sites)
+        self.__sample_rates: Dict[int, float] = {
+            _levelNumber(level): rate for level, rate in (sample_rates or {}).items()}
+        self.__clock = clock
+        self.__random = random
+        self.__buckets: "OrderedDict[_Site, _Bucket]" = OrderedDict()
+        self.__windows: "OrderedDict[_Message, _Window]" = OrderedDict()
+        self.__closed: List[LogRecord] = []
+        self.__lock = threading.Lock()
+        self.__sampled_out = 0
+        self.__rate_limited = 0
+        self.__deduplicated = 0
+
+    @property
+    def sampled_out(self) -> int:
+        """
+        The number of records dropped by level sampling.
+        """
+        return self.__sampled_out
+
+    @property
+    def rate_limited(self) -> int:
+        """
+        The number of records dropped because their call site exceeded the rate limit.
+        """
+        return self.__rate_limited
+
+    @property
+    def deduplicated(self) -> int:
+        """
+        The number of duplicate records collapsed into an occurrence count.
+        """
+        return self.__deduplicated
+
+    def admit(self, record: LogRecord) -> bool:
+        """
+        Decides whether a record should be shipped.
+
+        Args:
+            record (LogRecord): The record being emitted.
+
+        Returns:
+            bool: True if the record should be shipped, False if it was suppressed.
+        """
+
+        rate = self.__sample_rates.get(record.levelno)
+        if rate is not None and self.__random() >= rate:
+            self.__sampled_out += 1
+            return False
+
+        if self.dedup_window is None and self.rate_limit is None:
+            return True
+
+        now = self.__clock()
+        with self.__lock:
+            if self.dedup_window is not None and not self._firstOccurrence(record, now):
+                self.__deduplicated += 1
+                return False
+
+            if self.rate_limit is not None and not self._takeToken(record, now):
+                self.__rate_limited += 1
+                return False
+
+        return True
+
+    def collapsed(self, flush: bool = False) -> List[LogRecord]:
+        """
+        Returns one record for every message whose dedup window closed, or was forgotten, with suppressed repeats.
+
+        Each returned record stands for the last suppressed repeat, with the number of suppressed repeats
+        in its `occurrences` attribute.
+
+        Args:
+            flush (bool): Whether to close every window now, e.g. when the handler is closed. Defaults to False.
+
+        Returns:
+            List[LogRecord]: The records standing for the collapsed repeats.
+        """
+
+        if not self.__windows and not self.__closed:
+            return []
+
+        now = self.__clock()
+        with self.__lock:
+            while self.__windows:
+                key, window = next(iter(self.__windows.items()))
+                if not flush and window.deadline > now:
+                    break
+                del self.__windows[key]
+                self._close(window)
+            records, self.__closed = self.__closed, []
+        return records
+
+    def reset(self) -> None:
+        """
+        Replaces the lock and forgets the repeats collapsed so far, e.g. in a forked child, where a thread of the
+        parent may have held the lock and the parent reports those repeats.
+        """
+
+        self.__lock = threading.Lock()
+        self.__windows.clear()
+        self.__closed = []
+
+    def _firstOccurrence(self, record: LogRecord, now: float) -> bool:
+        """
+        Opens a dedup window for a new message, or counts a repeat within its window. Must hold the lock.
+        """
+
+        assert self.dedup_window is not None
+        key = (record.name, record.pathname, record.lineno,
+               record.levelno, record.getMessage())
+
+        window = self.__windows.get(key)
+        if window is not None and window.deadline > now:
+            window.suppressed += 1
+            window.last = {field: getattr(record, field, None)
+                           for field in _SUMMARY_FIELDS}
+            window.last["msg"] = key[4]
+            return False
+
+        # Windows all have the same length, so the dict stays ordered by deadline.
+        if window is not None:
+            del self.__windows[key]
+            self._close(window)
+        if len(self.__windows) >= self.max_sites:
+            self._close(self.__windows.popitem(last=False)[1])
+        self.__windows[key] = _Window(now + self.dedup_window)
+        return True
+
+    def _close(self, window: _Window) -> None:
+        """
+        Keeps the summary of a window being closed or forgotten, if it suppressed repeats, for `collapsed` to return.
+        Must hold the lock.
+        """
+
+        if window.last is not None:
+            summary = logging.makeLogRecord(window.last)
+            summary.occurrences = window.suppressed
+            self.__closed.append(summary)
+
+    def _takeToken(self, record: LogRecord, now: float) -> bool:
+        """
+        Takes a token from the bucket of the record's call site, if one is left. Must hold the lock.
+        """
+
+        assert self.rate_limit is not None
+        key = (record.name, record.pathname, record.lineno)
+
+        bucket = self.__buckets.get(key)
+        if bucket is None:
+            if len(self.__buckets) >= self.max_sites:
+                self.__buckets.popitem(last=False)
+            bucket = self.__buckets[key] = _Bucket(float(self.burst), now)
+        else:
+            self.__buckets.move_to_end(key)
+            bucket.tokens = min(float(self.burst), bucket.tokens +
+                                (now - bucket.updated) * self.rate_limit)
+            bucket.updated = now
+
+        if bucket.tokens < 1.0:
+            return False
+        bucket.tokens -= 1.0
+        return True
+
+
+def _levelNumber(level: int | str) -> int:
+    """
+    Converts a level name to its number.
+    """
+
+    if isinstance(level, int):
+        return level
+    number = logging.getLevelName(level.upper())
+    if not isinstance(number, int):
+        raise ValueError(f"Unknown log level '{level}'.")
+    return number
@@ -0,0 +1,214 @@
+import logging
+import threading
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from logging import LogRecord
+from typing import Any, Deque, Hashable, List, Optional, Tuple
+
+_Ring = Deque[Tuple[LogRecord, int]]
+"""
+The records kept for one scope, oldest first, with their estimated sizes.
+"""
+
+_RECORD_OVERHEAD = 1000
+"""
+The approximate memory held by a log record besides its message.
+"""
+
+
+class RecordBuffer:
+    """
+    Holds the latest low-level records of each scope in memory and only lets them through when something goes
+    wrong, so DEBUG detail is shipped as context for errors without paying for every DEBUG record.
+
+    Records below `buffer_level` are kept raw, without building a log, in a ring of the last `capacity` records
+    of their scope: their logger, or the value of `context`, e.g. a request id. A record at or above
+    `trigger_level` releases the ring of its scope, to be built and shipped with it as one batch. Records in
+    between are let through as usual. Records that age out of a ring, or are evicted to stay under `max_bytes`
+    or `max_scopes`, are never built.
+
+    Like logging's MemoryHandler, a record keeps its arguments and is formatted when it is built, so arguments
+    mutated in between are shipped in their later state.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 100,
+        trigger_level: int = logging.ERROR,
+        buffer_level: int = logging.INFO,
+        max_bytes: int = 1024 * 1024,
+        max_scopes: int = 1000,
+        context: Optional[ContextVar[Any]] = None,
+    ) -> None:
+        """
+        Initializes the buffer.
+
+        Args:
+            capacity (int): Maximum number of records kept per scope. Defaults to 100.
+            trigger_level (int): Records at or above this level release the records kept for their scope.
+                Defaults to ERROR.
+            buffer_level (int): Records below this level are kept instead of being shipped. Defaults to INFO.
+            max_bytes (int): Maximum estimated memory held by the records kept, across scopes; the records of the
+                least recently active scopes are evicted beyond it. Defaults to 1 MiB.
+            max_scopes (int): Maximum number of scopes tracked; the least recently active are evicted beyond it.
+                Defaults to 1000.
+            context (Optional[ContextVar[Any]]): Scopes records by the value of this context variable instead of by
+                logger, e.g. to keep the records of each request apart. Records emitted while it is unset or None
+                are scoped by logger. Defaults to None.
+        """
+
+        self.capacity = max(1, capacity)
+        self.trigger_level = trigger_level
+        self.buffer_level = buffer_level
+        self.max_bytes = max_bytes
+        self.max_scopes = max(1, max_scopes)
+        self.__context = context
+        self.__rings: "OrderedDict[Hashable, _Ring]" = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__bytes = 0
+        self.__held = 0
+        self.__buffered = 0
+        self.__released = 0
+        self.__expired = 0
+
+    def __len__(self) -> int:
+        """
+        The number of records kept.
+        """
+        return self.__held
+
+    @property
+    def buffered(self) -> int:
+        """
+        The number of records kept instead of being shipped.
+        """
+        return self.__buffered
+
+    @property
+    def released(self) -> int:
+        """
+        The number of records kept and then released by a record at or above the trigger level.
+        """
+        return self.__released
+
+    @property
+    def expired(self) -> int:
+        """
+        The number of records kept and then discarded without ever being built.
+        """
+        return self.__expired
+
+    def admit(self, record: LogRecord) -> List[LogRecord]:
+        """
+        Decides which records an emitted record lets through.
+
+        Args:
+            record (LogRecord): The record being emitted.
+
+        Returns:
+            List[LogRecord]: Nothing if the record was kept, the record itself if it is let through as usual, or
+                the records kept for its scope followed by the record if it is at or above the trigger level.
+        """
+
+        level = record.levelno
+        if self.buffer_level <= level < self.trigger_level:
+            return [record]
+
+        scope = self._scope(record)
+        with self.__lock:
+            if level >= self.trigger_level:
+                ring = self.__rings.pop(scope, None)
+                if not ring:
+                    return [record]
+                self._forget(ring)
+                self.__released += len(ring)
+                return [kept for kept, _ in ring] + [record]
+
+            ring = self.__rings.get(scope)
+            if ring is None:
+                ring = self.__rings[scope] = deque()
+            else:
+                self.__rings.move_to_end(scope)
+            if len(ring) >= self.capacity:
+                self._expire(ring)
+
+            size = _RECORD_OVERHEAD + \
+                (len(record.msg) if isinstance(record.msg, str) else 0)
+            ring.append((record, size))
+            self.__bytes += size
+            self.__held += 1
+            self.__buffered += 1
+
+            while len(self.__rings) > self.max_scopes or (self.__bytes > self.max_bytes and self.__held > 1):
+                oldest, ring = next(iter(self.__rings.items()))
+                self._expire(ring)
+                if not ring:
+                    del self.__rings[oldest]
+        return []
+
+    def discard(self) -> None:
+        """
+        Discards the records kept for the current value of the context variable, e.g. at the end of a request
+        that completed without errors.
+        """
+
+        if self.__context is None or self.__context.get(None) is None:
+            return
+
+        with self.__lock:
+            ring = self.__rings.pop(("context", self.__context.get()), None)
+            if ring:
+                self._forget(ring)
+                self.__expired += len(ring)
+
+    def clear(self) -> None:
+        """
+        Discards every record kept.
+        """
+
+        with self.__lock:
+            for ring in self.__rings.values():
+                self.__expired += len(ring)
+            self.__rings.clear()
+            self.__bytes = 0
+            self.__held = 0
+
+    def reset(self) -> None:
+        """
+        Replaces the lock and forgets the records kept, e.g. in a forked child, where a thread of the parent may
+        have held the lock and the parent ships those records.
+        """
+
+        self.__lock = threading.Lock()
+        self.__rings.clear()
+        self.__bytes = 0
+        self.__held = 0
+
+    def _scope(self, record: LogRecord) -> Hashable:
+        """
+        Returns the scope of a record: the value of the context variable if set, its logger otherwise.
+        """
+
+        if self.__context is not None:
+            scope = self.__context.get(None)
+            if scope is not None:
+                return ("context", scope)
+        return ("logger", record.name)
+
+    def _expire(self, ring: _Ring) -> None:
+        """
+        Discards the oldest record of a ring.
+        """
+
+        _, size = ring.popleft()
+        self.__bytes -= size
+        self.__held -= 1
+        self.__expired += 1
+
+    def _forget(self, ring: _Ring) -> None:
+        """
+        Stops accounting for the records of a ring being released.
+        """
+
+        self.__bytes -= sum(size for _, size in ring)
+        self.__held -= len(ring)
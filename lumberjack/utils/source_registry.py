@@ -0,0 +1,183 @@
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from requests import HTTPError, RequestException
+
+from lumberjack.utils.helpers import source_cache
+
+MISSING_SOURCES_HEADER = "Lumberjack-Missing-Sources"
+"""
+The response header listing, comma-separated, the source hashes the endpoint does not know.
+
+The endpoint answers 409 Conflict with this header when a batch refers to sources it has not
+received; the handler then uploads them and sends the batch again.
+"""
+
+
+def sourcesUrl(url: Optional[str]) -> Optional[str]:
+    """
+    Returns the URL the source file bodies are uploaded to for a logging endpoint.
+
+    Args:
+        url (Optional[str]): The URL of the logging endpoint.
+
+    Returns:
+        Optional[str]: The "sources" resource below the logging endpoint, or None without an endpoint.
+    """
+
+    if not url:
+        return None
+    return url.rstrip("/") + "/sources"
+
+
+def missingSources(error: RequestException) -> List[str]:
+    """
+    Reads the source hashes the endpoint asked for from a rejected request.
+
+    Args:
+        error (RequestException): The error raised while posting logs.
+
+    Returns:
+        List[str]: The hashes listed in the 409 response, or an empty list for any other error.
+    """
+
+    if not isinstance(error, HTTPError) or error.response is None or error.response.status_code != 409:
+        return []
+    header = error.response.headers.get(MISSING_SOURCES_HEADER, "")
+    return [digest.strip() for digest in header.split(",") if digest.strip()]
+
+
+class SourceRegistry:
+    """
+    Tracks which source file bodies have been uploaded during this session, to each upload URL.
+
+    Logs captured with CodeCapture.HASH only carry the hash of their source file. Each file is
+    registered when a log refers to it and uploaded once to every upload URL, before the first batch
+    sent to the matching endpoint that refers to it, so an endpoint taking over from another one gets
+    the sources it has not received yet without rejecting a batch first.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty registry.
+        """
+
+        self.__paths: Dict[str, str] = {}
+        self.__uploaded: Dict[str, Set[str]] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        The number of sources registered.
+        """
+        return len(self.__paths)
+
+    def pending(self, url: str) -> int:
+        """
+        Returns the number of sources waiting to be uploaded to a URL.
+
+        Args:
+            url (str): The URL the sources are uploaded to.
+        """
+
+        uploaded = self.__uploaded.get(url)
+        return len(self.__paths) - (len(uploaded) if uploaded is not None else 0)
+
+    def register(self, digest: str, filepath: str) -> None:
+        """
+        Records that a log refers to a source file, queuing its body for upload the first time.
+
+        Args:
+            digest (str): The content hash of the file.
+            filepath (str): The path of the file.
+        """
+
+        if digest in self.__paths:
+            return
+        with self.__lock:
+            if digest not in self.__paths:
+                self.__paths[digest] = filepath
+
+    def markMissing(self, url: str, digests: Iterable[str]) -> int:
+        """
+        Queues sources an endpoint asked for to be uploaded to its URL again.
+
+        Args:
+            url (str): The URL the sources are uploaded to.
+            digests (Iterable[str]): The content hashes requested by the endpoint.
+
+        Returns:
+            int: The number of requested sources known to this registry.
+        """
+
+        with self.__lock:
+            known = [digest for digest in digests if digest in self.__paths]
+            self.__uploaded.get(url, set()).difference_update(known)
+        return len(known)
+
+    def resend(self, url: Optional[str] = None) -> None:
+        """
+        Queues every source registered so far to be uploaded again, e.g. after the endpoint lost its state.
+
+        Args:
+            url (Optional[str]): The URL the sources are uploaded to. Defaults to None (every URL).
+        """
+
+        with self.__lock:
+            if url is None:
+                self.__uploaded.clear()
+            else:
+                self.__uploaded.pop(url, None)
+
+    def reset(self) -> None:
+        """
+        Replaces the lock, e.g. in a forked child, where a thread of the parent may have held it.
+        """
+
+        self.__lock = threading.Lock()
+
+    def encodePending(self, url: str) -> Tuple[List[str], bytes]:
+        """
+        Serializes the sources waiting to be uploaded to a URL.
+
+        Files that cannot be read anymore, or whose content changed since they were registered, are skipped
+        and no longer pending.
+
+        Args:
+            url (str): The URL the sources are uploaded to.
+
+        Returns:
+            Tuple[List[str], bytes]: The hashes of the serialized sources and the request body, a JSON array
+                of objects with "codeHash", "filepath" and "code".
+        """
+
+        with self.__lock:
+            uploaded = self.__uploaded.get(url, set())
+            pending = [(digest, filepath) for digest, filepath in self.__paths.items()
+                       if digest not in uploaded]
+
+        digests: List[str] = []
+        sources: List[Dict[str, str]] = []
+        for digest, filepath in pending:
+            snippet = source_cache.read(filepath)
+            if snippet is None or source_cache.digest(filepath) != digest:
+                self.markUploaded(url, [digest])
+                continue
+            digests.append(digest)
+            sources.append(
+                {"codeHash": digest, "filepath": filepath, "code": snippet.code})
+
+        return digests, json.dumps(sources, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def markUploaded(self, url: str, digests: Iterable[str]) -> None:
+        """
+        Records that sources were delivered to a URL.
+
+        Args:
+            url (str): The URL the sources were uploaded to.
+            digests (Iterable[str]): The content hashes of the delivered sources.
+        """
+
+        with self.__lock:
+            self.__uploaded.setdefault(url, set()).update(digests)
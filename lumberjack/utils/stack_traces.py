@@ -0,0 +1,223 @@
+import builtins
+import threading
+import traceback
+from collections import OrderedDict
+from types import TracebackType
+from typing import Hashable, List, NamedTuple, Optional, Tuple, Type
+
+from lumberjack.models import StackFrame
+
+ExcInfo = Tuple[Optional[Type[BaseException]],
+                Optional[BaseException], Optional[TracebackType]]
+"""
+The exception information of a log record, as returned by `sys.exc_info()`.
+"""
+
+_GROUPS = getattr(builtins, "BaseExceptionGroup", ())
+"""
+The type of exception groups, on versions that have them.
+"""
+
+_CAUSE = "\nThe above exception was the direct cause of the following exception:\n\n"
+_CONTEXT = "\nDuring handling of the above exception, another exception occurred:\n\n"
+
+
+class StackTrace(NamedTuple):
+    """
+    A rendered exception.
+    """
+
+    text: str
+    """
+    The traceback, exactly as `traceback.format_exception` renders it.
+    """
+
+    frames: List[StackFrame]
+    """
+    The frames of the exception, innermost last.
+    """
+
+
+def _frames(tb: Optional[TracebackType]) -> Tuple[StackFrame, ...]:
+    """
+    Lists the location of every frame of a traceback without reading any source.
+    """
+
+    frames = []
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        frames.append(StackFrame(code.co_filename, tb.tb_lineno, code.co_name))
+        tb = tb.tb_next
+    return tuple(frames)
+
+
+def _chain(value: BaseException) -> List[Tuple[BaseException, Optional[str]]]:
+    """
+    Lists an exception and the exceptions it was chained to, in the order they are printed, each with
+    the message printed after it.
+    """
+
+    chain: List[Tuple[BaseException, Optional[str]]] = []
+    seen = set()
+    link: Optional[str] = None
+    current: Optional[BaseException] = value
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        chain.append((current, link))
+        if current.__cause__ is not None:
+            current, link = current.__cause__, _CAUSE
+        elif current.__context__ is not None and not current.__suppress_context__:
+            current, link = current.__context__, _CONTEXT
+        else:
+            current = None
+    chain.reverse()
+    return chain
+
+
+class TracebackCache:
+    """
+    A thread-safe LRU cache of rendered tracebacks.
+
+    Entries are keyed by a fingerprint of the exception types and frame locations, so an exception raised
+    over and over from the same place has its stack rendered once. Only the final "Type: message" lines,
+    which differ between occurrences, are formatted every time.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of distinct stacks kept. Defaults to 1024.
+        """
+
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.__stacks: "OrderedDict[Hashable, Tuple[str, ...]]" = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__stacks)
+
+    def format(self, exc_info: ExcInfo) -> Optional[StackTrace]:
+        """
+        Renders the exception of a log record.
+
+        Args:
+            exc_info (ExcInfo): The exception information of the record.
+
+        Returns:
+            Optional[StackTrace]: The rendered exception, or None if the record carries no exception.
+        """
+
+        value = exc_info[1]
+        if value is None:
+            return None
+
+        frames = _frames(exc_info[2])
+        if isinstance(value, _GROUPS) or exc_info[2] is not value.__traceback__:
+            # Groups print nested tracebacks, and a replaced traceback breaks the chain walk: render in full.
+            return StackTrace("".join(traceback.format_exception(*exc_info)), list(frames))
+
+        chain = _chain(value)
+        fingerprint = tuple(
+            (type(exception), link, frames if exception is value else _frames(
+                exception.__traceback__))
+            for exception, link in chain)
+
+        with self.__lock:
+            stacks = self.__stacks.get(fingerprint)
+            if stacks is not None:
+                self.__stacks.move_to_end(fingerprint)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if stacks is None:
+            stacks = tuple(_formatStack(exception.__traceback__)
+                           for exception, _ in chain)
+            with self.__lock:
+                self.__stacks[fingerprint] = stacks
+                while len(self.__stacks) > self.max_entries:
+                    self.__stacks.popitem(last=False)
+
+        parts: List[str] = []
+        for (exception, link), stack in zip(chain, stacks):
+            parts.append(stack)
+            parts.extend(_formatExceptionOnly(exception))
+            if link is not None:
+                parts.append(link)
+        return StackTrace("".join(parts), list(frames))
+
+    def clear(self) -> None:
+        """
+        Removes every cached stack and resets the hit and miss counters.
+        """
+
+        with self.__lock:
+            self.__stacks.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def reset(self) -> None:
+        """
+        Replaces the lock, e.g. in a forked child, where a thread of the parent may have held it. The cached stacks
+        are kept.
+        """
+
+        self.__lock = threading.Lock()
+
+
+def _formatExceptionOnly(exception: BaseException) -> List[str]:
+    """
+    Renders the final "Type: message" line of an exception, like `traceback.format_exception_only` but
+    without building a TracebackException, which walks the whole chain again.
+    """
+
+    if isinstance(exception, SyntaxError) or getattr(exception, "__notes__", None) is not None:
+        return traceback.format_exception_only(type(exception), exception)
+
+    exc_type = type(exception)
+    name = exc_type.__qualname__
+    if exc_type.__module__ not in ("__main__", "builtins"):
+        name = f"{exc_type.__module__}.{name}"
+    try:
+        message = str(exception)
+    except Exception:
+        message = "<exception str() failed>"
+    return [f"{name}: {message}\n" if message else f"{name}\n"]
+
+
+def _formatStack(tb: Optional[TracebackType]) -> str:
+    """
+    Renders the stack part of a traceback, with the source lines and their position markers.
+    """
+
+    if tb is None:
+        return ""
+    summary = traceback.StackSummary.extract(traceback.walk_tb(tb))
+    return "Traceback (most recent call last):\n" + "".join(summary.format())
+
+
+traceback_cache = TracebackCache()
+"""
+The process-wide cache used by `getStackTrace`.
+"""
+
+
+def getStackTrace(exc_info: Optional[ExcInfo]) -> Optional[StackTrace]:
+    """
+    Renders the exception of a log record, reusing the stack of identical earlier exceptions.
+
+    Args:
+        exc_info (Optional[ExcInfo]): The exception information of the record.
+
+    Returns:
+        Optional[StackTrace]: The rendered exception, or None if the record carries no exception.
+    """
+
+    if not exc_info:
+        return None
+
+    return traceback_cache.format(exc_info)
@@ -12,5 +12,13 @@ setup(
         'pydantic',
         'Requests',
         'colorama'
-    ]
+    ],
+    extras_require={
+        'orjson': ['orjson'],
+    },
+    entry_points={
+        'console_scripts': [
+            'lumberjack-ship=lumberjack.files.cli:main',
+        ],
+    }
 )
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import threading
+import unittest
+from logging import INFO, LogRecord
+
+from lumberjack import AsyncLumberjackHandler
+from lumberjack.models.log import Log
+from lumberjack.testing import StubServer
+from lumberjack.utils import CodeCapture, buildLog, decodeColumnar, getEncoder
+
+
+class AsyncLumberjackHandlerTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the AsyncLumberjackHandler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Starts a stub server for each test.
+        """
+
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        """
+        Stops the stub server.
+        """
+
+        self.server.stop()
+
+    def makeRecord(self, message: str) -> LogRecord:
+        return LogRecord(
+            name="test",
+            level=INFO,
+            pathname=__file__,
+            lineno=0,
+            msg=message,
+            args=(),
+            exc_info=None,
+        )
+
+    def messages(self) -> list:
+        return [log["logMessage"] for request in self.server.requests
+                for log in json.loads(request.body)]
+
+    async def test_emit_enqueues_and_aclose_drains(self) -> None:
+        """
+        `emit` should only enqueue, and `aclose` should ship everything pending in one batch.
+        """
+
+        handler = AsyncLumberjackHandler(self.server.url, max_linger=60)
+        for i in range(5):
+            handler.emit(self.makeRecord(str(i)))
+
+        self.assertEqual(self.server.requests, [])
+        await handler.aclose()
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.messages(), [str(i) for i in range(5)])
+        Log(**json.loads(self.server.requests[0].body)[0])
+
+    async def test_batches_and_connection_reuse(self) -> None:
+        """
+        Batches should be flushed at the record limit over a single connection.
+        """
+
+        handler = AsyncLumberjackHandler(
+            self.server.url, max_batch_records=2, max_linger=60)
+        for i in range(5):
+            handler.emit(self.makeRecord(str(i)))
+        await handler.aflush()
+        await handler.aclose()
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_batch_bytes(self) -> None:
+        """
+        Request bodies should stay within `max_batch_bytes`, brackets and separators included.
+        """
+
+        log = buildLog(self.makeRecord("00"), code_capture=CodeCapture.NONE)
+        assert log is not None
+        max_batch_bytes = 3 * len(getEncoder()(log))
+        handler = AsyncLumberjackHandler(
+            self.server.url, max_batch_bytes=max_batch_bytes, max_linger=60, code_capture="none")
+        for i in range(12):
+            handler.emit(self.makeRecord(f"{i:02d}"))
+        await handler.aclose()
+
+        for request in self.server.requests:
+            self.assertLessEqual(len(request.body), max_batch_bytes)
+        self.assertEqual(self.messages(), [f"{i:02d}" for i in range(12)])
+
+    async def test_columnar(self) -> None:
+        """
+        Batches should be sent column by column when requested.
+        """
+
+        handler = AsyncLumberjackHandler(
+            self.server.url, max_batch_records=3, max_linger=60, batch_format="columnar")
+        for i in range(5):
+            handler.emit(self.makeRecord(str(i)))
+        await handler.aclose()
+
+        batches = [decodeColumnar(request.body) for request in self.server.requests]
+        self.assertEqual([len(batch) for batch in batches], [3, 2])
+        self.assertEqual([log["logMessage"] for batch in batches for log in batch], [str(i) for i in range(5)])
+
+    async def test_linger(self) -> None:
+        """
+        A partial batch should be shipped once it has waited `max_linger` seconds.
+        """
+
+        handler = AsyncLumberjackHandler(self.server.url, max_linger=0.05)
+        handler.emit(self.makeRecord("late"))
+
+        for _ in range(100):
+            if self.server.requests:
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(self.messages(), ["late"])
+        await handler.aclose()
+
+    async def test_emit_from_another_thread(self) -> None:
+        """
+        Logs emitted from other threads should be handed over to the loop.
+        """
+
+        handler = AsyncLumberjackHandler(self.server.url, max_linger=60)
+        handler.emit(self.makeRecord("loop"))
+
+        thread = threading.Thread(
+            target=handler.emit, args=(self.makeRecord("thread"),))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        await handler.aclose()
+
+        self.assertEqual(sorted(self.messages()), ["loop", "thread"])
+
+    async def test_endpoint_errors_are_contained(self) -> None:
+        """
+        A failing endpoint should not break the sender task.
+        """
+
+        self.server.status = 500
+        handler = AsyncLumberjackHandler(self.server.url, max_batch_records=1)
+        handler.emit(self.makeRecord("first"))
+        await handler.aflush()
+        self.server.status = 200
+        handler.emit(self.makeRecord("second"))
+        await handler.aclose()
+
+        self.assertEqual(len(self.server.requests), 2)
+
+
+    async def test_content_addressed_sources(self) -> None:
+        """
+        In "hash" mode the source file should be uploaded once, before the first batch referring to it.
+        """
+
+        self.server.require_sources = True
+        handler = AsyncLumberjackHandler(
+            self.server.url, max_batch_records=1, code_capture="hash")
+        handler.emit(self.makeRecord("first"))
+        handler.emit(self.makeRecord("second"))
+        await handler.aclose()
+
+        self.assertEqual([request.path for request in self.server.requests],
+                         ["/sources", "/", "/"])
+        self.assertEqual(len(self.server.sources), 1)
+
+
+class AsyncLumberjackHandlerStartupTests(unittest.TestCase):
+    """
+    Test cases for logs emitted before an event loop is running.
+    """
+
+    def test_emit_before_loop(self) -> None:
+        """
+        Logs emitted before the loop starts should be shipped once it runs.
+        """
+
+        with StubServer() as server:
+            handler = AsyncLumberjackHandler(server.url)
+            handler.emit(LogRecord("test", INFO, __file__, 0, "early", (), None))
+            asyncio.run(handler.aclose())
+
+        self.assertEqual(json.loads(server.requests[0].body)[0]["logMessage"], "early")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from logging import INFO, LogRecord
+from typing import List
+
+from lumberjack.files import BulkShipper, Checkpoint, NdjsonFileHandler
+from lumberjack.files.cli import main
+from lumberjack.testing import StubServer
+from lumberjack.utils import decodeColumnar
+
+
+class BulkShipperTests(unittest.TestCase):
+    """
+    Test cases for the BulkShipper class and the lumberjack-ship command.
+    """
+
+    def setUp(self) -> None:
+        """
+        Writes ten logs to an NDJSON file and starts a stub server.
+        """
+
+        self.directory = tempfile.TemporaryDirectory()
+        handler = NdjsonFileHandler(
+            os.path.join(self.directory.name, "logs"), code_capture="none")
+        for i in range(10):
+            handler.emit(LogRecord("test", INFO, __file__,
+                         1, str(i), (), None))
+        handler.close()
+        assert handler.path is not None
+        self.path = handler.path
+        self.checkpoint_path = os.path.join(
+            self.directory.name, "checkpoint.json")
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        """
+        Stops the stub server and removes the temporary files.
+        """
+
+        self.server.stop()
+        self.directory.cleanup()
+
+    def messages(self) -> List[str]:
+        return [log["logMessage"] for request in self.server.requests for log in json.loads(request.body)]
+
+    def test_ships_in_batches(self) -> None:
+        """
+        Every line should be shipped, in batches of at most `batch_records` logs.
+        """
+
+        shipper = BulkShipper(self.server.url, workers=3, batch_records=3)
+        result = shipper.ship([os.path.dirname(self.path)])
+        shipper.close()
+
+        self.assertFalse(result.failed)
+        self.assertEqual((result.records, result.batches), (10, 4))
+        self.assertEqual(sorted(self.messages(), key=int), [str(i) for i in range(10)])
+        self.assertEqual(sorted(len(json.loads(request.body)) for request in self.server.requests), [1, 3, 3, 3])
+
+    def test_checkpoint_resumes(self) -> None:
+        """
+        A second run should only ship the lines appended since the first one, and leave a partial line alone.
+        """
+
+        checkpoint = Checkpoint(self.checkpoint_path)
+        BulkShipper(self.server.url, checkpoint=checkpoint).ship([self.path])
+
+        with open(self.path, "ab") as f:
+            f.write(b'{"logLevel":20,"logLevelName":"INFO","logMessage":"10"}\n{"logLevel":20')
+
+        self.server.requests.clear()
+        result = BulkShipper(self.server.url, checkpoint=Checkpoint(self.checkpoint_path)).ship([self.path])
+
+        self.assertEqual(result.records, 1)
+        self.assertEqual(self.messages(), ["10"])
+        self.assertEqual(Checkpoint(self.checkpoint_path).offset(self.path), os.path.getsize(self.path) - 14)
+
+    def test_failure_stops_without_losing_logs(self) -> None:
+        """
+        A batch that cannot be delivered should stop the run before the checkpoint moves past it.
+        """
+
+        checkpoint = Checkpoint(self.checkpoint_path)
+        self.server.status = 503
+        with redirect_stdout(io.StringIO()):
+            result = BulkShipper(self.server.url, batch_records=4, checkpoint=checkpoint).ship([self.path])
+
+        self.assertTrue(result.failed)
+        self.assertEqual(result.records, 0)
+        self.assertEqual(checkpoint.offset(self.path), 0)
+
+        self.server.status = 200
+        self.server.requests.clear()
+        result = BulkShipper(self.server.url, batch_records=4, checkpoint=checkpoint).ship([self.path])
+        self.assertFalse(result.failed)
+        self.assertEqual(sorted(self.messages(), key=int), [str(i) for i in range(10)])
+
+    def test_validate(self) -> None:
+        """
+        With validation, lines that are not logs should be skipped and counted.
+        """
+
+        with open(self.path, "ab") as f:
+            f.write(b'{"not":"a log"}\nnot json\n\n')
+
+        result = BulkShipper(self.server.url, validate=True).ship([self.path])
+
+        self.assertEqual((result.records, result.skipped), (10, 2))
+
+    def test_skips_rejected_lines(self) -> None:
+        """
+        Without validation, a corrupt line in the middle of a file should be isolated and skipped, and the rest of the
+        file delivered with the checkpoint at its end.
+        """
+
+        with open(self.path, "rb") as f:
+            lines = f.readlines()
+        with open(self.path, "wb") as f:
+            f.writelines(lines[:5] + [b'{"logMessage": truncated\n'] + lines[5:])
+
+        for batch_format in ("json", "ndjson", "columnar"):
+            with self.subTest(batch_format=batch_format):
+                self.server.stop()
+                self.server = StubServer(validate_json=True).start()
+                checkpoint = Checkpoint()
+                output = io.StringIO()
+                with redirect_stdout(output):
+                    result = BulkShipper(self.server.url, batch_records=4, batch_format=batch_format,
+                                         checkpoint=checkpoint).ship([self.path])
+
+                self.assertFalse(result.failed)
+                self.assertEqual((result.records, result.skipped), (10, 1))
+                self.assertIn("Skipping rejected log", output.getvalue())
+                self.assertEqual(checkpoint.offset(self.path), os.path.getsize(self.path))
+                delivered = [request.body for request in self.server.requests if b"truncated" not in request.body]
+                if batch_format == "columnar":
+                    logs = [log for body in delivered for log in decodeColumnar(body)]
+                elif batch_format == "ndjson":
+                    logs = [json.loads(line) for body in delivered for line in body.splitlines()]
+                else:
+                    logs = [log for body in delivered for log in json.loads(body)]
+                self.assertEqual(sorted((log["logMessage"] for log in logs), key=int), [str(i) for i in range(10)])
+
+    def test_cli(self) -> None:
+        """
+        The command should ship the files in the requested format and exit with status 0.
+        """
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = main([self.server.url, self.path, "--format", "columnar",
+                           "--checkpoint", self.checkpoint_path, "--workers", "2"])
+
+        self.assertEqual(status, 0)
+        self.assertIn("Shipped 10 logs in 1 batches", output.getvalue())
+        logs = decodeColumnar(self.server.requests[0].body)
+        self.assertEqual([log["logMessage"] for log in logs], [str(i) for i in range(10)])
+        self.assertEqual(Checkpoint(self.checkpoint_path).offset(self.path), os.path.getsize(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
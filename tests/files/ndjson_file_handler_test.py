@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+import unittest
+from logging import ERROR, INFO, LogRecord
+from typing import List
+
+from lumberjack.files import NdjsonFileHandler
+from lumberjack.models import Log
+
+
+class NdjsonFileHandlerTests(unittest.TestCase):
+    """
+    Test cases for the NdjsonFileHandler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a temporary directory for the log files.
+        """
+
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        """
+        Removes the temporary directory.
+        """
+
+        self.directory.cleanup()
+
+    def makeRecord(self, message: str, level: int = INFO) -> LogRecord:
+        return LogRecord(
+            name="test",
+            level=level,
+            pathname=__file__,
+            lineno=1,
+            msg=message,
+            args=(),
+            exc_info=None,
+        )
+
+    def files(self) -> List[str]:
+        return sorted(os.path.join(self.directory.name, name) for name in os.listdir(self.directory.name))
+
+    def messages(self, path: str) -> List[str]:
+        with open(path, "rb") as f:
+            return [json.loads(line)["logMessage"] for line in f]
+
+    def test_writes_one_log_per_line(self) -> None:
+        """
+        Every record should be written as one JSON line once the handler is flushed.
+        """
+
+        handler = NdjsonFileHandler(
+            self.directory.name, "app", flush_interval=60)
+        for i in range(3):
+            handler.emit(self.makeRecord(str(i)))
+
+        assert handler.path is not None
+        self.assertEqual(os.path.getsize(handler.path), 0)
+        handler.flush()
+        self.assertEqual(self.messages(handler.path), ["0", "1", "2"])
+
+        with open(handler.path, "rb") as f:
+            log = Log.model_validate_json(f.readline())
+        self.assertEqual(log.applicationName, "app")
+        self.assertIsNotNone(log.code)
+        handler.close()
+
+    def test_errors_are_written_through(self) -> None:
+        """
+        Records at or above the flush level should reach the file at once.
+        """
+
+        handler = NdjsonFileHandler(self.directory.name, flush_interval=60)
+        handler.emit(self.makeRecord("info"))
+        handler.emit(self.makeRecord("error", ERROR))
+
+        assert handler.path is not None
+        self.assertEqual(self.messages(handler.path), ["info", "error"])
+        handler.close()
+
+    def test_size_rotation(self) -> None:
+        """
+        A new file should be started once the current one would exceed `max_bytes`.
+        """
+
+        handler = NdjsonFileHandler(
+            self.directory.name, max_bytes=1, code_capture="none")
+        for i in range(3):
+            handler.emit(self.makeRecord(str(i)))
+        handler.close()
+
+        files = self.files()
+        self.assertEqual(len(files), 3)
+        self.assertEqual([self.messages(path) for path in files], [["0"], ["1"], ["2"]])
+
+    def test_time_rotation_and_backup_count(self) -> None:
+        """
+        A new file should be started once the current one is older than `rotate_interval`, keeping at most
+        `backup_count` files.
+        """
+
+        handler = NdjsonFileHandler(
+            self.directory.name, rotate_interval=0, backup_count=2, code_capture="none")
+        for i in range(4):
+            handler.emit(self.makeRecord(str(i)))
+        handler.close()
+
+        files = self.files()
+        self.assertEqual([self.messages(path) for path in files], [["2"], ["3"]])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork(self) -> None:
+        """
+        Lines buffered before a fork should be written once, by the parent, and the child should write to a file
+        of its own.
+        """
+
+        handler = NdjsonFileHandler(
+            self.directory.name, flush_interval=60, code_capture="none")
+        handler.emit(self.makeRecord("before"))
+        inherited = handler._NdjsonFileHandler__file  # type: ignore[attr-defined]
+
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                handler.emit(self.makeRecord("child"))
+                handler.close()
+                if inherited.closed:
+                    status = 0
+            finally:
+                os._exit(status)
+
+        _, status = os.waitpid(pid, 0)
+        handler.emit(self.makeRecord("parent"))
+        handler.close()
+
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertCountEqual([self.messages(path) for path in self.files()], [["before", "parent"], ["child"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
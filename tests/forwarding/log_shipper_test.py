@@ -0,0 +1,124 @@
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import tempfile
+import unittest
+
+from lumberjack import BatchingOptions, LumberjackFactory
+from lumberjack.forwarding import (MAX_FRAME_SIZE, ForwardingHandler,
+                                   LogShipper, encodeRecord)
+from lumberjack.testing import StubServer
+
+
+def _logFromWorker(address: str, message: str) -> None:
+    handler = ForwardingHandler(address)
+    handler.handle(logging.LogRecord(
+        "worker", logging.INFO, __file__, 1, message, (), None))
+    handler.close()
+
+
+class LogShipperTests(unittest.TestCase):
+    """
+    Test cases for the LogShipper process and the ForwardingHandler.
+    """
+
+    def setUp(self) -> None:
+        """
+        Starts a stub server for each test.
+        """
+
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        """
+        Stops the stub server.
+        """
+
+        self.server.stop()
+
+    def messages(self) -> list:
+        return [log["logMessage"] for request in self.server.requests
+                for log in json.loads(request.body)]
+
+    def test_workers_share_one_shipper(self) -> None:
+        """
+        Records forwarded by several processes should be shipped by the shipper, over one connection.
+        """
+
+        shipper = LumberjackFactory.StartShipper(
+            self.server.url, "app", batching=BatchingOptions(max_linger=60))
+        try:
+            context = multiprocessing.get_context("fork")
+            workers = [context.Process(target=_logFromWorker, args=(shipper.address, f"worker {i}"))
+                       for i in range(3)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join(10)
+            _logFromWorker(shipper.address, "parent")
+        finally:
+            shipper.stop()
+
+        self.assertEqual(sorted(self.messages()),
+                         ["parent", "worker 0", "worker 1", "worker 2"])
+        self.assertEqual(self.server.connections, 1)
+        log = json.loads(self.server.requests[0].body)[0]
+        self.assertEqual(log["applicationName"], "app")
+        self.assertIsNotNone(log["code"])
+        self.assertFalse(shipper.is_alive())
+        self.assertFalse(os.path.exists(shipper.address))
+
+    def test_oversized_frame_drops_connection(self) -> None:
+        """
+        A length prefix above the maximum frame size should close that connection without stopping the shipper.
+        """
+
+        with LogShipper(self.server.url) as shipper:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(10)
+                connection.connect(shipper.address)
+                record = logging.LogRecord("test", logging.INFO, __file__, 1, "before", (), None)
+                connection.sendall(encodeRecord(record) + (MAX_FRAME_SIZE + 1).to_bytes(4, "big") + b"x" * 64)
+                self.assertEqual(connection.recv(1), b"")
+
+            _logFromWorker(shipper.address, "after")
+            self.assertTrue(shipper.is_alive())
+
+        self.assertEqual(sorted(self.messages()), ["after", "before"])
+
+    def test_unreachable_shipper_drops(self) -> None:
+        """
+        Records should be dropped, not raised or buffered, while no shipper is listening.
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            handler = ForwardingHandler(os.path.join(directory, "missing.sock"))
+            for _ in range(2):
+                handler.handle(logging.LogRecord(
+                    "test", logging.INFO, __file__, 1, "lost", (), None))
+            handler.close()
+
+        self.assertEqual(handler.dropped, 2)
+
+    def test_factory_forwarding_handler(self) -> None:
+        """
+        The `forward_to` option should add a ForwardingHandler to the logger.
+        """
+
+        with LogShipper(self.server.url) as shipper:
+            logger = LumberjackFactory.CreateInstance(
+                "forwarded", emit=True, forward_to=shipper.address)
+            handler = logger.handlers.pop()
+            logger.handlers.clear()
+            self.assertIsInstance(handler, ForwardingHandler)
+            handler.handle(logging.LogRecord(
+                "forwarded", logging.INFO, __file__, 1, "hello", (), None))
+            handler.close()
+
+        self.assertEqual(self.messages(), ["hello"])
+
+
+if __name__ == "__main__":
+    unittest.main()
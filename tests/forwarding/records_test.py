@@ -0,0 +1,87 @@
+import logging
+import sys
+import unittest
+
+from lumberjack.forwarding import MAX_FRAME_SIZE, decodeFrames, encodeRecord
+
+
+class RecordsTests(unittest.TestCase):
+    """
+    Test cases for the forwarded record frames.
+    """
+
+    def makeRecord(self, message: str, *args: object) -> logging.LogRecord:
+        return logging.LogRecord("test", logging.WARNING, __file__, 7, message, args, None)
+
+    def test_round_trip(self) -> None:
+        """
+        A decoded record should carry the formatted message and the location of the original.
+        """
+
+        record = self.makeRecord("hello %s", "world")
+        (decoded,) = decodeFrames(bytearray(encodeRecord(record)))
+
+        self.assertEqual(decoded.getMessage(), "hello world")
+        self.assertEqual((decoded.name, decoded.levelno, decoded.levelname),
+                         ("test", logging.WARNING, "WARNING"))
+        self.assertEqual((decoded.pathname, decoded.filename, decoded.lineno),
+                         (__file__, record.filename, 7))
+        self.assertEqual(decoded.created, record.created)
+        self.assertIsNone(decoded.exc_text)
+
+    def test_exception_is_rendered(self) -> None:
+        """
+        The traceback should be rendered in the emitting process and forwarded as text.
+        """
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord(
+                "test", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+
+        (decoded,) = decodeFrames(bytearray(encodeRecord(record)))
+
+        self.assertIn("ValueError: boom", decoded.exc_text)
+
+    def test_partial_frames_stay_buffered(self) -> None:
+        """
+        Frames split across reads should be decoded once complete.
+        """
+
+        data = encodeRecord(self.makeRecord("first")) + \
+            encodeRecord(self.makeRecord("second"))
+        buffer = bytearray(data[:-3])
+
+        first = decodeFrames(buffer)
+        buffer += data[-3:]
+        second = decodeFrames(buffer)
+
+        self.assertEqual([r.getMessage() for r in first], ["first"])
+        self.assertEqual([r.getMessage() for r in second], ["second"])
+        self.assertEqual(buffer, bytearray())
+
+    def test_oversized_frame_is_rejected(self) -> None:
+        """
+        Frames before an oversized length prefix should be decoded, and the prefix should then raise ValueError.
+        """
+
+        header = (MAX_FRAME_SIZE + 1).to_bytes(4, "big")
+        buffer = bytearray(encodeRecord(self.makeRecord("first")) + header)
+
+        self.assertEqual([r.getMessage() for r in decodeFrames(buffer)], ["first"])
+        self.assertEqual(buffer, bytearray(header))
+        with self.assertRaises(ValueError):
+            decodeFrames(buffer)
+
+    def test_oversized_record_is_not_encoded(self) -> None:
+        """
+        A record too large for one frame should raise ValueError instead of being sent.
+        """
+
+        with self.assertRaises(ValueError):
+            encodeRecord(self.makeRecord("x" * (MAX_FRAME_SIZE + 1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import unittest
+from typing import Dict
+
+import lumberjack
+
+HEAVY_MODULES = ("requests", "pydantic", "asyncio", "orjson")
+"""
+Dependencies that should only be loaded by the handlers that need them.
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importTimes(code: str) -> Dict[str, int]:
+    """
+    Runs code in a fresh interpreter with `-X importtime`.
+
+    Args:
+        code (str): The code to run.
+
+    Returns:
+        Dict[str, int]: The cumulative import time of every imported module, in microseconds.
+    """
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTests(unittest.TestCase):
+    """
+    Regression tests for the cost of importing lumberjack.
+    """
+
+    def test_import_is_light(self) -> None:
+        """
+        Importing the package should not load any heavy dependency, nor colorama.
+        """
+
+        times = importTimes("import lumberjack")
+
+        self.assertIn("lumberjack", times)
+        for module in HEAVY_MODULES + ("colorama",):
+            self.assertNotIn(module, times)
+        # About 250 ms when every handler was imported eagerly.
+        self.assertLess(times["lumberjack"], 50_000)
+
+    def test_console_and_forwarding_loggers_are_light(self) -> None:
+        """
+        A console-only logger and a logger forwarding to a shipper should not load the shipping dependencies.
+        """
+
+        times = importTimes(
+            "from lumberjack import LumberjackFactory\n"
+            "LumberjackFactory.CreateInstance('console')\n"
+            "LumberjackFactory.CreateInstance('forwarding', emit=True, forward_to='/nonexistent.sock')\n")
+
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+
+    def test_lazy_exports(self) -> None:
+        """
+        Exported names should resolve on first use, be listed by `dir`, and unknown names should raise AttributeError.
+        """
+
+        from lumberjack.lumberjack_handler import LumberjackHandler
+
+        self.assertIs(lumberjack.LumberjackHandler, LumberjackHandler)
+        self.assertIn("LumberjackHandler", vars(lumberjack))
+        self.assertIn("AsyncLumberjackHandler", dir(lumberjack))
+        with self.assertRaises(AttributeError):
+            lumberjack.Missing  # type: ignore[attr-defined]
+
+
+if __name__ == "__main__":
+    unittest.main()
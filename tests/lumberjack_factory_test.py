@@ -2,6 +2,8 @@ import logging
 import unittest
 from unittest.mock import MagicMock, patch
 
+from lumberjack import BatchingOptions
+from lumberjack.async_lumberjack_handler import AsyncLumberjackHandler
 from lumberjack.lumberjack_factory import LumberjackFactory
 from lumberjack.lumberjack_handler import LumberjackHandler
 
@@ -106,6 +108,42 @@ class LumberjackFactoryTests(unittest.TestCase):
             getattr(handler, "_LumberjackHandler__application_name"), self.app_name
         )
 
+    def test_asynchronous_handler(self) -> None:
+        """
+        Test if the `asynchronous` option creates a LumberjackHandler with a background worker.
+        """
+
+        # ACT
+        logger = LumberjackFactory.CreateInstance(
+            logger_name=self.logger_name,
+            url=self.url,
+            emit=True,
+            asynchronous=True,
+            batching=BatchingOptions(max_batch_records=10),
+        )
+        handler: LumberjackHandler = logger.handlers.pop()
+
+        # ASSERT
+        self.assertEqual(len(getattr(handler, "_LumberjackHandler__workers")), 1)
+        handler.close()
+
+    def test_asyncio_handler(self) -> None:
+        """
+        Test if the `use_asyncio` option creates an AsyncLumberjackHandler.
+        """
+
+        # ACT
+        logger = LumberjackFactory.CreateInstance(
+            logger_name=self.logger_name,
+            url=self.url,
+            emit=True,
+            use_asyncio=True,
+        )
+        handler = logger.handlers.pop()
+
+        # ASSERT
+        self.assertIsInstance(handler, AsyncLumberjackHandler)
+
 
 if __name__ == "__main__":
     unittest.main()
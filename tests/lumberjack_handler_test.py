@@ -1,9 +1,28 @@
+import io
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
-from logging import CRITICAL, LogRecord
+from contextlib import redirect_stdout
+from logging import CRITICAL, DEBUG, ERROR, INFO, LogRecord
+from typing import List, Tuple
 from unittest.mock import MagicMock, patch
 
-from lumberjack import LumberjackHandler
+import requests
+
+from lumberjack import BatchingOptions, DeliveryOptions, LumberjackHandler
 from lumberjack.models.log import Log
+from lumberjack.testing import StubServer
+from lumberjack.transport import (CircuitBreaker, CircuitState, RetryPolicy,
+                                  Transport)
+from lumberjack.utils import (DiskSpool, FieldLimits, LogThrottle,
+                              RecordBuffer, buildLog, decodeColumnar,
+                              hashSource, source_cache, traceback_cache)
 
 
 class LumberjackHandlerTests(unittest.TestCase):
@@ -26,29 +45,663 @@ class LumberjackHandlerTests(unittest.TestCase):
     )
 
     def setUp(self) -> None:
-        self.mock_log = MagicMock(spec=Log)
-        self.mock_log.dict.return_value = MagicMock()
+        """
+        Sets up mock objects used in the tests.
+        """
+        self.mock_transport = MagicMock(spec=Transport)
 
         LumberjackHandler.application_name = None
 
-    @patch("requests.post")
-    def test_emit(self, mock_post: MagicMock) -> None:
+    def test_emit(self) -> None:
         """
-        Sets up mock objects used in the tests.
+        `emit` should post the serialized log through the transport.
         """
-        with patch("lumberjack.models.log.Log", self.mock_log):
-            lumberjack = LumberjackHandler(self.URL)
-            lumberjack.emit(self.RECORD)
+        lumberjack = LumberjackHandler(self.URL, delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.RECORD)
 
-        mock_post.assert_called_once()
+        self.mock_transport.post.assert_called_once()
 
-        (args, kwargs) = mock_post.call_args_list[0]
+        (args, kwargs) = self.mock_transport.post.call_args_list[0]
         self.assertEqual(args[0], self.URL)
-        self.assertIsInstance(kwargs["json"], dict)
-        log = Log(**kwargs["json"])
+        payload = json.loads(args[1])
+        self.assertIsInstance(payload, dict)
+        log = Log(**payload)
 
         self.assertIsInstance(log, Log)
 
+    def test_emit_asynchronous(self) -> None:
+        """
+        In asynchronous mode `emit` should only enqueue, and the worker should post a JSON array.
+        """
+        lumberjack = LumberjackHandler(
+            self.URL, asynchronous=True,
+            batching=BatchingOptions(max_linger=60),
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.RECORD)
+        lumberjack.emit(self.RECORD)
+
+        self.mock_transport.post.assert_not_called()
+        lumberjack.flush()
+        lumberjack.close()
+
+        self.mock_transport.post.assert_called_once()
+        self.mock_transport.close.assert_called_once()
+        (args, kwargs) = self.mock_transport.post.call_args_list[0]
+        self.assertEqual(args[0], self.URL)
+        payload = json.loads(args[1])
+        self.assertEqual(len(payload), 2)
+        self.assertIsInstance(Log(**payload[0]), Log)
+
+    def test_emit_ndjson(self) -> None:
+        """
+        Batches should be sent as newline-delimited JSON when requested.
+        """
+        lumberjack = LumberjackHandler(
+            self.URL, asynchronous=True, encoder="json",
+            batching=BatchingOptions(max_linger=60, batch_format="ndjson"),
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.RECORD)
+        lumberjack.emit(self.RECORD)
+        lumberjack.close()
+
+        (args, kwargs) = self.mock_transport.post.call_args_list[0]
+        lines = args[1].splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIsInstance(Log(**json.loads(lines[0])), Log)
+        self.assertEqual(args[2], "application/x-ndjson")
+
+    def test_emit_columnar(self) -> None:
+        """
+        Batches should be sent column by column when requested, and spooled logs replayed the same way.
+        """
+        with tempfile.TemporaryDirectory() as directory, StubServer(status=503) as server:
+            spool = DiskSpool(directory)
+            lumberjack = LumberjackHandler(
+                server.url, asynchronous=True,
+                batching=BatchingOptions(max_linger=60, batch_format="columnar"),
+                delivery=DeliveryOptions(spool=spool))
+            for message in ("first", "second"):
+                lumberjack.emit(self.makeRecord(message))
+            lumberjack.flush()
+            self.assertEqual(len(spool), 2)
+
+            server.status = 200
+            lumberjack.emit(self.makeRecord("third"))
+            lumberjack.close()
+
+        self.assertEqual(len(spool), 0)
+        self.assertEqual(
+            server.requests[-1].headers["Content-Type"], "application/vnd.lumberjack.columnar+json")
+        replayed = decodeColumnar(server.requests[-2].body)
+        latest = decodeColumnar(server.requests[-1].body)
+        self.assertEqual([log["logMessage"] for log in replayed], ["first", "second"])
+        self.assertEqual([log["logMessage"] for log in latest], ["third"])
+        self.assertIsInstance(Log(**latest[0]), Log)
+
+    def test_emit_reuses_connection(self) -> None:
+        """
+        Consecutive logs should be delivered over one persistent connection.
+        """
+        with StubServer() as server:
+            lumberjack = LumberjackHandler(server.url)
+            for _ in range(5):
+                lumberjack.emit(self.RECORD)
+            lumberjack.close()
+
+        self.assertEqual(len(server.requests), 5)
+        self.assertEqual(server.connections, 1)
+
+    def test_spool_and_replay(self) -> None:
+        """
+        Logs that fail with a 5xx should be spooled and replayed in order once the endpoint recovers.
+        """
+        with tempfile.TemporaryDirectory() as directory, StubServer(status=503) as server:
+            spool = DiskSpool(directory)
+            lumberjack = LumberjackHandler(server.url, delivery=DeliveryOptions(spool=spool))
+            for message in ("first", "second"):
+                lumberjack.emit(self.makeRecord(message))
+            self.assertEqual(len(spool), 2)
+
+            server.status = 200
+            lumberjack.emit(self.makeRecord("third"))
+            lumberjack.close()
+
+        self.assertEqual(len(spool), 0)
+        replayed = json.loads(server.requests[-2].body)
+        latest = json.loads(server.requests[-1].body)
+        self.assertEqual([log["logMessage"] for log in replayed], ["first", "second"])
+        self.assertEqual(latest["logMessage"], "third")
+
+    def test_connection_error_is_spooled(self) -> None:
+        """
+        Connection errors should not propagate out of `emit`; the log should be spooled instead.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            server = StubServer()
+            url = server.url
+            server.stop()
+
+            spool = DiskSpool(directory)
+            lumberjack = LumberjackHandler(url, delivery=DeliveryOptions(spool=spool))
+            lumberjack.emit(self.RECORD)
+            lumberjack.close()
+
+            self.assertEqual(len(spool), 1)
+
+    def test_spool_error_is_reported(self) -> None:
+        """
+        A disk error while spooling should not propagate out of `emit`; the log should be counted as dropped.
+        """
+        with tempfile.TemporaryDirectory() as directory, StubServer(status=503) as server:
+            spool = DiskSpool(directory)
+            lumberjack = LumberjackHandler(server.url, delivery=DeliveryOptions(spool=spool))
+            with patch.object(spool, "append", side_effect=OSError(28, "No space left on device")), \
+                    patch.object(lumberjack, "handleError") as handle_error, redirect_stdout(io.StringIO()):
+                lumberjack.emit(self.RECORD)
+            lumberjack.close()
+
+            handle_error.assert_called_once()
+            self.assertEqual(lumberjack.stats()["records_dropped"], 1)
+            self.assertEqual(len(spool), 0)
+
+    def test_client_error_is_not_spooled(self) -> None:
+        """
+        Logs rejected with a 4xx should be dropped rather than spooled forever.
+        """
+        with tempfile.TemporaryDirectory() as directory, StubServer(status=400) as server:
+            spool = DiskSpool(directory)
+            lumberjack = LumberjackHandler(server.url, delivery=DeliveryOptions(spool=spool))
+            lumberjack.emit(self.RECORD)
+            lumberjack.close()
+
+            self.assertEqual(len(spool), 0)
+
+    def test_retry(self) -> None:
+        """
+        A failed send should be retried according to the retry policy.
+        """
+        with StubServer(status=503) as server:
+            delays = []
+            lumberjack = LumberjackHandler(
+                server.url, delivery=DeliveryOptions(retry=RetryPolicy(max_retries=2, sleep=delays.append)))
+            lumberjack.emit(self.RECORD)
+            lumberjack.close()
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(len(delays), 2)
+
+    def test_circuit_breaker(self) -> None:
+        """
+        Once the circuit is open, `emit` should stop hitting the endpoint.
+        """
+        with StubServer(status=500) as server:
+            lumberjack = LumberjackHandler(
+                server.url, delivery=DeliveryOptions(circuit_breaker=CircuitBreaker(failure_threshold=2, cooldown=60)))
+            for _ in range(5):
+                lumberjack.emit(self.RECORD)
+            lumberjack.close()
+
+        self.assertEqual(len(server.requests), 2)
+        assert lumberjack.circuit_breaker is not None
+        self.assertEqual(lumberjack.circuit_breaker.state, CircuitState.OPEN)
+        self.assertEqual(lumberjack.circuit_breakers, {server.url: lumberjack.circuit_breaker})
+
+    def test_content_addressed_sources(self) -> None:
+        """
+        In "hash" mode the source file should be uploaded once and every log should carry only its hash.
+        """
+        with StubServer(require_sources=True) as server:
+            lumberjack = LumberjackHandler(server.url, code_capture="hash")
+            for message in ("first", "second", "third"):
+                lumberjack.emit(self.makeRecord(message))
+            lumberjack.close()
+
+        with open(__file__, "r") as f:
+            code = f.read()
+        digest = hashSource(code)
+
+        self.assertEqual([request.path for request in server.requests],
+                         ["/sources", "/", "/", "/"])
+        self.assertEqual(server.sources, {digest: code})
+        for request in server.requests[1:]:
+            log = json.loads(request.body)
+            self.assertEqual(log["codeHash"], digest)
+            self.assertIsNone(log["code"])
+
+    def test_missing_sources_are_uploaded_again(self) -> None:
+        """
+        Sources the endpoint asks for with a 409 should be uploaded again before the logs are resent.
+        """
+        with StubServer(require_sources=True) as server:
+            lumberjack = LumberjackHandler(
+                server.url, asynchronous=True, code_capture="hash", batching=BatchingOptions(max_linger=60))
+            lumberjack.emit(self.makeRecord("first"))
+            lumberjack.flush()
+            server.sources.clear()
+            lumberjack.emit(self.makeRecord("second"))
+            lumberjack.close()
+
+        self.assertEqual([request.path for request in server.requests],
+                         ["/sources", "/", "/", "/sources", "/"])
+        self.assertEqual(json.loads(server.requests[-1].body)[0]["logMessage"], "second")
+        self.assertEqual(len(server.sources), 1)
+
+    def test_endpoints(self) -> None:
+        """
+        Logs should be spread across several endpoints in turn, failing over from an endpoint that is down, which
+        is then taken out of rotation.
+        """
+        with StubServer() as first, StubServer(status=503) as down, StubServer() as second:
+            lumberjack = LumberjackHandler([first.url, down.url, second.url])
+            for i in range(8):
+                lumberjack.emit(self.makeRecord(str(i)))
+            stats = lumberjack.stats()
+            lumberjack.close()
+
+        delivered = [json.loads(request.body)["logMessage"]
+                     for server in (first, second) for request in server.requests]
+        self.assertEqual(sorted(delivered), [str(i) for i in range(8)])
+        self.assertEqual(len(down.requests), 3)
+        self.assertGreaterEqual(min(len(first.requests), len(second.requests)), 3)
+        self.assertEqual(stats["records_sent"], 8)
+        self.assertEqual(stats["endpoints_healthy"], 2)
+        self.assertEqual(stats["requests_failed_by_endpoint"][down.url], 3)
+
+    def test_endpoints_retry_and_circuit_breaker(self) -> None:
+        """
+        With several endpoints, a dead endpoint should fail over after a single attempt, and only its own breaker
+        should open.
+        """
+        with StubServer(status=503) as down, StubServer() as up:
+            lumberjack = LumberjackHandler(
+                [down.url, up.url], delivery=DeliveryOptions(
+                    retry=RetryPolicy(max_retries=3, backoff_base=0),
+                    circuit_breaker=CircuitBreaker(failure_threshold=1)))
+            lumberjack.emit(self.makeRecord("first"))
+            lumberjack.emit(self.makeRecord("second"))
+            endpoints = lumberjack.endpoints
+            lumberjack.close()
+
+        assert endpoints is not None
+        self.assertEqual(len(down.requests), 1)
+        self.assertEqual(len(up.requests), 2)
+        self.assertIsNone(lumberjack.circuit_breaker)
+        self.assertEqual({url: breaker.state for url, breaker in lumberjack.circuit_breakers.items()},
+                         {down.url: CircuitState.OPEN, up.url: CircuitState.CLOSED})
+        self.assertEqual(endpoints.healthy, [down.url, up.url])
+
+    def test_endpoints_upload_sources(self) -> None:
+        """
+        Each endpoint should be sent the source files it is missing before the first batch, without rejecting it.
+        """
+        with StubServer(require_sources=True) as first, StubServer(require_sources=True) as second:
+            lumberjack = LumberjackHandler(
+                [first.url, second.url], code_capture="hash")
+            for message in ("first", "second"):
+                lumberjack.emit(self.makeRecord(message))
+            lumberjack.close()
+
+        self.assertEqual([request.path for request in first.requests], ["/sources", "/"])
+        self.assertEqual([request.path for request in second.requests], ["/sources", "/"])
+        self.assertEqual(first.sources, second.sources)
+
+    def test_field_limits(self) -> None:
+        """
+        An oversized message should be cut to its limit before the log is shipped.
+        """
+        with StubServer() as server:
+            lumberjack = LumberjackHandler(
+                server.url, field_limits=FieldLimits(message=1000), code_capture="none")
+            lumberjack.emit(self.makeRecord("x" * 100000))
+            stats = lumberjack.stats()
+            lumberjack.close()
+
+        message = json.loads(server.requests[0].body)["logMessage"]
+        self.assertLessEqual(len(message.encode()), 1000)
+        self.assertIn("bytes]", message)
+        self.assertEqual(stats["fields_truncated"], 1)
+
+    def test_max_body_size(self) -> None:
+        """
+        Batches should be split so no request body exceeds `max_batch_bytes`, in every batch format, and
+        bodies larger than `chunk_size` streamed with chunked transfer encoding.
+        """
+        for batch_format in ("json", "ndjson", "columnar"):
+            with self.subTest(batch_format=batch_format), StubServer() as server:
+                lumberjack = LumberjackHandler(
+                    server.url, asynchronous=True, code_capture="none",
+                    batching=BatchingOptions(batch_format=batch_format, max_batch_bytes=2000, chunk_size=1000,
+                                             max_linger=60))
+                for i in range(20):
+                    lumberjack.emit(self.makeRecord(f"{i} " + "x" * 200))
+                lumberjack.close()
+
+                messages: List[str] = []
+                for request in server.requests:
+                    self.assertLessEqual(len(request.body), 2000)
+                    if batch_format == "columnar":
+                        logs = decodeColumnar(request.body)
+                    else:
+                        logs = [json.loads(line) for line in request.body.splitlines()] \
+                            if batch_format == "ndjson" else json.loads(request.body)
+                    messages += [log["logMessage"].split()[0] for log in logs]
+
+                self.assertEqual(messages, [str(i) for i in range(20)])
+                self.assertGreater(len(server.requests), 2)
+                self.assertEqual(
+                    any(request.headers.get("Transfer-Encoding") == "chunked" for request in server.requests),
+                    batch_format != "columnar")
+
+    def test_throttle(self) -> None:
+        """
+        Repeated records should be suppressed before a log is built and shipped as one log with a count on close.
+        """
+        lumberjack = LumberjackHandler(
+            self.URL, throttle=LogThrottle(dedup_window=60), delivery=DeliveryOptions(transport=self.mock_transport))
+        with patch("lumberjack.lumberjack_handler.buildLog", wraps=buildLog) as build:
+            for _ in range(5):
+                lumberjack.emit(self.makeRecord("repeated"))
+            self.assertEqual(build.call_count, 1)
+            lumberjack.close()
+
+        payloads = [json.loads(args[1]) for (args, kwargs) in self.mock_transport.post.call_args_list]
+        self.assertEqual([log.get("occurrences", "omitted") for log in payloads], ["omitted", 4])
+        self.assertEqual(lumberjack.throttle.deduplicated, 4)
+
+    def test_throttle_summary_without_later_records(self) -> None:
+        """
+        The summary of collapsed repeats should be shipped once their window closes, even if nothing else is logged.
+        """
+        lumberjack = LumberjackHandler(
+            self.URL, throttle=LogThrottle(dedup_window=0.05), delivery=DeliveryOptions(transport=self.mock_transport))
+        for _ in range(3):
+            lumberjack.emit(self.makeRecord("repeated"))
+
+        deadline = time.monotonic() + 5
+        while self.mock_transport.post.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        payloads = [json.loads(args[1]) for (args, kwargs) in self.mock_transport.post.call_args_list]
+        self.assertEqual([log.get("occurrences", "omitted") for log in payloads], ["omitted", 2])
+        lumberjack.close()
+
+    def test_stats(self) -> None:
+        """
+        The statistics should count what was built, sent, spooled and dropped.
+        """
+        with tempfile.TemporaryDirectory() as directory, StubServer() as server:
+            spool = DiskSpool(directory)
+            lumberjack = LumberjackHandler(server.url, delivery=DeliveryOptions(spool=spool))
+            lumberjack.emit(self.RECORD)
+            server.status = 503
+            lumberjack.emit(self.RECORD)
+            server.status = 400
+            lumberjack.emit(self.RECORD)
+            stats = lumberjack.stats()
+            lumberjack.close()
+
+        self.assertEqual(stats["records_built"], 3)
+        self.assertEqual(stats["records_sent"], 1)
+        # The spooled log is replayed before the last one, and the 400 drops both.
+        self.assertEqual(stats["records_failed"], 3)
+        self.assertEqual(stats["records_spooled"], 1)
+        self.assertEqual(stats["records_dropped"], 2)
+        self.assertEqual(stats["spool_depth"], 0)
+        self.assertEqual((stats["requests_sent"], stats["requests_failed"]), (1, 3))
+        self.assertEqual(stats["serialization_seconds"].samples, 3)
+
+    def test_record_buffer(self) -> None:
+        """
+        Debug records should not be built or posted until an error ships them with it as one batch.
+        """
+        lumberjack = LumberjackHandler(
+            self.URL, record_buffer=RecordBuffer(), code_capture="none",
+            delivery=DeliveryOptions(transport=self.mock_transport))
+
+        with patch("lumberjack.lumberjack_handler.buildLog", wraps=buildLog) as build:
+            lumberjack.emit(self.makeRecord("first", DEBUG))
+            lumberjack.emit(self.makeRecord("second", DEBUG))
+            build.assert_not_called()
+            lumberjack.emit(self.makeRecord("info", INFO))
+            lumberjack.emit(self.makeRecord("boom", ERROR))
+        stats = lumberjack.stats()
+
+        bodies = [json.loads(args[1]) for args, _ in self.mock_transport.post.call_args_list]
+        self.assertEqual(bodies[0]["logMessage"], "info")
+        self.assertEqual([log["logMessage"] for log in bodies[1]], ["first", "second", "boom"])
+        self.assertEqual((stats["records_buffered"], stats["records_released"], stats["buffer_depth"]), (2, 2, 0))
+        self.assertEqual(stats["records_sent"], 4)
+
+    def test_senders(self) -> None:
+        """
+        Several senders should post concurrently, each logger's logs still arriving in order.
+        """
+        lock = threading.Lock()
+        active = [0, 0]
+        received: List[Tuple[str, str]] = []
+
+        def post(url: str, body: bytes, content_type: str) -> None:
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+                received.extend((log["loggerName"], log["logMessage"]) for log in json.loads(body))
+
+        self.mock_transport.post.side_effect = post
+        lumberjack = LumberjackHandler(
+            self.URL, asynchronous=True, code_capture="none",
+            batching=BatchingOptions(senders=4, max_batch_records=2, max_linger=60),
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        for i in range(10):
+            for name in ("a", "b", "c", "d"):
+                record = self.makeRecord(str(i))
+                record.name = name
+                lumberjack.emit(record)
+        lumberjack.close()
+
+        self.assertGreater(active[1], 1)
+        for name in ("a", "b", "c", "d"):
+            self.assertEqual([message for logger, message in received if logger == name], [str(i) for i in range(10)])
+
+    def test_backpressure(self) -> None:
+        """
+        With the "drop_lowest_level" policy, errors should survive a flood of debug logs while the endpoint is
+        stalled, and the dropped logs should be counted by level.
+        """
+        stalled = threading.Event()
+        released = threading.Event()
+        messages = []
+
+        def post(url: str, body: bytes, content_type: str) -> None:
+            stalled.set()
+            released.wait(5)
+            messages.extend(log["logMessage"] for log in json.loads(body))
+
+        self.mock_transport.post.side_effect = post
+        lumberjack = LumberjackHandler(
+            self.URL, asynchronous=True, code_capture="none",
+            batching=BatchingOptions(max_linger=0, max_batch_records=1, max_queue_size=3,
+                                     max_queue_bytes=1024 * 1024, backpressure="drop_lowest_level"),
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.makeRecord("first", DEBUG))
+        stalled.wait(5)
+        for i in range(10):
+            lumberjack.emit(self.makeRecord(f"debug {i}", DEBUG))
+            if i % 5 == 0:
+                lumberjack.emit(self.makeRecord(f"error {i}", ERROR))
+        stats = lumberjack.stats()
+        released.set()
+        lumberjack.close()
+
+        # "error 5" pushed out the oldest debug log waiting, and the later debug logs found no lower level to drop.
+        self.assertEqual(messages, ["first", "error 0", "debug 1", "error 5"])
+        self.assertEqual(stats["records_dropped"], 9)
+        self.assertEqual(stats["records_dropped_by_level"], {"DEBUG": 9})
+        self.assertEqual(stats["queue_depth"], 3)
+        self.assertGreater(stats["queue_bytes"], 0)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork(self) -> None:
+        """
+        A forked child should ship its own logs through a new worker, and leave the logs queued before the fork
+        to the parent.
+        """
+        with StubServer() as server:
+            lumberjack = LumberjackHandler(
+                server.url, asynchronous=True, code_capture="none", batching=BatchingOptions(max_linger=60))
+            lumberjack.emit(self.makeRecord("queued"))
+
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    lumberjack.emit(self.makeRecord("child"))
+                    lumberjack.close()
+                    status = 0
+                finally:
+                    os._exit(status)
+
+            _, status = os.waitpid(pid, 0)
+            lumberjack.emit(self.makeRecord("parent"))
+            lumberjack.close()
+
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        batches = [[log["logMessage"] for log in json.loads(request.body)] for request in server.requests]
+        self.assertCountEqual(batches, [["child"], ["queued", "parent"]])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fork_while_locked(self) -> None:
+        """
+        A forked child should not deadlock on the locks that threads of the parent held at the time of the fork.
+        """
+        throttle = LogThrottle(dedup_window=10)
+        record_buffer = RecordBuffer()
+        lumberjack = LumberjackHandler(
+            self.URL, throttle=throttle, record_buffer=record_buffer,
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = LogRecord("test", ERROR, __file__, 0, "failed", (), sys.exc_info())
+
+        locks = [
+            throttle._LogThrottle__lock,  # type: ignore[attr-defined]
+            record_buffer._RecordBuffer__lock,  # type: ignore[attr-defined]
+            traceback_cache._TracebackCache__lock,  # type: ignore[attr-defined]
+            source_cache._SourceCache__lock,  # type: ignore[attr-defined]
+        ]
+        for lock in locks:
+            lock.acquire()
+        try:
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    signal.alarm(5)
+                    lumberjack.emit(record)
+                    lumberjack.close()
+                    status = 0
+                finally:
+                    os._exit(status)
+        finally:
+            for lock in locks:
+                lock.release()
+
+        _, status = os.waitpid(pid, 0)
+        lumberjack.close()
+
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+    def test_close_deadline(self) -> None:
+        """
+        `close` should give up on a stalled endpoint after `shutdown_timeout` seconds, and closing again should do
+        nothing.
+        """
+        released = threading.Event()
+        self.mock_transport.post.side_effect = lambda *args: released.wait(5)
+        lumberjack = LumberjackHandler(
+            self.URL, asynchronous=True, shutdown_timeout=0.1,
+            batching=BatchingOptions(max_linger=0),
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.RECORD)
+        lumberjack.emit(self.RECORD)
+
+        output = io.StringIO()
+        started = time.monotonic()
+        with redirect_stdout(output):
+            lumberjack.close()
+            lumberjack.close()
+        released.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(output.getvalue().count("Failed to ship the remaining logs within 0.1 seconds"), 1)
+
+    def test_flush_after_close_deadline(self) -> None:
+        """
+        Flushing a handler whose `close` gave up on a stalled endpoint, as `logging.shutdown` does, should return
+        at once instead of waiting for the stopped worker.
+        """
+        released = threading.Event()
+        self.mock_transport.post.side_effect = lambda *args: released.wait(5)
+        lumberjack = LumberjackHandler(
+            self.URL, asynchronous=True, shutdown_timeout=0.1,
+            batching=BatchingOptions(max_linger=0),
+            delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.RECORD)
+        lumberjack.emit(self.RECORD)
+
+        with redirect_stdout(io.StringIO()):
+            lumberjack.close()
+        flush = threading.Thread(target=lumberjack.flush, daemon=True)
+        flush.start()
+        flush.join(1)
+        released.set()
+
+        self.assertFalse(flush.is_alive())
+
+    def test_drain_at_exit(self) -> None:
+        """
+        The logs still queued at interpreter exit should be shipped without an explicit `close`.
+        """
+        script = (
+            "import logging, sys\n"
+            "from lumberjack import BatchingOptions, LumberjackHandler\n"
+            "logger = logging.getLogger('exit')\n"
+            "handler = LumberjackHandler(sys.argv[1], asynchronous=True, batching=BatchingOptions(max_linger=60))\n"
+            "logger.addHandler(handler)\n"
+            "logger.error('last words')\n")
+        with StubServer() as server:
+            subprocess.run([sys.executable, "-c", script, server.url], check=True, timeout=30,
+                           cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        self.assertEqual([log["logMessage"] for log in json.loads(server.requests[0].body)], ["last words"])
+
+    def test_metrics_endpoint(self) -> None:
+        """
+        The statistics should be served in the Prometheus text format when a metrics port is given.
+        """
+        lumberjack = LumberjackHandler(
+            self.URL, metrics_port=0, delivery=DeliveryOptions(transport=self.mock_transport))
+        lumberjack.emit(self.RECORD)
+        assert lumberjack.metrics_server is not None
+        response = requests.get(lumberjack.metrics_server.url)
+        lumberjack.close()
+
+        self.assertIn("lumberjack_records_sent_total 1", response.text)
+
+    def makeRecord(self, message: str, level: int = CRITICAL) -> LogRecord:
+        return LogRecord(
+            name="test",
+            level=level,
+            pathname=__file__,
+            lineno=0,
+            msg=message,
+            args=(),
+            exc_info=None,
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
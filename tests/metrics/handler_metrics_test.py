@@ -0,0 +1,47 @@
+import unittest
+
+from lumberjack.metrics import HandlerMetrics, Histogram
+
+
+class HandlerMetricsTests(unittest.TestCase):
+    """
+    Test cases for the Histogram and HandlerMetrics classes.
+    """
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """
+        Each bucket should count the values less than or equal to its bound.
+        """
+
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        self.assertEqual(snapshot.buckets, [(1, 2), (10, 3), (float("inf"), 4)])
+        self.assertEqual(snapshot.samples, 4)
+        self.assertEqual(snapshot.sum, 56.5)
+
+    def test_snapshot(self) -> None:
+        """
+        The snapshot should hold every counter and histogram.
+        """
+
+        metrics = HandlerMetrics()
+        metrics.increment("records_built", 3)
+        metrics.observeRequest(records=3, size=2048, seconds=0.02, failed=False)
+        metrics.observeRequest(records=3, size=2048, seconds=0.5, failed=True)
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot["records_built"], 3)
+        self.assertEqual(snapshot["records_sent"], 0)
+        self.assertEqual((snapshot["requests_sent"], snapshot["requests_failed"]), (1, 1))
+        self.assertEqual(snapshot["http_request_seconds"].samples, 2)
+        self.assertEqual(snapshot["batch_records"].samples, 1)
+        self.assertEqual(snapshot["batch_bytes"].sum, 2048)
+
+
+if __name__ == "__main__":
+    unittest.main()
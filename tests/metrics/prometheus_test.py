@@ -0,0 +1,68 @@
+import unittest
+
+import requests
+
+from lumberjack.metrics import HistogramSnapshot, MetricsServer, toPrometheus
+
+
+class PrometheusTests(unittest.TestCase):
+    """
+    Test cases for the Prometheus text rendering and endpoint.
+    """
+
+    STATS = {
+        "records_sent": 7,
+        "queue_depth": 2,
+        "batch_records": HistogramSnapshot(2, 12.0, [(10, 1), (float("inf"), 2)]),
+    }
+
+    def test_render(self) -> None:
+        """
+        Counters, gauges and histograms should be rendered with their types.
+        """
+
+        text = toPrometheus(self.STATS, labels={"app": 'my "app"'})
+
+        self.assertEqual(text.splitlines(), [
+            "# TYPE lumberjack_records_sent_total counter",
+            'lumberjack_records_sent_total{app="my \\"app\\""} 7',
+            "# TYPE lumberjack_queue_depth gauge",
+            'lumberjack_queue_depth{app="my \\"app\\""} 2',
+            "# TYPE lumberjack_batch_records histogram",
+            'lumberjack_batch_records_bucket{app="my \\"app\\"",le="10.0"} 1',
+            'lumberjack_batch_records_bucket{app="my \\"app\\"",le="+Inf"} 2',
+            'lumberjack_batch_records_sum{app="my \\"app\\""} 12.0',
+            'lumberjack_batch_records_count{app="my \\"app\\""} 2',
+        ])
+
+    def test_render_by_level(self) -> None:
+        """
+        Counters broken down by level should be rendered as one labelled sample per level.
+        """
+
+        text = toPrometheus({"records_dropped_by_level": {"DEBUG": 3, "INFO": 1}})
+
+        self.assertEqual(text.splitlines(), [
+            "# TYPE lumberjack_records_dropped_by_level_total counter",
+            'lumberjack_records_dropped_by_level_total{level="DEBUG"} 3',
+            'lumberjack_records_dropped_by_level_total{level="INFO"} 1',
+        ])
+
+    def test_endpoint(self) -> None:
+        """
+        The endpoint should serve the rendered metrics.
+        """
+
+        server = MetricsServer(lambda: toPrometheus(self.STATS)).start()
+        try:
+            response = requests.get(server.url)
+        finally:
+            server.stop()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+        self.assertIn("lumberjack_records_sent_total 7", response.text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from datetime import datetime
+
+from lumberjack.models import Log, getProcessContext
+
+
+class LogTests(unittest.TestCase):
+    """
+    Test cases for the Log model.
+    """
+
+    VALUES = dict(
+        logLevel=40,
+        logLevelName="ERROR",
+        logMessage="message with \"quotes\" and unicode ☃",
+        loggerName="test",
+        applicationName="app",
+        timestamp=datetime(2024, 1, 2, 3, 4, 5, 678901),
+        stackTrace="Traceback (most recent call last):\n",
+        filename="log_test.py",
+        filepath=__file__,
+        lineno=12,
+        code="print('hello')\n",
+    )
+
+    def test_sets_defaults(self) -> None:
+        """
+        A Log should take its host metadata from the process context.
+        """
+
+        context = getProcessContext()
+        log = Log(**dict(self.VALUES))
+
+        self.assertEqual(log.username, context.username)
+        self.assertEqual(log.machineName, context.machineName)
+        self.assertEqual(log.language, context.language)
+        self.assertEqual(log.languageVersion, context.languageVersion)
+        self.assertIsNone(log.environment)
+
+    def test_rejects_bad_values(self) -> None:
+        """
+        Values of the wrong type should be rejected.
+        """
+
+        values = dict(self.VALUES, logLevel="not a level")
+        with self.assertRaises(ValueError):
+            Log(**values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import getpass
+import os
+import platform
+import socket
+import unittest
+from datetime import datetime
+
+from lumberjack.models import (Log, ProcessContext, getProcessContext,
+                               refreshProcessContext)
+
+
+class ProcessContextTests(unittest.TestCase):
+    """
+    Test cases for the process context snapshot.
+    """
+
+    def tearDown(self) -> None:
+        """
+        Restores a snapshot of the real environment.
+        """
+
+        os.environ.pop("ENV", None)
+        refreshProcessContext()
+
+    def test_snapshot(self) -> None:
+        """
+        The snapshot should describe the current process.
+        """
+
+        context = refreshProcessContext()
+
+        self.assertEqual(context.language, platform.python_implementation())
+        self.assertEqual(context.languageVersion, platform.python_version())
+        self.assertEqual(context.username, getpass.getuser())
+        self.assertEqual(context.machineName, socket.gethostname())
+
+    def test_snapshot_is_computed_once(self) -> None:
+        """
+        Changes to the environment should only be picked up after an explicit refresh.
+        """
+
+        before = getProcessContext()
+        os.environ["ENV"] = "changed"
+
+        self.assertIs(getProcessContext(), before)
+        self.assertEqual(refreshProcessContext().environment, "changed")
+        self.assertEqual(getProcessContext().environment, "changed")
+
+    def test_log_defaults(self) -> None:
+        """
+        Logs should take their host metadata from the snapshot.
+        """
+
+        context = getProcessContext()
+        log = Log(
+            logLevel=20,
+            logLevelName="INFO",
+            logMessage="message",
+            timestamp=datetime.now(),
+        )
+
+        self.assertEqual(log.username, context.username)
+        self.assertEqual(log.machineName, context.machineName)
+        self.assertEqual(log.language, context.language)
+        self.assertEqual(log.languageVersion, context.languageVersion)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_refreshed_after_fork(self) -> None:
+        """
+        A forked child should recompute the snapshot instead of inheriting it.
+        """
+
+        getProcessContext()
+        os.environ["ENV"] = "child"
+
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, (getProcessContext().environment or "").encode())
+            os._exit(0)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            environment = f.read()
+        os.waitpid(pid, 0)
+
+        self.assertEqual(environment, "child")
+        self.assertIsInstance(getProcessContext(), ProcessContext)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import time
+import unittest
+
+import requests
+
+from lumberjack.testing import StubServer
+
+
+class StubServerTests(unittest.TestCase):
+    """
+    Test cases for the StubServer class.
+    """
+
+    def test_records_requests(self) -> None:
+        """
+        Every request should be recorded with its body and answered with the configured status.
+        """
+
+        with StubServer(status=202) as server:
+            response = requests.post(server.url, data=b"[]")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual([request.body for request in server.requests], [b"[]"])
+        self.assertEqual(server.bytes_received, 2)
+
+    def test_latency(self) -> None:
+        """
+        Responses should be delayed by the configured latency.
+        """
+
+        with StubServer(latency=0.1) as server:
+            started = time.monotonic()
+            requests.post(server.url, data=b"[]")
+            elapsed = time.monotonic() - started
+
+        self.assertGreaterEqual(elapsed, 0.1)
+
+    def test_error_rate(self) -> None:
+        """
+        About the configured fraction of requests should fail, reproducibly for a given seed.
+        """
+
+        def statuses() -> list:
+            with StubServer(error_rate=0.3, seed=1) as server, requests.Session() as session:
+                return [session.post(server.url, data=b"[]").status_code for _ in range(100)]
+
+        first = statuses()
+
+        self.assertEqual(first, statuses())
+        self.assertTrue(15 <= first.count(503) <= 45)
+        self.assertEqual(first.count(503) + first.count(200), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+import asyncio
+import json
+import time
+import unittest
+
+from requests import ConnectionError, HTTPError, Timeout
+
+from lumberjack.testing import StubServer
+from lumberjack.transport import AsyncHttpTransport, isRetriable
+
+
+class AsyncHttpTransportTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for the AsyncHttpTransport class.
+    """
+
+    BODY = json.dumps({"logMessage": "message " * 500}).encode()
+
+    def setUp(self) -> None:
+        """
+        Starts a stub server for each test.
+        """
+
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        """
+        Stops the stub server.
+        """
+
+        self.server.stop()
+
+    async def test_keep_alive(self) -> None:
+        """
+        Requests should share a single persistent connection.
+        """
+
+        transport = AsyncHttpTransport()
+        for _ in range(10):
+            await transport.post(self.server.url, b"{}")
+        await transport.close()
+
+        self.assertEqual(len(self.server.requests), 10)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.requests[0].body, b"{}")
+
+    async def test_no_content(self) -> None:
+        """
+        A 204 response without Content-Length should end with its headers and keep the connection reusable.
+        """
+
+        with StubServer(status=204) as server:
+            transport = AsyncHttpTransport(read_timeout=2)
+            started = time.monotonic()
+            for _ in range(3):
+                await transport.post(server.url, b"{}")
+            await transport.close()
+
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(server.connections, 1)
+
+    async def startServer(self, response: bytes) -> int:
+        """
+        Starts a raw server answering every request with the given bytes, stopped at the end of the test.
+
+        Returns:
+            int: The port of the server.
+        """
+
+        async def answer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            self.connections += 1
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionResetError):
+                    break
+                length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+                await reader.readexactly(length)
+                writer.write(response)
+                await writer.drain()
+            writer.close()
+
+        self.connections = 0
+        server = await asyncio.start_server(answer, "127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return server.sockets[0].getsockname()[1]
+
+    async def test_interim_response(self) -> None:
+        """
+        An interim 1xx response should be skipped for the final response that follows it.
+        """
+
+        port = await self.startServer(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 204 No Content\r\n\r\n")
+        transport = AsyncHttpTransport(read_timeout=2)
+        started = time.monotonic()
+        for _ in range(2):
+            await transport.post(f"http://127.0.0.1:{port}/", b"{}")
+        await transport.close()
+
+        self.assertLess(time.monotonic() - started, 1)
+
+    async def test_chunked_trailers(self) -> None:
+        """
+        A chunked response with trailer fields should be read to its end, keeping the connection reusable.
+        """
+
+        port = await self.startServer(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"2\r\nok\r\n0\r\nChecksum: 1234\r\n\r\n")
+        transport = AsyncHttpTransport(read_timeout=2)
+        for _ in range(2):
+            await transport.post(f"http://127.0.0.1:{port}/", b"{}")
+        await transport.close()
+
+        self.assertEqual(self.connections, 1)
+
+    async def test_malformed_status_line(self) -> None:
+        """
+        A malformed status line should raise a retriable ConnectionError and drop the connection.
+        """
+
+        port = await self.startServer(b"HTTP/1.1 OK\r\n\r\n")
+        transport = AsyncHttpTransport(read_timeout=2)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError) as context:
+                await transport.post(f"http://127.0.0.1:{port}/", b"{}")
+        await transport.close()
+
+        self.assertTrue(isRetriable(context.exception))
+        self.assertEqual(self.connections, 2)
+
+    async def test_send_timeout(self) -> None:
+        """
+        A request the endpoint stops reading should time out instead of waiting forever.
+        """
+
+        stalled = []
+
+        async def stall(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            stalled.append(writer)
+
+        server = await asyncio.start_server(stall, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        transport = AsyncHttpTransport(read_timeout=0.5)
+        started = time.monotonic()
+        with self.assertRaises(Timeout):
+            await transport.post(f"http://127.0.0.1:{port}/", b"x" * 64 * 1024 * 1024)
+        await transport.close()
+        for writer in stalled:
+            writer.close()
+        server.close()
+        await server.wait_closed()
+
+        self.assertLess(time.monotonic() - started, 3)
+
+    async def test_compression(self) -> None:
+        """
+        Bodies above the threshold should be compressed.
+        """
+
+        transport = AsyncHttpTransport(compression="gzip", compression_threshold=100)
+        await transport.post(self.server.url, self.BODY, "application/x-ndjson")
+        await transport.close()
+
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        self.assertEqual(request.headers["Content-Type"], "application/x-ndjson")
+        self.assertEqual(request.body, self.BODY)
+
+    async def test_error_status(self) -> None:
+        """
+        A rejected request should raise an HTTPError carrying the status code.
+        """
+
+        self.server.status = 503
+        transport = AsyncHttpTransport()
+        with self.assertRaises(HTTPError) as context:
+            await transport.post(self.server.url, b"{}")
+        await transport.close()
+
+        self.assertEqual(context.exception.response.status_code, 503)
+        self.assertTrue(isRetriable(context.exception))
+
+    async def test_connection_refused(self) -> None:
+        """
+        An unreachable endpoint should raise a ConnectionError.
+        """
+
+        url = self.server.url
+        self.server.stop()
+
+        transport = AsyncHttpTransport()
+        with self.assertRaises(ConnectionError):
+            await transport.post(url, b"{}")
+        await transport.close()
+
+    async def test_reconnects_after_server_restart(self) -> None:
+        """
+        A kept-alive connection closed by the server should be replaced transparently.
+        """
+
+        transport = AsyncHttpTransport()
+        await transport.post(self.server.url, b"{}")
+
+        self.server.stop()
+        self.server = StubServer(port=self.server.port).start()
+        await transport.post(self.server.url, b"{}")
+        await transport.close()
+
+        self.assertEqual(len(self.server.requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
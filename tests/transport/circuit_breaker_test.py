@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import MagicMock
+
+from requests import ConnectionError, HTTPError
+
+from lumberjack.transport import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    """
+    Test cases for the CircuitBreaker class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a breaker driven by a fake clock.
+        """
+
+        self.now = 0.0
+        self.breaker = CircuitBreaker(
+            failure_threshold=3, cooldown=10, clock=lambda: self.now)
+
+    def fail(self) -> None:
+        with self.assertRaises(ConnectionError):
+            self.breaker.call(MagicMock(side_effect=ConnectionError("refused")))
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        """
+        The circuit should open after `failure_threshold` consecutive failures and short-circuit sends.
+        """
+
+        for _ in range(3):
+            self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+            self.fail()
+
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        send = MagicMock()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(send)
+        send.assert_not_called()
+
+    def test_success_resets_failures(self) -> None:
+        """
+        A success should reset the count of consecutive failures.
+        """
+
+        self.fail()
+        self.fail()
+        self.breaker.call(MagicMock())
+        self.fail()
+
+        self.assertEqual(self.breaker.consecutive_failures, 1)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_client_errors_do_not_count(self) -> None:
+        """
+        A 4xx response shows the endpoint is up and should not open the circuit.
+        """
+
+        response = MagicMock(status_code=400)
+        for _ in range(5):
+            with self.assertRaises(HTTPError):
+                self.breaker.call(MagicMock(side_effect=HTTPError(response=response)))
+
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_half_open_probe(self) -> None:
+        """
+        After the cool-down a single probe should be allowed; its outcome closes or reopens the circuit.
+        """
+
+        for _ in range(3):
+            self.fail()
+
+        self.now = 10
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.fail()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        self.now = 20
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.recordSuccess()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
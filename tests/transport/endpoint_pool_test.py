@@ -0,0 +1,143 @@
+import unittest
+from typing import List
+from unittest.mock import MagicMock
+
+from requests import ConnectionError, HTTPError
+
+from lumberjack.transport import (CircuitBreaker, CircuitOpenError,
+                                  CircuitState, EndpointPool,
+                                  NoEndpointAvailableError)
+
+URLS = ["http://a/", "http://b/", "http://c/"]
+
+
+class EndpointPoolTests(unittest.TestCase):
+    """
+    Test cases for the EndpointPool class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a pool driven by a fake clock.
+        """
+
+        self.now = 0.0
+        self.pool = EndpointPool(
+            URLS, failure_threshold=2, probe_interval=10, clock=lambda: self.now)
+        self.sent: List[str] = []
+        self.down: List[str] = []
+
+    def send(self, url: str) -> None:
+        self.sent.append(url)
+        if url in self.down:
+            raise ConnectionError("refused")
+
+    def test_round_robin(self) -> None:
+        """
+        Requests should go to each endpoint in turn.
+        """
+
+        for _ in range(6):
+            self.pool.call(self.send)
+
+        self.assertEqual(self.sent, URLS * 2)
+
+    def test_failover_and_probe(self) -> None:
+        """
+        A failing endpoint should be skipped for the next one, taken out of rotation after `failure_threshold`
+        failures, and brought back by a successful probe once `probe_interval` has passed.
+        """
+
+        self.down = ["http://a/"]
+        for _ in range(6):
+            self.pool.call(self.send)
+
+        self.assertEqual(self.sent.count("http://a/"), 2)
+        self.assertEqual(self.pool.healthy, ["http://b/", "http://c/"])
+        self.assertEqual(self.pool.requests_failed_by_endpoint["http://a/"], 2)
+
+        self.sent.clear()
+        self.now = 10
+        self.pool.call(self.send)
+        self.assertEqual(self.sent[:2], ["http://a/", "http://b/"])
+        self.assertEqual(self.pool.healthy, ["http://b/", "http://c/"])
+
+        self.sent.clear()
+        self.down = []
+        self.now = 20
+        self.pool.call(self.send)
+        self.assertEqual(self.sent, ["http://a/"])
+        self.assertEqual(self.pool.healthy, URLS)
+
+    def test_all_endpoints_down(self) -> None:
+        """
+        Once every endpoint is out of rotation, requests should fail without being sent until a probe is due.
+        """
+
+        self.down = URLS
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.pool.call(self.send)
+
+        send = MagicMock()
+        with self.assertRaises(NoEndpointAvailableError):
+            self.pool.call(send)
+        send.assert_not_called()
+
+    def test_client_errors_do_not_fail_over(self) -> None:
+        """
+        A 4xx response shows the endpoint is up: it should be raised without trying the other endpoints.
+        """
+
+        send = MagicMock(side_effect=HTTPError(
+            response=MagicMock(status_code=400)))
+        with self.assertRaises(HTTPError):
+            self.pool.call(send)
+
+        send.assert_called_once()
+        self.assertEqual(self.pool.healthy, URLS)
+
+    def test_circuit_breaker_per_endpoint(self) -> None:
+        """
+        Each endpoint should get its own breaker, and an endpoint whose breaker is open should be skipped without
+        being charged a failure.
+        """
+
+        pool = EndpointPool(URLS, failure_threshold=5, circuit_breaker=CircuitBreaker(
+            failure_threshold=1, cooldown=10, clock=lambda: self.now))
+        self.down = ["http://a/"]
+        for _ in range(3):
+            pool.call(self.send)
+
+        self.assertEqual(pool.circuitBreaker("http://a/").state, CircuitState.OPEN)  # type: ignore[union-attr]
+        self.assertEqual(pool.circuitBreaker("http://b/").state, CircuitState.CLOSED)  # type: ignore[union-attr]
+        self.assertEqual(self.sent.count("http://a/"), 1)
+        self.assertEqual(pool.requests_failed_by_endpoint, {"http://a/": 1, "http://b/": 0, "http://c/": 0})
+        self.assertEqual(pool.healthy, URLS)
+
+        self.down = URLS
+        with self.assertRaises(ConnectionError):
+            pool.call(self.send)
+        with self.assertRaises(CircuitOpenError):
+            pool.call(self.send)
+        self.assertEqual(pool.requests_failed_by_endpoint, {"http://a/": 1, "http://b/": 1, "http://c/": 1})
+
+    def test_least_latency(self) -> None:
+        """
+        Requests should go to the endpoint with the lowest latency, weighted by the requests in flight to it.
+        """
+
+        pool = EndpointPool(URLS, strategy="least_latency")
+        for url, seconds in zip(URLS, (0.3, 0.1, 0.15)):
+            pool.recordSuccess(url, seconds)
+
+        self.assertEqual(pool.candidates(), [
+                         "http://b/", "http://c/", "http://a/"])
+
+        candidates: List[List[str]] = []
+        pool.call(lambda url: candidates.append(pool.candidates()))
+        self.assertEqual(candidates, [["http://c/", "http://b/", "http://a/"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import json
+import unittest
+
+from requests import HTTPError
+
+from lumberjack.testing import StubServer
+from lumberjack.transport import HttpTransport
+
+
+class HttpTransportTests(unittest.TestCase):
+    """
+    Test cases for the HttpTransport class.
+    """
+
+    BODY = json.dumps({"logMessage": "message " * 500}).encode()
+
+    def setUp(self) -> None:
+        """
+        Starts a stub server for each test.
+        """
+
+        self.server = StubServer().start()
+
+    def tearDown(self) -> None:
+        """
+        Stops the stub server.
+        """
+
+        self.server.stop()
+
+    def test_keep_alive(self) -> None:
+        """
+        Requests should share a single pooled connection.
+        """
+
+        transport = HttpTransport()
+        for _ in range(10):
+            transport.post(self.server.url, b"{}")
+        transport.close()
+
+        self.assertEqual(len(self.server.requests), 10)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_gzip_compression(self) -> None:
+        """
+        Bodies above the threshold should be gzip-compressed.
+        """
+
+        transport = HttpTransport(compression="gzip", compression_threshold=100)
+        transport.post(self.server.url, self.BODY)
+        transport.close()
+
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        self.assertEqual(request.body, self.BODY)
+        self.assertLess(self.server.bytes_received, len(self.BODY))
+
+    def test_deflate_compression(self) -> None:
+        """
+        Bodies above the threshold should be deflate-compressed when requested.
+        """
+
+        transport = HttpTransport(compression="deflate", compression_threshold=100)
+        transport.post(self.server.url, self.BODY)
+        transport.close()
+
+        request = self.server.requests[0]
+        self.assertEqual(request.headers["Content-Encoding"], "deflate")
+        self.assertEqual(request.body, self.BODY)
+
+    def test_chunked_body(self) -> None:
+        """
+        A body given as chunks should be streamed with chunked transfer encoding, compressed as it is streamed.
+        """
+
+        chunks = [self.BODY[:1000], self.BODY[1000:]]
+        for compression in (None, "gzip", "deflate"):
+            transport = HttpTransport(compression=compression)
+            transport.post(self.server.url, chunks)
+            transport.close()
+
+            request = self.server.requests[-1]
+            self.assertEqual(request.headers["Transfer-Encoding"], "chunked")
+            self.assertEqual(request.headers.get("Content-Encoding"), compression)
+            self.assertEqual(request.body, self.BODY)
+
+    def test_below_threshold_is_not_compressed(self) -> None:
+        """
+        Bodies below the threshold should be sent as is.
+        """
+
+        transport = HttpTransport(compression="gzip", compression_threshold=100)
+        transport.post(self.server.url, b"{}")
+        transport.close()
+
+        request = self.server.requests[0]
+        self.assertNotIn("Content-Encoding", request.headers)
+        self.assertEqual(self.server.bytes_received, 2)
+
+    def test_unsupported_compression(self) -> None:
+        """
+        An unknown compression algorithm should be rejected.
+        """
+
+        with self.assertRaises(ValueError):
+            HttpTransport(compression="brotli")
+
+    def test_error_status(self) -> None:
+        """
+        A rejected request should raise an HTTPError.
+        """
+
+        self.server.status = 500
+        transport = HttpTransport()
+        with self.assertRaises(HTTPError):
+            transport.post(self.server.url, b"{}")
+        transport.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from typing import List
+from unittest.mock import MagicMock
+
+from requests import ConnectionError, HTTPError
+
+from lumberjack.transport import RetryPolicy
+
+
+def httpError(status: int, retry_after: str | None = None) -> HTTPError:
+    response = MagicMock()
+    response.status_code = status
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return HTTPError(f"{status} error", response=response)
+
+
+class RetryPolicyTests(unittest.TestCase):
+    """
+    Test cases for the RetryPolicy class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Records delays instead of sleeping.
+        """
+
+        self.delays: List[float] = []
+
+    def test_retries_until_success(self) -> None:
+        """
+        Retriable errors should be retried until a send succeeds.
+        """
+
+        errors = [ConnectionError("refused"), httpError(503)]
+
+        def send() -> None:
+            if errors:
+                raise errors.pop(0)
+
+        RetryPolicy(sleep=self.delays.append).call(send)
+
+        self.assertEqual(len(self.delays), 2)
+
+    def test_gives_up_after_max_retries(self) -> None:
+        """
+        The last error should be raised once the retries are exhausted.
+        """
+
+        send = MagicMock(side_effect=httpError(500))
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy(max_retries=2, sleep=self.delays.append).call(send)
+
+        self.assertEqual(send.call_count, 3)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        """
+        4xx responses other than 429 should be raised immediately.
+        """
+
+        send = MagicMock(side_effect=httpError(400))
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy(sleep=self.delays.append).call(send)
+
+        self.assertEqual(send.call_count, 1)
+
+    def test_exponential_backoff(self) -> None:
+        """
+        Delays should double with every attempt up to the maximum.
+        """
+
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=False)
+
+        self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_jitter(self) -> None:
+        """
+        Jittered delays should stay between zero and the exponential bound.
+        """
+
+        policy = RetryPolicy(backoff_base=1, backoff_max=5)
+
+        for attempt in range(1, 6):
+            self.assertLessEqual(policy.backoff(attempt), min(5, 2 ** (attempt - 1)))
+
+    def test_retry_after(self) -> None:
+        """
+        A Retry-After header should set the delay, bounded by the maximum.
+        """
+
+        policy = RetryPolicy(backoff_max=5)
+
+        self.assertEqual(policy.backoff(1, httpError(429, "2")), 2)
+        self.assertEqual(policy.backoff(1, httpError(429, "60")), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+import unittest
+from datetime import datetime
+from typing import List
+
+from lumberjack.models import Log
+from lumberjack.utils import BatchWorker, encodeBatch
+
+
+class BatchWorkerTests(unittest.TestCase):
+    """
+    Test cases for the BatchWorker class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a send callback recording every shipped batch.
+        """
+
+        self.batches: List[List[bytes]] = []
+        self.lock = threading.Lock()
+
+    def send(self, batch: List[bytes]) -> None:
+        with self.lock:
+            self.batches.append(list(batch))
+
+    def makeLog(self, message: str = "message") -> Log:
+        return Log(
+            logLevel=20,
+            logLevelName="INFO",
+            logMessage=message,
+            username="user",
+            machineName="machine",
+            timestamp=datetime.now(),
+        )
+
+    def test_flush_on_max_records(self) -> None:
+        """
+        A batch should be shipped as soon as it holds `max_batch_records` logs.
+        """
+
+        worker = BatchWorker(self.send, max_batch_records=3, max_linger=60)
+        for i in range(7):
+            worker.put(self.makeLog(str(i)))
+        worker.close()
+
+        self.assertEqual([len(batch) for batch in self.batches], [3, 3, 1])
+        messages = [json.loads(p)["logMessage"] for batch in self.batches for p in batch]
+        self.assertEqual(messages, [str(i) for i in range(7)])
+
+    def test_flush_on_max_bytes(self) -> None:
+        """
+        A batch should never exceed `max_batch_bytes` unless a single log is larger on its own.
+        """
+
+        size = len(encodeBatch([self.makeLog("x" * 100).model_dump_json().encode()] * 2))
+        worker = BatchWorker(self.send, max_batch_bytes=size, max_linger=60)
+        for _ in range(5):
+            worker.put(self.makeLog("x" * 100))
+        worker.close()
+
+        self.assertEqual([len(batch) for batch in self.batches], [2, 2, 1])
+        self.assertEqual(len(encodeBatch(self.batches[0])), size)
+
+    def test_flush_on_linger(self) -> None:
+        """
+        A partial batch should be shipped once its oldest log has waited `max_linger` seconds.
+        """
+
+        worker = BatchWorker(self.send, max_linger=0.05)
+        worker.put(self.makeLog())
+
+        deadline = time.monotonic() + 2
+        while not self.batches and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.batches), 1)
+        worker.close()
+
+    def test_explicit_flush(self) -> None:
+        """
+        `flush` should ship the pending batch and wait for it.
+        """
+
+        worker = BatchWorker(self.send, max_linger=60)
+        worker.put(self.makeLog())
+        self.assertTrue(worker.flush(timeout=2))
+        self.assertEqual(len(self.batches), 1)
+        worker.close()
+
+    def test_drop_when_full(self) -> None:
+        """
+        `put` should never block; logs beyond the queue size are dropped and counted.
+        """
+
+        release = threading.Event()
+
+        def blocked_send(batch: List[bytes]) -> None:
+            release.wait(2)
+
+        worker = BatchWorker(blocked_send, max_queue_size=2, max_batch_records=1)
+        results = [worker.put(self.makeLog()) for _ in range(10)]
+        release.set()
+        worker.close()
+
+        self.assertIn(False, results)
+        self.assertEqual(worker.dropped, results.count(False))
+
+    def test_send_errors_do_not_stop_worker(self) -> None:
+        """
+        An exception raised by the send callback should not kill the worker.
+        """
+
+        calls: List[int] = []
+
+        def failing_send(batch: List[bytes]) -> None:
+            calls.append(len(batch))
+            raise RuntimeError("boom")
+
+        worker = BatchWorker(failing_send, max_batch_records=1)
+        worker.put(self.makeLog())
+        worker.put(self.makeLog())
+        worker.close()
+
+        self.assertEqual(calls, [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
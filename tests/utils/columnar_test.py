@@ -0,0 +1,115 @@
+import json
+import unittest
+from datetime import datetime
+
+from lumberjack.models import Log, StackFrame
+from lumberjack.utils import (BatchFormat, decodeColumnar, encodeBatch,
+                              encodeColumnar, encodeStdlib)
+
+
+class ColumnarTests(unittest.TestCase):
+    """
+    Test cases for the columnar batch format.
+    """
+
+    LOGS = [
+        Log(
+            logLevel=20 + 10 * (i % 2),
+            logLevelName="WARNING" if i % 2 else "INFO",
+            logMessage=f"request {i} ☃ \"quoted\"\n",
+            loggerName=f"app.module{i % 3}",
+            applicationName="app",
+            timestamp=datetime(2024, 1, 2, 3, 4, 5, i),
+            filename="columnar_test.py",
+            filepath=__file__,
+            lineno=i % 4,
+            code="print('hello')\n",
+            stackTrace="Traceback...\n" if i == 3 else None,
+            stackFrames=[StackFrame(__file__, 1, "f")] if i == 3 else None,
+            occurrences=i if i == 5 else None,
+        )
+        for i in range(10)
+    ]
+
+    def test_round_trip(self) -> None:
+        """
+        Decoding a columnar batch should give back the JSON objects of the JSON batch format.
+        """
+
+        expected = json.loads(encodeBatch([encodeStdlib(log) for log in self.LOGS]))
+
+        self.assertEqual(decodeColumnar(encodeColumnar(self.LOGS)), expected)
+
+    def test_serialized_logs(self) -> None:
+        """
+        Serialized logs should encode exactly like the logs they were serialized from.
+        """
+
+        payloads = [encodeStdlib(log) for log in self.LOGS]
+
+        self.assertEqual(decodeColumnar(encodeColumnar(payloads)),
+                         decodeColumnar(encodeColumnar(self.LOGS)))
+
+    def test_strings_are_interned(self) -> None:
+        """
+        Every distinct string should be written once, and string columns should hold indexes.
+        """
+
+        batch = json.loads(encodeColumnar(self.LOGS))
+        strings = batch["strings"]
+
+        self.assertEqual(len(strings), len(set(strings)))
+        self.assertEqual(strings.count(__file__), 1)
+        self.assertEqual(len(set(batch["columns"]["filepath"])), 1)
+        self.assertEqual(batch["columns"]["lineno"], [i % 4 for i in range(10)])
+        self.assertEqual(batch["count"], 10)
+        self.assertLess(len(encodeColumnar(self.LOGS)),
+                        len(encodeBatch([encodeStdlib(log) for log in self.LOGS])))
+
+    def test_unset_columns_are_omitted(self) -> None:
+        """
+        Columns of optional fields no log has should be left out, and decoded logs should not carry them.
+        """
+
+        columns = json.loads(encodeColumnar(self.LOGS))["columns"]
+        logs = decodeColumnar(encodeColumnar(self.LOGS))
+
+        self.assertNotIn("codeHash", columns)
+        self.assertEqual(columns["occurrences"], [5 if i == 5 else None for i in range(10)])
+        self.assertEqual([log.get("occurrences") for log in logs if "occurrences" in log], [5])
+        self.assertTrue(all("codeHash" not in log for log in logs))
+        self.assertIsNone(logs[0]["stackTrace"])
+
+    def test_empty_batch(self) -> None:
+        """
+        An empty batch should round-trip to no logs.
+        """
+
+        self.assertEqual(decodeColumnar(encodeColumnar([])), [])
+
+    def test_invalid_batches(self) -> None:
+        """
+        Other layouts and columns of the wrong length should be rejected.
+        """
+
+        batch = json.loads(encodeColumnar(self.LOGS))
+
+        with self.assertRaises(ValueError):
+            decodeColumnar(json.dumps({**batch, "version": 2}))
+        batch["columns"]["lineno"].pop()
+        with self.assertRaises(ValueError):
+            decodeColumnar(json.dumps(batch))
+
+    def test_content_type(self) -> None:
+        """
+        Columnar batches should have their own content type and not be combined by `encodeBatch`.
+        """
+
+        self.assertEqual(BatchFormat("columnar").content_type,
+                         "application/vnd.lumberjack.columnar+json")
+        with self.assertRaises(ValueError):
+            encodeBatch([encodeStdlib(self.LOGS[0])], BatchFormat.COLUMNAR)
+
+
+if __name__ == "__main__":
+    unittest.main()
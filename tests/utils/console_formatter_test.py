@@ -0,0 +1,94 @@
+import logging
+import sys
+import threading
+import unittest
+
+from colorama import Fore, Style
+
+from lumberjack.utils.console_formatter import ConsoleFormatter
+
+
+class ConsoleFormatterTests(unittest.TestCase):
+    """
+    Test cases for the ConsoleFormatter class.
+    """
+
+    def makeRecord(self, level: int, message: str = "message", exc_info: object = None) -> logging.LogRecord:
+        record = logging.LogRecord("test", level, __file__, 1, message, (), exc_info)
+        record.created = 3600.25
+        return record
+
+    def test_levels(self) -> None:
+        """
+        Each level name should be coloured and padded to the longest level name.
+        """
+
+        formatter = ConsoleFormatter()
+        asctime = formatter.formatTime(self.makeRecord(logging.INFO), "%H:%M:%S")
+
+        self.assertEqual(formatter.format(self.makeRecord(logging.INFO)),
+                         f"{asctime} {Fore.GREEN}[INFO]    {Style.RESET_ALL}: message")
+        self.assertEqual(formatter.format(self.makeRecord(logging.CRITICAL)),
+                         f"{asctime} {Fore.RED}{Style.BRIGHT}[CRITICAL]{Style.RESET_ALL}: message")
+        self.assertEqual(formatter.format(self.makeRecord(25)),
+                         f"{asctime} [Level 25]: message")
+
+    def test_exception(self) -> None:
+        """
+        The traceback should follow the message.
+        """
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = self.makeRecord(logging.ERROR, exc_info=sys.exc_info())
+
+        lines = ConsoleFormatter().format(record).splitlines()
+
+        self.assertTrue(lines[0].endswith(": message"))
+        self.assertEqual(lines[-1], "ValueError: boom")
+
+    def test_cached_time(self) -> None:
+        """
+        The time string should only change when the second changes.
+        """
+
+        formatter = ConsoleFormatter()
+        first = self.makeRecord(logging.INFO)
+        same_second = self.makeRecord(logging.INFO)
+        same_second.created = 3600.75
+        next_second = self.makeRecord(logging.INFO)
+        next_second.created = 3601.0
+
+        self.assertIs(formatter.formatTime(first, formatter.datefmt),
+                      formatter.formatTime(same_second, formatter.datefmt))
+        self.assertNotEqual(formatter.formatTime(first, formatter.datefmt),
+                            formatter.formatTime(next_second, formatter.datefmt))
+
+    def test_concurrent_levels_do_not_leak(self) -> None:
+        """
+        Threads formatting different levels through one formatter should each get their own colour.
+        """
+
+        formatter = ConsoleFormatter()
+        expected = {level: formatter.format(self.makeRecord(level))
+                    for level in (logging.DEBUG, logging.WARNING, logging.ERROR)}
+        mismatches = []
+
+        def work(level: int) -> None:
+            for _ in range(2000):
+                line = formatter.format(self.makeRecord(level))
+                if line != expected[level]:
+                    mismatches.append(line)
+
+        threads = [threading.Thread(target=work, args=(level,)) for level in expected]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(mismatches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from typing import List
+
+from lumberjack.utils import DiskSpool
+
+
+class DiskSpoolTests(unittest.TestCase):
+    """
+    Test cases for the DiskSpool class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates an empty spool directory and a send callback recording every batch.
+        """
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.batches: List[List[bytes]] = []
+
+    def tearDown(self) -> None:
+        """
+        Removes the spool directory.
+        """
+
+        self.directory.cleanup()
+
+    def send(self, batch: List[bytes]) -> None:
+        self.batches.append(batch)
+
+    def payloads(self, count: int, start: int = 0) -> List[bytes]:
+        return [f'{{"n":{i}}}'.encode() for i in range(start, start + count)]
+
+    def test_replay_in_order(self) -> None:
+        """
+        Spooled records should be replayed in order, in batches, and removed once sent.
+        """
+
+        spool = DiskSpool(self.directory.name)
+        spool.append(self.payloads(5))
+        spool.append(self.payloads(5, start=5))
+
+        self.assertEqual(len(spool), 10)
+        self.assertEqual(spool.replay(self.send, max_batch_records=4), 10)
+        self.assertEqual([len(batch) for batch in self.batches], [4, 4, 2])
+        self.assertEqual(
+            [p for batch in self.batches for p in batch], self.payloads(10))
+        self.assertEqual(len(spool), 0)
+        self.assertEqual(spool.size, 0)
+
+    def test_failed_send_keeps_records(self) -> None:
+        """
+        A batch whose send fails should stay in the spool and be replayed later.
+        """
+
+        def failing_send(batch: List[bytes]) -> None:
+            raise ConnectionError("endpoint down")
+
+        spool = DiskSpool(self.directory.name)
+        spool.append(self.payloads(3))
+
+        with self.assertRaises(ConnectionError):
+            spool.replay(failing_send)
+
+        self.assertEqual(len(spool), 3)
+        spool.replay(self.send)
+        self.assertEqual(self.batches, [self.payloads(3)])
+
+    def test_survives_restart(self) -> None:
+        """
+        Undelivered records should be replayed by a new spool opened on the same directory.
+        """
+
+        spool = DiskSpool(self.directory.name, segment_bytes=64)
+        spool.append(self.payloads(10))
+        spool.replay(self.send, max_batch_records=3)
+        spool.append(self.payloads(2, start=10))
+        self.batches.clear()
+
+        def failing_send(batch: List[bytes]) -> None:
+            raise ConnectionError("endpoint down")
+
+        with self.assertRaises(ConnectionError):
+            spool.replay(failing_send)
+        spool.close()
+
+        spool = DiskSpool(self.directory.name, segment_bytes=64)
+        self.assertEqual(len(spool), 2)
+        spool.replay(self.send)
+        self.assertEqual(self.batches, [self.payloads(2, start=10)])
+
+    def test_partial_delivery_survives_restart(self) -> None:
+        """
+        Records delivered before a restart should not be replayed again.
+        """
+
+        spool = DiskSpool(self.directory.name, segment_bytes=64)
+        spool.append(self.payloads(10))
+
+        sent: List[List[bytes]] = []
+
+        def fail_after_first(batch: List[bytes]) -> None:
+            if sent:
+                raise ConnectionError("endpoint down")
+            sent.append(batch)
+
+        with self.assertRaises(ConnectionError):
+            spool.replay(fail_after_first, max_batch_records=4)
+        spool.close()
+
+        spool = DiskSpool(self.directory.name, segment_bytes=64)
+        spool.replay(self.send)
+        replayed = [p for batch in self.batches for p in batch]
+        self.assertEqual(sent[0] + replayed, self.payloads(10))
+
+    def test_torn_write_is_discarded(self) -> None:
+        """
+        A partially written record at the end of the last segment should be discarded on restart.
+        """
+
+        spool = DiskSpool(self.directory.name)
+        spool.append(self.payloads(2))
+        spool.close()
+
+        segment = sorted(name for name in os.listdir(self.directory.name)
+                         if name.endswith(".seg"))[-1]
+        with open(os.path.join(self.directory.name, segment), "ab") as f:
+            f.write(b"\x00\x00\x00\x10\x00")
+
+        spool = DiskSpool(self.directory.name)
+        self.assertEqual(len(spool), 2)
+        spool.append(self.payloads(1, start=2))
+        spool.replay(self.send)
+        self.assertEqual(
+            [p for batch in self.batches for p in batch], self.payloads(3))
+
+    def test_corrupt_tail_is_forgotten(self) -> None:
+        """
+        Records lost to a corrupt last segment should stop counting as pending once replay reaches them.
+        """
+
+        spool = DiskSpool(self.directory.name)
+        spool.append(self.payloads(2))
+
+        segment = sorted(name for name in os.listdir(self.directory.name)
+                         if name.endswith(".seg"))[-1]
+        with open(os.path.join(self.directory.name, segment), "r+b") as f:
+            f.seek(8)
+            f.write(b"X")
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(spool.replay(self.send), 0)
+        self.assertEqual(len(spool), 0)
+
+        spool.append(self.payloads(1, start=2))
+        spool.replay(self.send)
+        self.assertEqual(self.batches, [self.payloads(1, start=2)])
+        self.assertEqual(len(spool), 0)
+
+    def test_size_cap(self) -> None:
+        """
+        Records beyond the size cap should be dropped and counted.
+        """
+
+        spool = DiskSpool(self.directory.name, max_bytes=50)
+        stored = spool.append(self.payloads(10))
+        spool.close()
+
+        self.assertLess(stored, 10)
+        self.assertEqual(spool.dropped, 10 - stored)
+        self.assertLessEqual(spool.size, 50)
+
+    def test_segments_are_rolled_and_removed(self) -> None:
+        """
+        Segments should roll over at the configured size and be deleted once delivered.
+        """
+
+        spool = DiskSpool(self.directory.name, segment_bytes=40)
+        spool.append(self.payloads(10))
+        segments = [name for name in os.listdir(self.directory.name)
+                    if name.endswith(".seg")]
+        self.assertGreater(len(segments), 1)
+
+        spool.replay(self.send)
+        segments = [name for name in os.listdir(self.directory.name)
+                    if name.endswith(".seg")]
+        self.assertEqual(segments, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import json
+import unittest
+from datetime import datetime
+
+from lumberjack.models import OMITTED_WHEN_UNSET, Log, StackFrame
+from lumberjack.utils import (BatchFormat, ChunkedBody, encodeBatch,
+                              encodeOrjson, encodePydantic, encodeStdlib,
+                              getEncoder, splitBatch)
+from lumberjack.utils.encoders import orjson
+
+
+class EncoderTests(unittest.TestCase):
+    """
+    Test cases for the log encoders.
+    """
+
+    LOG = Log(
+        logLevel=30,
+        logLevelName="WARNING",
+        logMessage="tab\tnewline\n quote\" backslash\\ control\x01 unicode ☃ 🌲",
+        loggerName="test",
+        timestamp=datetime(2024, 1, 2, 3, 4, 5, 678901),
+        filename="encoders_test.py",
+        filepath=__file__,
+        lineno=7,
+        code="print('hello')\n",
+    )
+
+    def test_encoders_match_model_dump_json(self) -> None:
+        """
+        Every encoder should produce exactly the same JSON as `model_dump_json`.
+        """
+
+        expected = self.LOG.model_dump_json().encode()
+
+        self.assertEqual(encodePydantic(self.LOG), expected)
+        self.assertEqual(encodeStdlib(self.LOG), expected)
+        if orjson is not None:
+            self.assertEqual(encodeOrjson(self.LOG), expected)
+
+    def test_stack_frames(self) -> None:
+        """
+        Structured stack frames should be encoded as arrays by every encoder.
+        """
+
+        log = self.LOG.model_copy(
+            update={"stackFrames": [StackFrame(__file__, 12, "test_stack_frames")]})
+        expected = log.model_dump_json().encode()
+
+        self.assertIn(b'"stackFrames":[[', expected)
+        self.assertEqual(encodePydantic(log), expected)
+        self.assertEqual(encodeStdlib(log), expected)
+        if orjson is not None:
+            self.assertEqual(encodeOrjson(log), expected)
+
+    def test_unset_fields_are_omitted(self) -> None:
+        """
+        Every encoder should leave out the optional fields most logs do not have when they are unset, and send them
+        when they are set.
+        """
+
+        log = self.LOG.model_copy(update={"codeStartLine": 3, "occurrences": 2})
+
+        for encode in (encodePydantic, encodeStdlib) + ((encodeOrjson,) if orjson is not None else ()):
+            with self.subTest(encoder=encode.__name__):
+                self.assertTrue(set(OMITTED_WHEN_UNSET).isdisjoint(json.loads(encode(self.LOG))))
+                self.assertIsNone(json.loads(encode(self.LOG))["stackTrace"])
+                encoded = json.loads(encode(log))
+                self.assertEqual((encoded["codeStartLine"], encoded["occurrences"]), (3, 2))
+                self.assertNotIn("codeHash", encoded)
+
+    def test_whole_second_timestamp(self) -> None:
+        """
+        Timestamps without microseconds should be encoded like pydantic does.
+        """
+
+        log = self.LOG.model_copy(update={"timestamp": datetime(2024, 1, 2)})
+        expected = log.model_dump_json().encode()
+
+        self.assertEqual(encodeStdlib(log), expected)
+        if orjson is not None:
+            self.assertEqual(encodeOrjson(log), expected)
+
+    def test_get_encoder(self) -> None:
+        """
+        Encoders should be resolvable by name, by callable, or picked automatically.
+        """
+
+        self.assertIs(getEncoder("json"), encodeStdlib)
+        self.assertIs(getEncoder("pydantic"), encodePydantic)
+        self.assertIs(getEncoder(encodeStdlib), encodeStdlib)
+        self.assertIs(
+            getEncoder(), encodeOrjson if orjson is not None else encodePydantic)
+
+        with self.assertRaises(ValueError):
+            getEncoder("yaml")
+
+    def test_json_batch(self) -> None:
+        """
+        A JSON batch should be a JSON array of the logs.
+        """
+
+        payload = encodePydantic(self.LOG)
+        body = encodeBatch([payload, payload])
+
+        self.assertEqual(len(json.loads(body)), 2)
+        self.assertEqual(BatchFormat.JSON.content_type, "application/json")
+
+    def test_ndjson_batch(self) -> None:
+        """
+        An NDJSON batch should hold one log per line.
+        """
+
+        payload = encodePydantic(self.LOG)
+        body = encodeBatch([payload, payload], BatchFormat.NDJSON)
+        lines = body.splitlines()
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["lineno"], 7)
+        self.assertEqual(BatchFormat.NDJSON.content_type, "application/x-ndjson")
+
+    def test_split_batch(self) -> None:
+        """
+        A batch should be split in order into bodies no larger than the limit, a larger log going on its own.
+        """
+
+        payloads = [b"1" * 10, b"2" * 10, b"3" * 10, b"4" * 50, b"5" * 10]
+        limit = len(encodeBatch(payloads[:2]))
+        batches = splitBatch(payloads, limit)
+
+        self.assertEqual(batches, [payloads[:2], [payloads[2]], [payloads[3]], [payloads[4]]])
+        for batch in batches[:2] + batches[3:]:
+            self.assertLessEqual(len(encodeBatch(batch)), limit)
+            self.assertLessEqual(len(encodeBatch(batch, BatchFormat.NDJSON)), limit)
+
+    def test_chunked_body(self) -> None:
+        """
+        A chunked body should yield chunks of about `chunk_size` that join into the same body as `encodeBatch`,
+        every time it is iterated.
+        """
+
+        payloads = [encodePydantic(self.LOG)] * 20
+        for batch_format in (BatchFormat.JSON, BatchFormat.NDJSON):
+            body = ChunkedBody(payloads, batch_format, chunk_size=1000)
+            chunks = list(body)
+
+            self.assertGreater(len(chunks), 1)
+            self.assertEqual(b"".join(chunks), encodeBatch(payloads, batch_format))
+            self.assertEqual(b"".join(body), b"".join(chunks))
+            self.assertEqual(body.size, len(b"".join(chunks)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from lumberjack.utils import FieldLimits, truncateText
+
+
+class FieldLimitsTests(unittest.TestCase):
+    """
+    Test cases for the truncation of oversized log fields.
+    """
+
+    def test_short_text_is_kept(self) -> None:
+        """
+        A string within its limit should be returned as is.
+        """
+
+        text = "é" * 50
+
+        self.assertIs(truncateText(text, 100), text)
+
+    def test_truncate_end(self) -> None:
+        """
+        A string over its limit should keep its beginning, followed by a marker with the number of bytes cut.
+        """
+
+        truncated = truncateText("x" * 1000, 100)
+
+        self.assertLessEqual(len(truncated.encode()), 100)
+        self.assertTrue(truncated.startswith("x" * 50))
+        kept = truncated.count("x")
+        self.assertTrue(truncated.endswith(f"[truncated {1000 - kept} bytes]…"))
+
+    def test_truncate_middle(self) -> None:
+        """
+        With `keep_tail`, a string over its limit should keep its beginning and its end.
+        """
+
+        truncated = truncateText("head" + "x" * 1000 + "tail", 100, keep_tail=True)
+
+        self.assertLessEqual(len(truncated.encode()), 100)
+        self.assertTrue(truncated.startswith("head"))
+        self.assertTrue(truncated.endswith("tail"))
+        self.assertIn("bytes]…", truncated)
+
+    def test_limit_smaller_than_marker(self) -> None:
+        """
+        A limit too small to hold the marker should cut the string without one, still within the limit.
+        """
+
+        for limit in (0, 1, 10):
+            for keep_tail in (False, True):
+                truncated = truncateText("é" * 1000, limit, keep_tail=keep_tail)
+
+                self.assertLessEqual(len(truncated.encode()), limit)
+                self.assertEqual(truncated, "é" * (limit // 2))
+
+    def test_multibyte_boundaries(self) -> None:
+        """
+        Cuts should never split a multibyte character.
+        """
+
+        for limit in range(40, 60):
+            for keep_tail in (False, True):
+                truncated = truncateText("日本語" * 100, limit, keep_tail)
+                self.assertLessEqual(len(truncated.encode()), limit)
+                self.assertNotIn("�", truncated)
+
+    def test_field_limits(self) -> None:
+        """
+        Each field should be cut to its own limit, None meaning no limit, and the cut fields counted.
+        """
+
+        limits = FieldLimits(message=100, stack_trace=None, code=200)
+
+        self.assertLessEqual(len(limits.limitMessage("x" * 1000)), 100)
+        self.assertEqual(limits.limitStackTrace("y" * 1000), "y" * 1000)
+        self.assertLessEqual(len(limits.limitCode("z" * 1000) or ""), 200)
+        self.assertIsNone(limits.limitCode(None))
+        self.assertEqual(limits.limitMessage("short"), "short")
+        self.assertEqual(limits.truncated, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
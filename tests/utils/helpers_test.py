@@ -0,0 +1,173 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from lumberjack.utils import (CodeCapture, SourceCache, getCode,
+                              getCodeSnippet, hashSource, source_cache)
+
+
+class SourceCacheTests(unittest.TestCase):
+    """
+    Test cases for the SourceCache class and the getCode helpers.
+    """
+
+    def setUp(self) -> None:
+        """
+        Writes a temporary source file with one numbered line per row.
+        """
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "module.py")
+        self.writeLines(100)
+
+    def tearDown(self) -> None:
+        """
+        Removes the temporary source file.
+        """
+
+        self.directory.cleanup()
+
+    def writeLines(self, count: int, suffix: str = "") -> None:
+        with open(self.path, "w") as f:
+            f.writelines(f"line {i}{suffix}\n" for i in range(1, count + 1))
+
+    def test_hits_and_misses(self) -> None:
+        """
+        The first read should miss and the following reads should hit.
+        """
+
+        cache = SourceCache()
+        first = cache.read(self.path)
+        second = cache.read(self.path)
+
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_modified_file_is_reread(self) -> None:
+        """
+        A file whose size or modification time changed should be read again.
+        """
+
+        cache = SourceCache()
+        cache.read(self.path)
+        self.writeLines(100, suffix=" edited")
+        snippet = cache.read(self.path)
+
+        self.assertIsNotNone(snippet)
+        assert snippet is not None
+        self.assertIn("edited", snippet.code)
+        self.assertEqual(cache.misses, 2)
+
+    def test_memory_budget(self) -> None:
+        """
+        The cache should evict the least recently used files to stay within its budget.
+        """
+
+        other = os.path.join(self.directory.name, "other.py")
+        with open(other, "w") as f:
+            f.write("x" * 800)
+
+        cache = SourceCache(max_bytes=1000)
+        cache.read(self.path)
+        cache.read(other)
+        self.assertLessEqual(cache.size, 1000)
+
+        cache.read(self.path)
+        self.assertEqual(cache.misses, 3)
+
+    def test_file_over_budget(self) -> None:
+        """
+        A file larger than the whole budget should be reported as unreadable without being read.
+        """
+
+        cache = SourceCache(max_bytes=100)
+
+        with patch("builtins.open") as open_file:
+            self.assertIsNone(cache.read(self.path))
+            self.assertIsNone(cache.digest(self.path))
+        open_file.assert_not_called()
+        self.assertEqual(cache.size, 0)
+
+    def test_budget_counts_bytes(self) -> None:
+        """
+        The budget should be measured in bytes, not characters.
+        """
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("é" * 60)
+
+        self.assertIsNone(SourceCache(max_bytes=100).read(self.path))
+        self.assertEqual(SourceCache(max_bytes=120).read(self.path), ("é" * 60, 1))
+
+    def test_window(self) -> None:
+        """
+        Window mode should capture only the lines around `lineno`.
+        """
+
+        snippet = getCodeSnippet(self.path, 50, CodeCapture.WINDOW, 2)
+
+        self.assertIsNotNone(snippet)
+        assert snippet is not None
+        self.assertEqual(snippet.code, "line 48\nline 49\nline 50\nline 51\nline 52\n")
+        self.assertEqual(snippet.start_line, 48)
+
+    def test_window_at_file_edges(self) -> None:
+        """
+        Windows should be clipped to the start and end of the file.
+        """
+
+        start = getCodeSnippet(self.path, 1, CodeCapture.WINDOW, 2)
+        end = getCodeSnippet(self.path, 100, CodeCapture.WINDOW, 2)
+
+        assert start is not None and end is not None
+        self.assertEqual(start.code, "line 1\nline 2\nline 3\n")
+        self.assertEqual(start.start_line, 1)
+        self.assertEqual(end.code, "line 98\nline 99\nline 100\n")
+
+    def test_none(self) -> None:
+        """
+        No code should be captured in "none" mode.
+        """
+
+        self.assertIsNone(getCodeSnippet(self.path, 1, CodeCapture.NONE))
+
+    def test_get_code(self) -> None:
+        """
+        `getCode` should return the whole file through the shared cache.
+        """
+
+        with open(self.path, "r") as f:
+            expected = f.read()
+
+        self.assertEqual(getCode(self.path), expected)
+        hits = source_cache.hits
+        self.assertEqual(getCode(self.path), expected)
+        self.assertEqual(source_cache.hits, hits + 1)
+
+    def test_digest(self) -> None:
+        """
+        The digest should be the hash of the file content and follow edits to the file.
+        """
+
+        cache = SourceCache()
+        with open(self.path, "r") as f:
+            first = hashSource(f.read())
+
+        self.assertEqual(cache.digest(self.path), first)
+        self.writeLines(100, suffix=" edited")
+        self.assertNotEqual(cache.digest(self.path), first)
+        self.assertIsNone(getCodeSnippet(self.path, capture=CodeCapture.HASH))
+
+    def test_missing_file(self) -> None:
+        """
+        An unreadable file should produce no code.
+        """
+
+        self.assertIsNone(getCode(os.path.join(self.directory.name, "missing.py")))
+        self.assertIsNone(getCode(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
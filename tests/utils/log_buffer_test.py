@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+import unittest
+from logging import DEBUG, ERROR, INFO, WARNING
+from typing import List
+
+from lumberjack.utils import BackpressurePolicy, LogBuffer
+
+
+class LogBufferTests(unittest.TestCase):
+    """
+    Test cases for the LogBuffer class.
+    """
+
+    def drain(self, buffer: LogBuffer) -> List[object]:
+        items: List[object] = []
+        while True:
+            try:
+                items.append(buffer.get(timeout=0))
+            except queue.Empty:
+                return items
+
+    def test_fifo_across_levels(self) -> None:
+        """
+        Items should come out in arrival order whatever their level, control items included.
+        """
+
+        buffer = LogBuffer()
+        buffer.put("a", DEBUG)
+        buffer.put("b", ERROR)
+        buffer.putControl("flush")
+        buffer.put("c", DEBUG)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(self.drain(buffer), ["a", "b", "flush", "c"])
+        self.assertEqual(len(buffer), 0)
+
+    def test_drop_newest(self) -> None:
+        """
+        A log arriving while the buffer is full should be dropped.
+        """
+
+        buffer = LogBuffer(max_records=2)
+        results = [buffer.put(i, INFO) for i in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(self.drain(buffer), [0, 1])
+        self.assertEqual(buffer.dropped_by_level, {INFO: 2})
+
+    def test_drop_oldest(self) -> None:
+        """
+        The oldest logs should make room for the arriving one, under the byte limit too.
+        """
+
+        buffer = LogBuffer(max_records=10, max_bytes=100,
+                           policy=BackpressurePolicy.DROP_OLDEST)
+        for i in range(4):
+            buffer.put(i, INFO, 30)
+        buffer.put(4, INFO, 60)
+
+        self.assertEqual(buffer.bytes, 90)
+        self.assertEqual(self.drain(buffer), [3, 4])
+        self.assertEqual(buffer.dropped, 3)
+
+    def test_drop_lowest_level(self) -> None:
+        """
+        Errors should survive a flood of debug logs, and a log should never push out one of a higher level.
+        """
+
+        buffer = LogBuffer(max_records=3, policy="drop_lowest_level")
+        buffer.put("error", ERROR)
+        for i in range(10):
+            buffer.put(f"debug {i}", DEBUG)
+        self.assertTrue(buffer.put("warning", WARNING))
+        self.assertTrue(buffer.put("info", INFO))
+        self.assertFalse(buffer.put("another info", INFO))
+
+        self.assertEqual(self.drain(buffer), ["error", "warning", "info"])
+        self.assertEqual(buffer.dropped_by_level, {DEBUG: 10, INFO: 1})
+
+    def test_drop_lowest_level_keeps_logs_it_cannot_use(self) -> None:
+        """
+        Nothing should be dropped to make room when dropping every lower log would not be enough.
+        """
+
+        buffer = LogBuffer(max_bytes=100, policy="drop_lowest_level")
+        buffer.put("debug", DEBUG, 10)
+        buffer.put("error", ERROR, 80)
+
+        self.assertFalse(buffer.put("another error", ERROR, 50))
+        self.assertEqual(self.drain(buffer), ["debug", "error"])
+
+    def test_oversized_log(self) -> None:
+        """
+        A log larger than the byte limit should only be accepted into an empty buffer.
+        """
+
+        buffer = LogBuffer(max_bytes=10)
+
+        self.assertTrue(buffer.put("big", INFO, 50))
+        self.assertFalse(buffer.put("small", INFO, 1))
+
+    def test_block(self) -> None:
+        """
+        With the block policy, a caller should wait for room, and drop its log once the timeout expires.
+        """
+
+        buffer = LogBuffer(max_records=1, policy="block", block_timeout=5)
+        buffer.put("first", INFO)
+
+        reader = threading.Timer(0.05, buffer.get)
+        reader.start()
+        started = time.monotonic()
+        self.assertTrue(buffer.put("second", INFO))
+        self.assertGreater(time.monotonic() - started, 0.02)
+        reader.join()
+
+        buffer = LogBuffer(max_records=1, policy="block", block_timeout=0.05)
+        buffer.put("first", INFO)
+        self.assertFalse(buffer.put("second", INFO))
+        self.assertFalse(buffer.put("third", INFO, block=False))
+        self.assertEqual(buffer.dropped, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
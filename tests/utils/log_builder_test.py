@@ -3,11 +3,12 @@ import logging
 import os
 import platform
 import socket
+import sys
 import traceback
 import unittest
 
-from lumberjack.models import Log
-from lumberjack.utils import buildLog
+from lumberjack.models import Log, StackFrame, refreshProcessContext
+from lumberjack.utils import CodeCapture, FieldLimits, buildLog, hashSource
 
 
 class LogBuilderTests(unittest.TestCase):
@@ -34,6 +35,7 @@ class LogBuilderTests(unittest.TestCase):
         Test if the `buildLog` method correctly builds a log object from a LogRecord.
         """
         os.environ["ENV"] = self.TEST_ENV
+        refreshProcessContext()
         log: Log = buildLog(self.RECORD)
 
         with open(__file__, "r") as f:
@@ -97,7 +99,7 @@ class LogBuilderTests(unittest.TestCase):
         )
         self.assertEqual(
             log.stackTrace,
-            traceback.format_exc(),
+            "".join(traceback.format_exception(*self.RECORD.exc_info)),
             "The expected StackTrace is not equal to the actual Stack.",
         )
         self.assertEqual(
@@ -106,6 +108,103 @@ class LogBuilderTests(unittest.TestCase):
             "The expected line number is not equal to the actual Stack.",
         )
         self.assertEqual(log.code, expected_code)
+        self.assertIsNone(log.codeStartLine)
+
+    def testBuildLogCodeWindow(self) -> None:
+        """
+        Test if `buildLog` captures only the lines around the logging call in window mode.
+        """
+        record = logging.LogRecord(
+            name="test",
+            level=logging.INFO,
+            pathname=__file__,
+            lineno=5,
+            msg="message",
+            args=(),
+            exc_info=None,
+        )
+        log: Log = buildLog(record, code_capture=CodeCapture.WINDOW, code_context_lines=2)
+
+        with open(__file__, "r") as f:
+            expected_code = "".join(f.readlines()[2:7])
+
+        self.assertEqual(log.code, expected_code)
+        self.assertEqual(log.codeStartLine, 3)
+
+    def testBuildLogNoCode(self) -> None:
+        """
+        Test if `buildLog` captures no code in "none" mode.
+        """
+        log: Log = buildLog(self.RECORD, code_capture=CodeCapture.NONE)
+
+        self.assertIsNone(log.code)
+
+    def testBuildLogCodeHash(self) -> None:
+        """
+        Test if `buildLog` replaces the code with its content hash in "hash" mode.
+        """
+        log: Log = buildLog(self.RECORD, code_capture=CodeCapture.HASH)
+
+        with open(__file__, "r") as f:
+            expected_hash = hashSource(f.read())
+
+        self.assertIsNone(log.code)
+        self.assertEqual(log.codeHash, expected_hash)
+
+    def testBuildLogTracebackFromRecord(self) -> None:
+        """
+        Test if `buildLog` renders the exception of the record, not the one currently being handled.
+        """
+        try:
+            raise KeyError("logged")
+        except KeyError:
+            record = logging.LogRecord(
+                name="test",
+                level=logging.ERROR,
+                pathname=__file__,
+                lineno=0,
+                msg="message",
+                args=(),
+                exc_info=sys.exc_info(),
+            )
+
+        try:
+            raise RuntimeError("handled")
+        except RuntimeError:
+            log: Log = buildLog(record, code_capture=CodeCapture.NONE, stack_frames=True)
+
+        self.assertEqual(log.stackTrace, "".join(traceback.format_exception(*record.exc_info)))
+        self.assertNotIn("handled", log.stackTrace)
+        self.assertEqual(log.stackFrames, [
+            StackFrame(__file__, record.exc_info[2].tb_lineno, "testBuildLogTracebackFromRecord")])
+        self.assertIn(
+            f'"stackFrames":[["{__file__}",{record.exc_info[2].tb_lineno},"testBuildLogTracebackFromRecord"]]',
+            log.model_dump_json())
+
+    def testBuildLogNoStackFrames(self) -> None:
+        """
+        Test if `buildLog` leaves out the structured frames unless asked for them.
+        """
+        log: Log = buildLog(self.RECORD, code_capture=CodeCapture.NONE)
+
+        self.assertIsNone(log.stackFrames)
+
+    def testBuildLogFieldLimits(self) -> None:
+        """
+        Test if `buildLog` cuts the message, stack trace and code to their limits.
+        """
+        try:
+            raise ValueError("x" * 10000)
+        except ValueError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "y" * 10000, (), sys.exc_info())
+
+        log: Log = buildLog(record, field_limits=FieldLimits(message=1000, stack_trace=2000, code=3000))
+
+        self.assertLessEqual(len(log.logMessage.encode()), 1000)
+        self.assertLessEqual(len((log.stackTrace or "").encode()), 2000)
+        self.assertTrue((log.stackTrace or "").startswith("Traceback"))
+        self.assertTrue((log.stackTrace or "").rstrip().endswith("x"))
+        self.assertLessEqual(len((log.code or "").encode()), 3000)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,155 @@
+import logging
+import sys
+import unittest
+
+from lumberjack.utils import LogThrottle
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class LogThrottleTests(unittest.TestCase):
+    """
+    Test cases for the LogThrottle class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a controllable clock.
+        """
+
+        self.clock = FakeClock()
+
+    def makeRecord(self, message: str = "message", lineno: int = 1, level: int = logging.WARNING) -> logging.LogRecord:
+        return logging.LogRecord("test", level, __file__, lineno, message, (), None)
+
+    def test_admits_everything_by_default(self) -> None:
+        """
+        Without any setting every record should be admitted.
+        """
+
+        throttle = LogThrottle()
+
+        self.assertTrue(all(throttle.admit(self.makeRecord()) for _ in range(100)))
+
+    def test_sampling_by_level(self) -> None:
+        """
+        Records should be kept with the probability configured for their level only.
+        """
+
+        draws = iter([0.05, 0.5, 0.05, 0.5])
+        throttle = LogThrottle(
+            sample_rates={"DEBUG": 0.1}, random=lambda: next(draws))
+
+        kept = [throttle.admit(self.makeRecord(level=logging.DEBUG)) for _ in range(4)]
+
+        self.assertEqual(kept, [True, False, True, False])
+        self.assertTrue(throttle.admit(self.makeRecord(level=logging.ERROR)))
+        self.assertEqual(throttle.sampled_out, 2)
+
+    def test_rate_limit_per_call_site(self) -> None:
+        """
+        Each call site should get its own burst, refilled at the configured rate.
+        """
+
+        throttle = LogThrottle(rate_limit=2, burst=3, clock=self.clock)
+
+        first_site = [throttle.admit(self.makeRecord(lineno=1)) for _ in range(5)]
+        other_site = throttle.admit(self.makeRecord(lineno=2))
+        self.clock.now = 1.0
+        refilled = [throttle.admit(self.makeRecord(lineno=1)) for _ in range(3)]
+
+        self.assertEqual(first_site, [True, True, True, False, False])
+        self.assertTrue(other_site)
+        self.assertEqual(refilled, [True, True, False])
+        self.assertEqual(throttle.rate_limited, 3)
+
+    def test_dedup_window(self) -> None:
+        """
+        Repeats within the window should be collapsed into one record carrying their count.
+        """
+
+        throttle = LogThrottle(dedup_window=10, clock=self.clock)
+
+        admitted = [throttle.admit(self.makeRecord()) for _ in range(4)]
+        other = throttle.admit(self.makeRecord("other"))
+        self.assertEqual(throttle.collapsed(), [])
+
+        self.clock.now = 10.0
+        (collapsed,) = throttle.collapsed()
+
+        self.assertEqual(admitted, [True, False, False, False])
+        self.assertTrue(other)
+        self.assertEqual(collapsed.getMessage(), "message")
+        self.assertEqual(collapsed.occurrences, 3)
+        self.assertEqual(throttle.deduplicated, 3)
+        self.assertTrue(throttle.admit(self.makeRecord()))
+
+    def test_flush_closes_every_window(self) -> None:
+        """
+        Flushing should return the collapsed repeats of windows still open.
+        """
+
+        throttle = LogThrottle(dedup_window=10, clock=self.clock)
+        throttle.admit(self.makeRecord())
+        throttle.admit(self.makeRecord())
+
+        self.assertEqual([r.occurrences for r in throttle.collapsed(flush=True)], [1])
+        self.assertEqual(throttle.collapsed(flush=True), [])
+
+    def test_evicted_window_is_summarized(self) -> None:
+        """
+        A window forgotten to stay under `max_sites` should still have its repeats summarized.
+        """
+
+        throttle = LogThrottle(dedup_window=10, max_sites=1, clock=self.clock)
+        throttle.admit(self.makeRecord("first"))
+        throttle.admit(self.makeRecord("first"))
+        throttle.admit(self.makeRecord("second"))
+
+        (collapsed,) = throttle.collapsed()
+
+        self.assertEqual(collapsed.getMessage(), "first")
+        self.assertEqual(collapsed.occurrences, 1)
+        self.assertEqual(throttle.collapsed(), [])
+
+    def test_summary_drops_exception(self) -> None:
+        """
+        The summary should keep the formatted message of the last repeat but not its exception.
+        """
+
+        throttle = LogThrottle(dedup_window=10, clock=self.clock)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+        for _ in range(2):
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed %s", ("twice",), exc_info)
+            # Set by the formatter of a handler that ran first, e.g. a console handler.
+            record.exc_text = "Traceback (most recent call last): ..."
+            throttle.admit(record)
+
+        (collapsed,) = throttle.collapsed(flush=True)
+
+        self.assertEqual(collapsed.getMessage(), "failed twice")
+        self.assertEqual(collapsed.levelno, logging.ERROR)
+        self.assertIsNone(collapsed.exc_info)
+        self.assertIsNone(collapsed.exc_text)
+        self.assertNotIn("Traceback", logging.Formatter().format(collapsed))
+
+    def test_unknown_level(self) -> None:
+        """
+        An unknown level name should be rejected.
+        """
+
+        with self.assertRaises(ValueError):
+            LogThrottle(sample_rates={"LOUD": 0.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from contextvars import ContextVar
+from logging import DEBUG, ERROR, INFO, LogRecord
+from typing import List, Optional
+
+from lumberjack.utils import RecordBuffer
+
+
+class RecordBufferTests(unittest.TestCase):
+    """
+    Test cases for the RecordBuffer class.
+    """
+
+    def makeRecord(self, message: str, level: int = DEBUG, name: str = "test") -> LogRecord:
+        return LogRecord(name, level, __file__, 1, message, (), None)
+
+    def messages(self, records: List[LogRecord]) -> List[str]:
+        return [record.getMessage() for record in records]
+
+    def test_release_on_error(self) -> None:
+        """
+        Debug records should be kept until an error releases them with it, and other records let through.
+        """
+
+        buffer = RecordBuffer()
+
+        self.assertEqual(buffer.admit(self.makeRecord("first")), [])
+        self.assertEqual(buffer.admit(self.makeRecord("second")), [])
+        self.assertEqual(self.messages(buffer.admit(self.makeRecord("info", INFO))), ["info"])
+        self.assertEqual(len(buffer), 2)
+
+        released = buffer.admit(self.makeRecord("boom", ERROR))
+
+        self.assertEqual(self.messages(released), ["first", "second", "boom"])
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(self.messages(buffer.admit(self.makeRecord("again", ERROR))), ["again"])
+        self.assertEqual((buffer.buffered, buffer.released, buffer.expired), (2, 2, 0))
+
+    def test_ring_per_logger(self) -> None:
+        """
+        Each logger should keep only its last `capacity` records, and an error should only release its own.
+        """
+
+        buffer = RecordBuffer(capacity=2)
+        for i in range(5):
+            buffer.admit(self.makeRecord(f"a{i}", name="a"))
+        buffer.admit(self.makeRecord("b0", name="b"))
+
+        released = buffer.admit(self.makeRecord("boom", ERROR, name="a"))
+
+        self.assertEqual(self.messages(released), ["a3", "a4", "boom"])
+        self.assertEqual(len(buffer), 1)
+        self.assertEqual(buffer.expired, 3)
+
+    def test_context_scope(self) -> None:
+        """
+        With a context variable, records should be kept per value, and discarded at the end of their scope.
+        """
+
+        request: ContextVar[Optional[str]] = ContextVar("request", default=None)
+        buffer = RecordBuffer(context=request)
+
+        request.set("one")
+        buffer.admit(self.makeRecord("one"))
+        request.set("two")
+        buffer.admit(self.makeRecord("two"))
+        buffer.discard()
+        buffer.admit(self.makeRecord("three"))
+        request.set("one")
+        released = buffer.admit(self.makeRecord("boom", ERROR))
+
+        self.assertEqual(self.messages(released), ["one", "boom"])
+        self.assertEqual(buffer.expired, 1)
+        self.assertEqual(len(buffer), 1)
+
+    def test_memory_cap(self) -> None:
+        """
+        Records of the least recently active scopes should be evicted first to stay under `max_bytes` and
+        `max_scopes`.
+        """
+
+        buffer = RecordBuffer(max_bytes=3500, max_scopes=2)
+        buffer.admit(self.makeRecord("a0", name="a"))
+        buffer.admit(self.makeRecord("a1", name="a"))
+        buffer.admit(self.makeRecord("b0", name="b"))
+        buffer.admit(self.makeRecord("b1", name="b"))
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(self.messages(buffer.admit(self.makeRecord("boom", ERROR, name="a"))), ["a1", "boom"])
+
+        buffer.admit(self.makeRecord("c0", name="c"))
+        buffer.admit(self.makeRecord("d0", name="d"))
+
+        self.assertEqual(self.messages(buffer.admit(self.makeRecord("boom", ERROR, name="b"))), ["boom"])
+        self.assertEqual(buffer.expired, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
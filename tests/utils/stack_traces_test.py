@@ -0,0 +1,132 @@
+import sys
+import traceback
+import unittest
+from types import TracebackType
+from typing import Optional, Tuple, Type
+
+from lumberjack.models import StackFrame
+from lumberjack.utils import TracebackCache
+
+ExcInfo = Tuple[Type[BaseException], BaseException, TracebackType]
+
+
+class EmptyError(ValueError):
+    def __str__(self) -> str:
+        return ""
+
+
+def fail(message: str) -> None:
+    if not message:
+        raise EmptyError()
+    raise ValueError(message)
+
+
+def capture(message: str) -> ExcInfo:
+    try:
+        fail(message)
+    except ValueError:
+        return sys.exc_info()  # type: ignore[return-value]
+    raise AssertionError("unreachable")
+
+
+def captureChained(explicit: bool) -> ExcInfo:
+    try:
+        try:
+            fail("inner")
+        except ValueError as e:
+            if explicit:
+                raise RuntimeError("outer") from e
+            raise RuntimeError("outer")
+    except RuntimeError:
+        return sys.exc_info()  # type: ignore[return-value]
+    raise AssertionError("unreachable")
+
+
+class TracebackCacheTests(unittest.TestCase):
+    """
+    Test cases for the TracebackCache class.
+    """
+
+    def assertRendered(self, cache: TracebackCache, exc_info: ExcInfo) -> None:
+        trace = cache.format(exc_info)
+        assert trace is not None
+        self.assertEqual(trace.text, "".join(
+            traceback.format_exception(*exc_info)))
+
+    def test_matches_traceback_module(self) -> None:
+        """
+        The rendered text should be exactly what the traceback module produces.
+        """
+
+        cache = TracebackCache()
+        self.assertRendered(cache, capture("first"))
+        self.assertRendered(cache, capture(""))
+        self.assertRendered(cache, captureChained(explicit=True))
+        self.assertRendered(cache, captureChained(explicit=False))
+
+    def test_repeated_stacks_are_cached(self) -> None:
+        """
+        Exceptions raised from the same place should reuse the stack but keep their own message.
+        """
+
+        cache = TracebackCache()
+        first = cache.format(capture("first"))
+        second = cache.format(capture("second"))
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(cache), 1)
+        assert first is not None and second is not None
+        self.assertTrue(first.text.endswith("ValueError: first\n"))
+        self.assertTrue(second.text.endswith("ValueError: second\n"))
+        self.assertEqual(first.text.replace("first", "second"), second.text)
+
+    def test_different_stacks_are_not_shared(self) -> None:
+        """
+        Exceptions with different frames or chains should get their own entries.
+        """
+
+        cache = TracebackCache()
+        cache.format(capture("message"))
+        cache.format(captureChained(explicit=True))
+        cache.format(captureChained(explicit=False))
+
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+
+    def test_frames(self) -> None:
+        """
+        The structured frames should list every frame of the exception, innermost last.
+        """
+
+        exc_info = capture("message")
+        trace = TracebackCache().format(exc_info)
+
+        assert trace is not None
+        self.assertEqual([frame.function for frame in trace.frames], [
+                         "capture", "fail"])
+        self.assertEqual(trace.frames[-1], StackFrame(
+            __file__, fail.__code__.co_firstlineno + 3, "fail"))
+
+    def test_eviction(self) -> None:
+        """
+        The least recently used stack should be evicted beyond the maximum number of entries.
+        """
+
+        cache = TracebackCache(max_entries=1)
+        cache.format(capture("message"))
+        cache.format(captureChained(explicit=True))
+        cache.format(capture("message"))
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.misses, 3)
+
+    def test_no_exception(self) -> None:
+        """
+        Records without an exception should render nothing.
+        """
+
+        exc_info: Tuple[None, None, Optional[TracebackType]] = (None, None, None)
+        self.assertIsNone(TracebackCache().format(exc_info))
+
+
+if __name__ == "__main__":
+    unittest.main()